@@ -45,11 +45,22 @@
 //+---------------------------------------------------------------------------+
 void alignMessages(t_message * resMessage, Bool doInternalSlick, unsigned int nbMessages, t_message * messages, Bool debugMode);
 
+//+---------------------------------------------------------------------------+
+//| alignMessagesProgressive : align a group of messages following a guide tree
+//+---------------------------------------------------------------------------+
+void alignMessagesProgressive(t_message * resMessage, Bool doInternalSlick, unsigned int nbMessages, t_message * messages, unsigned int * guideTree, Bool debugMode);
+
 //+---------------------------------------------------------------------------+
 //| alignTwoMessages : align 2 messages and get common regex
 //+---------------------------------------------------------------------------+
 char* alignTwoMessages(t_message * resMessage, Bool doInternalSlick, t_message * message1, t_message * message2, Bool debugMode);
 
+//+---------------------------------------------------------------------------+
+//| computeAlignmentScore : compute the similarity score of 2 messages
+//| without building their alignment
+//+---------------------------------------------------------------------------+
+float computeAlignmentScore(t_message * message1, t_message * message2, unsigned int bandWidth, float minScore, Bool debugMode);
+
 /*!
  * @function getSimilarityScore
  * @abstract Computes the similarity score of (message1[i], message2[j])
@@ -32,12 +32,35 @@
 //| Import Associated Header
 //+---------------------------------------------------------------------------+
 #include "Needleman.h"
+#include <limits.h>
 
 #ifdef _WIN32
 #include <stdio.h>
 #include <malloc.h>
 #endif
 
+/**
+   hasSemanticTags:
+
+   This function returns TRUE if at least one half-byte of the message
+   has a semantic tag.
+*/
+static Bool hasSemanticTags(t_message * message) {
+  unsigned int i = 0;
+
+  if (message->semanticTags == NULL) {
+    return FALSE;
+  }
+  for (i = 0; i < message->len; i++) {
+    if (message->semanticTags[i] != NULL && message->semanticTags[i]->name != NULL && strcmp(message->semanticTags[i]->name, "None") != 0) {
+      return TRUE;
+    }
+  }
+  return FALSE;
+}
+
+static char* alignProfiles(t_message * resMessage, Bool doInternalSlick, t_message * message1, t_message * message2, Bool debugMode, Bool buildRegex);
+
 void alignMessages(t_message *resMessage, Bool doInternalSlick, unsigned int nbMessages, t_message * messages, Bool debugMode) {
   // local variable
   unsigned int numberOfOperations = 0;
@@ -109,8 +132,8 @@ void alignMessages(t_message *resMessage, Bool doInternalSlick, unsigned int nbM
     memset(new_message.mask, 0, messages[i_message].len);
 
     // Align current_message with new_message
-    regex = alignTwoMessages(resMessage, doInternalSlick, &current_message, &new_message, debugMode);
-    // regex is malloced by the function alignTwoMessages() and we don't need it here
+    regex = alignProfiles(resMessage, doInternalSlick, &current_message, &new_message, debugMode, FALSE);
+    // regex is not computed by the function alignProfiles() as we don't need it here
     if(regex)
       free(regex);
 
@@ -135,7 +158,107 @@ void alignMessages(t_message *resMessage, Bool doInternalSlick, unsigned int nbM
 }
 
 
+/**
+   freeProfile:
+
+   This function frees the alignment computed by alignProfiles(), whose
+   semantic tag names belong to the aligned messages.
+*/
+static void freeProfile(t_message * profile) {
+  unsigned int j = 0;
+
+  if (profile->semanticTags != NULL) {
+    for (j = 0; j < profile->len; j++) {
+      free(profile->semanticTags[j]);
+    }
+    free(profile->semanticTags);
+  }
+  free(profile->alignment);
+  free(profile->mask);
+}
+
+/**
+   alignMessagesProgressive:
+
+   This function aligns the messages following a guide tree: the
+   alignments of the two children of each node are aligned together,
+   and freed once their parent is computed.
+
+   @param resMessage: the message where the alignment of the root is stored
+   @param doInternalSlick: slick the alignment of each node
+   @param nbMessages: the number of messages, the leaves of the tree
+   @param messages: the messages to align
+   @param guideTree: the nbMessages - 1 nodes of the tree, in the order of their
+   alignment: the node nbMessages + k aligns the nodes guideTree[2 * k] and
+   guideTree[2 * k + 1] (the nodes lower than nbMessages are the messages)
+   @param debugMode: activate or deactive debug messages
+*/
+void alignMessagesProgressive(t_message *resMessage, Bool doInternalSlick, unsigned int nbMessages, t_message * messages, unsigned int * guideTree, Bool debugMode) {
+  t_message * nodes = NULL;
+  unsigned int i_node = 0;
+  unsigned int i_child = 0;
+  unsigned int k = 0;
+
+  if (nbMessages == 1) {
+    resMessage->len = messages[0].len;
+    resMessage->mask = messages[0].mask;
+    resMessage->alignment = messages[0].alignment;
+    resMessage->semanticTags = messages[0].semanticTags;
+    free(messages);
+    return;
+  }
+
+  nodes = malloc((2 * nbMessages - 1) * sizeof(t_message));
+  if (nodes == NULL) {
+    printf("Error while trying to allocate memory for the guide tree.\n");
+    return;
+  }
+  memcpy(nodes, messages, nbMessages * sizeof(t_message));
+
+  for (k = 0; k < nbMessages - 1; k++) {
+    // Update the execution status
+    if (callbackStatus(0, 100.0 * k / (nbMessages - 1), "Align the node %d of the guide tree", nbMessages + k) == -1) {
+      printf("Error, error while executing C callback.\n");
+    }
+
+    i_node = nbMessages + k;
+    nodes[i_node].score = resMessage->score;
+    alignProfiles(&nodes[i_node], doInternalSlick, &nodes[guideTree[2 * k]], &nodes[guideTree[2 * k + 1]], debugMode, FALSE);
+
+    // The alignments of the children are no longer needed
+    for (i_child = 2 * k; i_child < 2 * k + 2; i_child++) {
+      if (guideTree[i_child] >= nbMessages) {
+        freeProfile(&nodes[guideTree[i_child]]);
+      }
+    }
+  }
+
+  // Update the execution status
+  if (callbackStatus(0, 100.0, "The %d messages have sucessfully been aligned.", nbMessages) == -1) {
+    printf("Error, error while executing C callback.\n");
+  }
+
+  resMessage->len = nodes[2 * nbMessages - 2].len;
+  resMessage->alignment = nodes[2 * nbMessages - 2].alignment;
+  resMessage->mask = nodes[2 * nbMessages - 2].mask;
+  resMessage->semanticTags = nodes[2 * nbMessages - 2].semanticTags;
+
+  free(nodes);
+  free(messages);
+}
+
 char* alignTwoMessages(t_message * resMessage, Bool doInternalSlick, t_message * message1, t_message * message2, Bool debugMode){
+  return alignProfiles(resMessage, doInternalSlick, message1, message2, debugMode, TRUE);
+}
+
+/**
+   alignProfiles:
+
+   This function aligns two messages (or the alignments of groups of
+   messages) and stores their common alignment in resMessage. Their
+   regex is only computed (and returned) if buildRegex is TRUE.
+*/
+static char* alignProfiles(t_message * resMessage, Bool doInternalSlick, t_message * message1, t_message * message2, Bool debugMode, Bool buildRegex){
   // local variables
   short int ** matrix = NULL;
   unsigned int i = 0;
@@ -204,6 +327,9 @@ char* alignTwoMessages(t_message * resMessage, Bool doInternalSlick, t_message *
   unsigned int lastColumn = 0;
   int maxScoreMatrix = 0;
 
+  // Semantic matches are only possible if both messages have tags
+  Bool semantic = hasSemanticTags(message1) && hasSemanticTags(message2);
+
   lastRow = ((message1->len+1)/BLEN) * BLEN;
   lastColumn = ((message2->len+1)/BLEN) * BLEN;
 
@@ -229,7 +355,13 @@ char* alignTwoMessages(t_message * resMessage, Bool doInternalSlick, t_message *
           if (i > 0 && j > 0){
             elt1 = matrix[i - 1][j - 1];
 
-	    elt1 += getSimilarityScore(message1, message2, i, j);
+	    if (semantic) {
+	      elt1 += getSimilarityScore(message1, message2, i, j);
+	    } else if ((message1->mask[i - 1] == 0) && (message2->mask[j - 1] == 0) && (message1->alignment[i - 1] == message2->alignment[j - 1])) {
+	      elt1 += MATCH;
+	    } else {
+	      elt1 += MISMATCH;
+	    }
             elt2 = matrix[i][j - 1] + GAP;
             elt3 = matrix[i - 1][j] + GAP;
             max = elt1 > elt2 ? elt1 : elt2;
@@ -491,8 +623,10 @@ char* alignTwoMessages(t_message * resMessage, Bool doInternalSlick, t_message *
     tmpMessageTags[i]->name = NULL;
   }
 
-  regex= malloc( sizereg* sizeof(char));
-  memset(regex, 0, sizereg);
+  if (buildRegex == TRUE) {
+    regex= malloc( sizereg* sizeof(char));
+    memset(regex, 0, sizereg);
+  }
 
   if (debugMode == TRUE) {
     printf("Compute the common alignment:\n");
@@ -529,11 +663,11 @@ char* alignTwoMessages(t_message * resMessage, Bool doInternalSlick, t_message *
 
 
     if ((maskMessage1[i] == END) || (maskMessage2[i] == END)) {
-      if(regind==0){
+      if(regex != NULL && regind==0){
 	regex[0] ='.';
 	regind++;
       }
-      else if(regex[regind-1] !='.'){
+      else if(regex != NULL && regex[regind-1] !='.'){
 	regex[regind] ='.';
 	regind++;
       }
@@ -543,18 +677,20 @@ char* alignTwoMessages(t_message * resMessage, Bool doInternalSlick, t_message *
     else if ((maskMessage1[i] == EQUAL) && (maskMessage2[i] == EQUAL) && (contentMessage1[i] == contentMessage2[i])) {
       tmpMessage[i] = contentMessage1[i];
       sprintf(hexrepr,"%02x",contentMessage1[i]);
-      sprintf(regex+regind,"%02x",contentMessage1[i]);
-      //regex[regind] = hexrepr[1];
-      //regex[regind+1] = hexrepr[0];
-      regind+=2;
+      if(regex != NULL){
+        sprintf(regex+regind,"%02x",contentMessage1[i]);
+        //regex[regind] = hexrepr[1];
+        //regex[regind+1] = hexrepr[0];
+        regind+=2;
+      }
       tmpMessageMask[i] = EQUAL;
     }
     else {
-      if(regind==0){
+      if(regex != NULL && regind==0){
 	regex[0] ='.';
 	regind++;
       }
-      else if(regex[regind-1] !='.'){
+      else if(regex != NULL && regex[regind-1] !='.'){
 	regex[regind] ='.';
 	regind++;
       }
@@ -695,6 +831,239 @@ end:
 }
 
 
+// Traceback directions stored by computeAlignmentScore()
+static const unsigned char TRACEBACK_DIAGONAL = 0;
+static const unsigned char TRACEBACK_LEFT = 1;
+static const unsigned char TRACEBACK_TOP = 2;
+
+// Value of the cells outside of the band, lower than any score
+static const short int OUT_OF_BAND = SHRT_MIN / 2;
+
+/**
+   computeAlignmentScore:
+
+   This function computes the similarity score of two messages, as
+   computeDistance() of the scores of alignTwoMessages() (without internal
+   slick), but without building their alignment: only two rows of the
+   matrix and one traceback direction per cell are kept.
+
+   @param message1: the first message
+   @param message2: the second message
+   @param bandWidth: if not 0, only the cells at most bandWidth cells away from
+   the diagonals of the matrix (0, 0) and (len1, len2) are computed
+   @param minScore: if not 0, the computation stops as soon as the score
+   cannot reach minScore: an upper bound of the score (lower than minScore)
+   is then returned
+   @param debugMode: activate or deactive debug messages
+   @return the score of the alignment
+*/
+float computeAlignmentScore(t_message * message1, t_message * message2, unsigned int bandWidth, float minScore, Bool debugMode) {
+  unsigned int len1 = message1->len;
+  unsigned int len2 = message2->len;
+  unsigned int i = 0;
+  unsigned int j = 0;
+  unsigned int k = 0;
+  float result = 0;
+
+  // The cells (i, j) of the band verify minDiag <= j - i <= maxDiag
+  int minDiag = - (int) len1;
+  int maxDiag = (int) len2;
+  int lenDiff = (int) len2 - (int) len1;
+  if (bandWidth > 0) {
+    minDiag = (lenDiff < 0 ? lenDiff : 0) - (int) bandWidth;
+    maxDiag = (lenDiff > 0 ? lenDiff : 0) + (int) bandWidth;
+  }
+  unsigned int width = (unsigned int) (maxDiag - minDiag + 1) < len2 ? (unsigned int) (maxDiag - minDiag + 1) : len2;
+
+  short int * previousRow = malloc((len2 + 1) * sizeof(short int));
+  short int * currentRow = malloc((len2 + 1) * sizeof(short int));
+  short int * tmpRow = NULL;
+  unsigned char * directions = malloc(((size_t) len1 * width + 1) * sizeof(unsigned char));
+  unsigned char * alignmentMask = malloc((len1 + len2 + 1) * sizeof(unsigned char));
+  if (previousRow == NULL || currentRow == NULL || directions == NULL || alignmentMask == NULL) {
+    printf("Error while trying to allocate memory for the alignment.\n");
+    goto end;
+  }
+
+  short int elt1, elt2, elt3, max, eltL, eltD, eltT;
+  int maxScoreMatrix = 0;
+  int maxReachable = 0;
+  int reachable = 0;
+  unsigned int nbRemaining = 0;
+
+  // Semantic matches are only possible if both messages have tags
+  Bool semantic = hasSemanticTags(message1) && hasSemanticTags(message2);
+  short int maxGain = semantic ? MATCH + SEMANTIC_MATCH : MATCH;
+  unsigned int lo = 0;
+  unsigned int hi = 0;
+
+  // Only the cells which can be reached from the band are initialized
+  for (j = 0; j <= len2; j++) {
+    previousRow[j] = ((int) j <= maxDiag) ? 0 : OUT_OF_BAND;
+  }
+
+  unsigned int lenSmallestPayload = len2 > len1 ? len1 : len2;
+  float maxScore = lenSmallestPayload * MATCH;
+
+  //+------------------------------------------------------------------------+
+  // Fullfill the matrix row by row
+  //+------------------------------------------------------------------------+
+  for (i = 1; i <= len1; i++) {
+    lo = ((int) i + minDiag > 1) ? (unsigned int) ((int) i + minDiag) : 1;
+    hi = ((int) i + maxDiag < (int) len2) ? (unsigned int) ((int) i + maxDiag) : len2;
+
+    currentRow[0] = (- (int) i >= minDiag) ? 0 : OUT_OF_BAND;
+    if (lo > 1) {
+      currentRow[lo - 1] = OUT_OF_BAND;
+    }
+    if (hi < len2) {
+      currentRow[hi + 1] = OUT_OF_BAND;
+    }
+
+    // A path starting from the first column can at most gain a match per row
+    maxReachable = maxGain * (int) (len1 - i < len2 ? len1 - i : len2);
+    for (j = lo; j <= hi; j++) {
+      eltD = previousRow[j - 1];
+      eltT = previousRow[j];
+      eltL = currentRow[j - 1];
+
+      elt1 = eltD;
+      if (semantic) {
+        elt1 += getSimilarityScore(message1, message2, i, j);
+      } else if ((message1->mask[i - 1] == 0) && (message2->mask[j - 1] == 0) && (message1->alignment[i - 1] == message2->alignment[j - 1])) {
+        elt1 += MATCH;
+      } else {
+        elt1 += MISMATCH;
+      }
+      elt2 = eltL + GAP;
+      elt3 = eltT + GAP;
+      max = elt1 > elt2 ? elt1 : elt2;
+      max = max > elt3 ? max : elt3;
+      currentRow[j] = max;
+      if (max > maxScoreMatrix) {
+        maxScoreMatrix = max;
+      }
+
+      // The paths from this cell can at most gain a match per diagonal step
+      nbRemaining = len1 - i < len2 - j ? len1 - i : len2 - j;
+      reachable = max + maxGain * (int) nbRemaining;
+      if (reachable > maxReachable) {
+        maxReachable = reachable;
+      }
+
+      // Same choice as the traceback of alignTwoMessages()
+      if ((eltL > eltD) && (eltL > eltT)) {
+        directions[(size_t) (i - 1) * width + (j - lo)] = TRACEBACK_LEFT;
+      } else if ((eltT >= eltL) && (eltT > eltD)) {
+        directions[(size_t) (i - 1) * width + (j - lo)] = TRACEBACK_TOP;
+      } else {
+        directions[(size_t) (i - 1) * width + (j - lo)] = TRACEBACK_DIAGONAL;
+      }
+    }
+
+    tmpRow = previousRow;
+    previousRow = currentRow;
+    currentRow = tmpRow;
+
+    // The two other scores are at most 100
+    if (minScore > 0 && i < len1) {
+      t_score bound;
+      bound.s1 = 100.0f;
+      bound.s2 = 100.0f;
+      bound.s3 = (100.0f / maxScore) * (float) (maxReachable > maxScoreMatrix ? maxReachable : maxScoreMatrix);
+      if (bound.s3 > 100.0f) {
+        bound.s3 = 100.0f;
+      }
+      float maxDistance = computeDistance(&bound);
+      if (maxDistance < minScore) {
+        result = maxDistance;
+        goto end;
+      }
+    }
+  }
+
+  // Compute score of the alignment (ratio regarding the max score these two payloads could have get if they were equals)
+  t_score score;
+  score.s3 = (100.0f / maxScore) * (float) maxScoreMatrix;
+  if (score.s3 > 100.0f) {
+    score.s3 = 100.0f;
+  } else if (score.s3 < 0.0f) {
+    score.s3 = 0.0f;
+  }
+
+  //+------------------------------------------------------------------------+
+  // Traceback: only the mask of the common alignment is computed
+  //+------------------------------------------------------------------------+
+  unsigned int nbDynTotal = 0;
+  unsigned int nbDynCommon = 0;
+  unsigned char direction = TRACEBACK_DIAGONAL;
+  k = len1 + len2;
+  i = len1;
+  j = len2;
+  while ((i > 0) && (j > 0)) {
+    lo = ((int) i + minDiag > 1) ? (unsigned int) ((int) i + minDiag) : 1;
+    direction = directions[(size_t) (i - 1) * width + (j - lo)];
+    --k;
+    if (direction == TRACEBACK_LEFT) {
+      --j;
+      alignmentMask[k] = DIFFERENT;
+      nbDynTotal += 1;
+    } else if (direction == TRACEBACK_TOP) {
+      --i;
+      alignmentMask[k] = DIFFERENT;
+      nbDynTotal += 1;
+    } else {
+      --i;
+      --j;
+      if ((message1->mask[i] == EQUAL) && (message2->mask[j] == EQUAL)) {
+        if (message1->alignment[i] == message2->alignment[j]) {
+          alignmentMask[k] = EQUAL;
+        } else {
+          alignmentMask[k] = DIFFERENT;
+          nbDynTotal += 1;
+          nbDynCommon += 1;
+        }
+      } else {
+        alignmentMask[k] = DIFFERENT;
+        nbDynTotal += 1;
+      }
+    }
+  }
+  // The traceback is closed by going to the extreme top or left
+  while (i > 0) {
+    --i;
+    --k;
+    alignmentMask[k] = DIFFERENT;
+    nbDynTotal += 1;
+  }
+  while (j > 0) {
+    --j;
+    --k;
+    alignmentMask[k] = DIFFERENT;
+    nbDynTotal += 1;
+  }
+
+  t_message alignedMessage;
+  alignedMessage.len = len1 + len2 - k;
+  alignedMessage.mask = alignmentMask + k;
+  score.s1 = getScoreRatio(&alignedMessage);
+  score.s2 = getScoreDynSize(nbDynTotal, nbDynCommon);
+  result = computeDistance(&score);
+
+  if (debugMode == TRUE) {
+    printf("Score ratio : %0.2f.\n", score.s1);
+    printf("Score DynSize : %0.2f.\n", score.s2);
+    printf("Score Rang : %0.2f.\n", score.s3);
+  }
+
+end:
+  free(previousRow);
+  free(currentRow);
+  free(directions);
+  free(alignmentMask);
+  return result;
+}
+
 float getScoreRatio(t_message * message) {
   // Computing score of the alignment
   float nbDynamic = 0.0f;
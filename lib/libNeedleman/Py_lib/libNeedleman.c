@@ -67,6 +67,75 @@ PyObject* PyInit__libNeedleman(void) {
   return PyModule_Create(&moduledef);
 }
 
+//+---------------------------------------------------------------------------+
+//| parseGuideTree : convert the guide tree given to py_alignMessages
+//+---------------------------------------------------------------------------+
+/**
+   parseGuideTree:
+
+   This function converts the guide tree of py_alignMessages(), a list of
+   the (left, right) nodes aligned in order, where the node nbMessages + k
+   is the alignment of the k-th pair. Each node must be aligned once,
+   after it has been computed. Returns NULL with a Python error set if
+   the guide tree is invalid.
+*/
+static unsigned int * parseGuideTree(PyObject * pyGuideTree, unsigned int nbMessages) {
+  PyObject * pyNodes = NULL;
+  Py_ssize_t nbNodes = 0;
+  unsigned int * guideTree = NULL;
+  unsigned char * aligned = NULL;
+  long node = 0;
+
+  pyNodes = PySequence_Fast(pyGuideTree, "The guide tree should be a sequence of pairs of nodes.");
+  if (pyNodes == NULL) {
+    return NULL;
+  }
+  nbNodes = PySequence_Fast_GET_SIZE(pyNodes);
+  if (nbMessages == 0 || nbNodes != (Py_ssize_t) nbMessages - 1) {
+    PyErr_Format(PyExc_ValueError, "The guide tree of %u messages should have %u nodes.", nbMessages, nbMessages > 0 ? nbMessages - 1 : 0);
+    Py_DECREF(pyNodes);
+    return NULL;
+  }
+
+  guideTree = malloc((2 * nbNodes + 1) * sizeof(unsigned int));
+  aligned = calloc(2 * nbMessages, sizeof(unsigned char));
+  if (guideTree == NULL || aligned == NULL) {
+    free(guideTree);
+    free(aligned);
+    Py_DECREF(pyNodes);
+    PyErr_NoMemory();
+    return NULL;
+  }
+
+  for (Py_ssize_t k = 0; k < 2 * nbNodes; k++) {
+    PyObject * pair = PySequence_Fast_GET_ITEM(pyNodes, k / 2);
+    PyObject * pyNode = NULL;
+    if (!PyTuple_Check(pair) || PyTuple_GET_SIZE(pair) != 2) {
+      PyErr_SetString(PyExc_ValueError, "Each node of the guide tree should be a pair of nodes.");
+      break;
+    }
+    pyNode = PyTuple_GET_ITEM(pair, k % 2);
+    node = PyLong_AsLong(pyNode);
+    if (node == -1 && PyErr_Occurred()) {
+      break;
+    }
+    if (node < 0 || node >= (long) nbMessages + k / 2 || aligned[node]) {
+      PyErr_Format(PyExc_ValueError, "Invalid node %ld in the guide tree.", node);
+      break;
+    }
+    aligned[node] = 1;
+    guideTree[k] = (unsigned int) node;
+  }
+  free(aligned);
+  Py_DECREF(pyNodes);
+
+  if (PyErr_Occurred()) {
+    free(guideTree);
+    return NULL;
+  }
+  return guideTree;
+}
+
 //+---------------------------------------------------------------------------+
 //| py_alignSequences : Python wrapper for alignMessages
 //+---------------------------------------------------------------------------+
@@ -78,17 +147,19 @@ PyObject* py_alignMessages(__attribute__((unused))PyObject* self, PyObject* args
   PyObject *temp_cb;
   unsigned int doInternalSlick = 0;
   unsigned int debugMode = 0;
+  PyObject *pyGuideTree = NULL;
 
   // local variables
   t_message * resMessage;
   unsigned int nbMessages = 0;
+  unsigned int * guideTree = NULL;
   Bool bool_debugMode;
   Bool bool_doInternalSlick;
   int parseRet;
   t_score score;
 
   // Converts the arguments
-  if (!PyArg_ParseTuple(args, "hOhO", &doInternalSlick, &temp_cb, &debugMode, &wrapperFactory)) {
+  if (!PyArg_ParseTuple(args, "hOhO|O", &doInternalSlick, &temp_cb, &debugMode, &wrapperFactory, &pyGuideTree)) {
     PyErr_SetString(PyExc_TypeError, "Error while parsing the arguments provided to py_alignMessages");
     return NULL;
   }
@@ -118,6 +189,17 @@ PyObject* py_alignMessages(__attribute__((unused))PyObject* self, PyObject* args
     return NULL;
   }
 
+  //+------------------------------------------------------------------------+
+  // Parse the optional guide tree
+  //+------------------------------------------------------------------------+
+  if (pyGuideTree != NULL && pyGuideTree != Py_None) {
+    guideTree = parseGuideTree(pyGuideTree, nbMessages);
+    if (guideTree == NULL) {
+      free(messages);
+      return NULL;
+    }
+  }
+
   // Convert debugMode parameter in a BOOL
   if (debugMode) {
     bool_debugMode = TRUE;
@@ -152,7 +234,12 @@ PyObject* py_alignMessages(__attribute__((unused))PyObject* self, PyObject* args
   // Execute the alignment process
   //+------------------------------------------------------------------------+
   int t=clock();
-  alignMessages(resMessage, bool_doInternalSlick, nbMessages, messages, bool_debugMode);
+  if (guideTree != NULL) {
+    alignMessagesProgressive(resMessage, bool_doInternalSlick, nbMessages, messages, guideTree, bool_debugMode);
+    free(guideTree);
+  } else {
+    alignMessages(resMessage, bool_doInternalSlick, nbMessages, messages, bool_debugMode);
+  }
   int t1=clock();
 
   if (debugMode == 1) {
@@ -78,13 +78,16 @@ PyObject* py_computeSimilarityMatrix(__attribute__((unused))PyObject* self, PyOb
   PyObject *temp2_cb;
   Bool bool_debugMode;
   PyObject* wrapperFactory;
-  float **scoreMatrix = NULL;
+  PyObject *recordedScores = NULL;
   t_message *mesmessages;
   long nbmessage = 0;
+  int nbThreads = 1;
+  unsigned int bandWidth = 0;
+  float minScore = 0;
 
 
   // Converts the arguments
-  if (!PyArg_ParseTuple(args, "hOOhO", &doInternalSlick, &temp_cb, &temp2_cb, &debugMode,&wrapperFactory)) {
+  if (!PyArg_ParseTuple(args, "hOOhO|iIf", &doInternalSlick, &temp_cb, &temp2_cb, &debugMode,&wrapperFactory, &nbThreads, &bandWidth, &minScore)) {
     PyErr_SetString(PyExc_TypeError, "Error while parsing the arguments provided to py_getHighestEquivalentGroup");
     return NULL;
   }
@@ -114,11 +117,11 @@ PyObject* py_computeSimilarityMatrix(__attribute__((unused))PyObject* self, PyOb
     return NULL;
   }
 
-  //init matrix
-  scoreMatrix = (float**) malloc (nbmessage*sizeof(float*));
-  for(i=0;i<nbmessage;i++)
-  {
-    scoreMatrix[i] = calloc (nbmessage,sizeof(float*));
+  // The scores are recorded in a condensed matrix of floats, which can be
+  // read with numpy.frombuffer()
+  recordedScores = PyByteArray_FromStringAndSize(NULL, (Py_ssize_t) ((size_t) nbmessage * (nbmessage - 1) / 2 * sizeof(float)));
+  if (recordedScores != NULL) {
+    memset(PyByteArray_AS_STRING(recordedScores), 0, PyByteArray_GET_SIZE(recordedScores));
   }
 
   // Convert debugMode parameter in a BOOL
@@ -129,32 +132,8 @@ PyObject* py_computeSimilarityMatrix(__attribute__((unused))PyObject* self, PyOb
     bool_debugMode = FALSE;
   }
 
-  computeSimilarityMatrix(nbmessage, mesmessages, bool_debugMode, scoreMatrix);
-
-  //Compute the scores recorded in a python list://TODO Return Factory
-  PyObject *recordedScores = PyList_New((nbmessage*(nbmessage-1))/2);
-  if (!recordedScores)
-    return NULL;
-  int i_record = 0;
-  int j_record = 0;
-  int current_index = 0;
-  for (i_record = 0; i_record < nbmessage; i_record++) {
-      for(j_record = i_record + 1; j_record < nbmessage; j_record++){
-
-        PyObject *s = PyFloat_FromDouble((double)scoreMatrix[i_record][j_record]);
-        PyObject *i_p = PyUnicode_FromString(mesmessages[i_record].uid);
-        PyObject *j_p = PyUnicode_FromString(mesmessages[j_record].uid);
-        PyObject *res = PyList_New(3);
-        if (!s || !i_p || !j_p || !res) {
-            Py_XDECREF(recordedScores);
-            return NULL;
-        }
-        PyList_SET_ITEM(res,0,i_p);
-        PyList_SET_ITEM(res,1,j_p);
-        PyList_SET_ITEM(res,2,s);
-        PyList_SET_ITEM(recordedScores, current_index, res);   // reference to num stolen
-        current_index++;
-     }
+  if (recordedScores != NULL) {
+    computeSimilarityMatrix(nbmessage, mesmessages, bool_debugMode, (float*) PyByteArray_AS_STRING(recordedScores), nbThreads, bandWidth, minScore);
   }
 
   //Free all //TODO: do a freeFactory
@@ -165,12 +144,10 @@ PyObject* py_computeSimilarityMatrix(__attribute__((unused))PyObject* self, PyOb
     free(mesmessages[i].semanticTags);
 
     free(mesmessages[i].mask);
-    free(scoreMatrix[i]);
   }
-  free(scoreMatrix);
   free(mesmessages);
 
-  return Py_BuildValue("S", recordedScores);
+  return recordedScores;
 }
 
 
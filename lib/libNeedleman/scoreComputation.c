@@ -32,78 +32,184 @@
 //| Import Associated Header
 //+---------------------------------------------------------------------------+
 #include "scoreComputation.h"
+#include <pthread.h>
 #ifdef _WIN32
 #include <stdio.h>
 #include <malloc.h>
 #endif
 
+/**
+   The pairs of messages to align, shared by the threads which compute
+   the scores: the rows of the matrix are dispatched one by one.
+*/
+typedef struct {
+  int nbMessage;
+  t_message* messages;
+  Bool debugMode;
+  unsigned int bandWidth;
+  float minScore;
+  float* scoreMatrix;
+  int nextRow;
+  int endRow;
+  pthread_mutex_t lock;
+} t_scoreJob;
+
+/**
+   computeRowScores:
+
+   This function computes the similarity scores of the message i
+   with the messages p > i, stored in the row i of the condensed matrix.
+*/
+static void computeRowScores(t_scoreJob* job, int i) {
+  int p;
+  // Index of the score of messages i and i + 1 in the condensed matrix
+  size_t rowOffset = (size_t) i * job->nbMessage - (size_t) i * (i + 1) / 2;
+
+  for (p = i + 1; p < job->nbMessage; p++) {
+    /**
+       Computes the NeedlemanScore between messages i and p
+    */
+    if (job->debugMode) {
+      printf("Align two messages (%d, %d)\n", i, p);
+    }
+
+    job->scoreMatrix[rowOffset + p - i - 1] = computeAlignmentScore(&job->messages[i], &job->messages[p], job->bandWidth, job->minScore, job->debugMode);
+  }
+}
+
+/**
+   scoreWorker:
+
+   The function run by each thread: it computes the rows of the job
+   until all of them are processed.
+*/
+static void* scoreWorker(void* arg) {
+  t_scoreJob* job = (t_scoreJob*) arg;
+  int i;
+
+  for (;;) {
+    pthread_mutex_lock(&job->lock);
+    i = job->nextRow++;
+    pthread_mutex_unlock(&job->lock);
+    if (i >= job->endRow) {
+      break;
+    }
+    computeRowScores(job, i);
+  }
+  return NULL;
+}
+
+/**
+   computeRows:
+
+   This function computes the rows [startRow, endRow[ of the matrix
+   with nbThreads threads, the current one included.
+*/
+static void computeRows(t_scoreJob* job, int startRow, int endRow, int nbThreads) {
+  pthread_t* threads = NULL;
+  int nbStarted = 0;
+  int i;
+
+  job->nextRow = startRow;
+  job->endRow = endRow;
+  if (nbThreads > endRow - startRow) {
+    nbThreads = endRow - startRow;
+  }
+  if (nbThreads > 1) {
+    threads = malloc((nbThreads - 1) * sizeof(pthread_t));
+  }
+  if (threads != NULL) {
+    for (i = 0; i < nbThreads - 1; i++) {
+      // The current thread computes the remaining rows if it fails
+      if (pthread_create(&threads[nbStarted], NULL, scoreWorker, job) == 0) {
+        nbStarted++;
+      }
+    }
+  }
+  scoreWorker(job);
+  for (i = 0; i < nbStarted; i++) {
+    pthread_join(threads[i], NULL);
+  }
+  free(threads);
+}
+
 /**
    computeSimilarityMatrix:
 
    This functions computes a matrix which contains the similarity scores
-   between the provided messages
+   between the provided messages. The pairs of messages are aligned by
+   nbThreads threads, the Python callbacks being only executed by the
+   calling thread between two batches of rows (the GIL is released while
+   the batches are computed). Each score is computed independently, the
+   matrix does not depend on the number of threads.
    @param nbMessage: the number of provided messages in the param messages
    @param messages: a list containing messages to work with
    @param debug: activate or deactive debug messages
-   @param scoreMatrix: a double-dimension array where the matrix score will be stored
+   @param scoreMatrix: a condensed matrix where the scores will be stored: the score
+   of messages i < p is at index i * nbMessage - i * (i + 1) / 2 + p - i - 1
+   @param nbThreads: the number of threads which align the messages
+   @param bandWidth: if not 0, the width of the band of the alignments (see computeAlignmentScore)
+   @param minScore: if not 0, the scores lower than minScore can be replaced by an upper bound
 */
-void computeSimilarityMatrix(int nbMessage, t_message* messages, Bool debugMode, float** scoreMatrix) {
-  int i;
-  t_message tmpResultMessage;
-  t_score score;
+void computeSimilarityMatrix(int nbMessage, t_message* messages, Bool debugMode, float* scoreMatrix, int nbThreads, unsigned int bandWidth, float minScore) {
+  t_scoreJob job;
+  int startRow = 0;
+  int endRow = 0;
+  size_t nbPairs = (size_t) nbMessage * (nbMessage - 1) / 2;
+  size_t nbDonePairs = 0;
+  size_t nbBatchPairs = 0;
 
-  // local variable
-  int p = 0;
-
-  /**
-     Stops the execution if user requested so
-  */
-  if (callbackIsFinish() == 1) {
-    return;
+  if (nbThreads < 1) {
+    nbThreads = 1;
   }
 
+  job.nbMessage = nbMessage;
+  job.messages = messages;
+  job.debugMode = debugMode;
+  job.bandWidth = bandWidth;
+  job.minScore = minScore;
+  job.scoreMatrix = scoreMatrix;
+  pthread_mutex_init(&job.lock, NULL);
+
   /**
      We loop over each different couple of messages
      messages[i] and messages [p] with i < p
-     (diag. superior matrix)
+     (diag. superior matrix), by batches of about 1% of the pairs
   */
-  for (i = 0; i < nbMessage; i++) {
+  while (startRow < nbMessage) {
     /**
-     Stops the execution if user requested so
+       Stops the execution if user requested so
     */
     if (callbackIsFinish() == 1) {
-      return;
+      break;
     }
 
-    for (p = i + 1; p < nbMessage; p++) {
-      /**
-	 Computes the NeedlemanScore between messages i and p
-	 result is stored in the matrix[i][p]
-      */
-      tmpResultMessage.len = 0;
-      score.s1 = 0;
-      score.s2 = 0;
-      score.s3 = 0;
-      tmpResultMessage.score = &score;
-
-      if (debugMode) {
-	printf("Align two messages (%d, %d)\n", i, p);
-      }
-
-      char * regex = alignTwoMessages(&tmpResultMessage, FALSE, &messages[i], &messages[p], debugMode);
-      if (debugMode) {
-	printf("Regex = %s\n", regex);
-      }
-      free(regex);
-      scoreMatrix[i][p] = computeDistance(tmpResultMessage.score);
+    nbBatchPairs = 0;
+    endRow = startRow;
+    while (endRow < nbMessage && (nbBatchPairs * 100 < nbPairs || endRow - startRow < nbThreads)) {
+      nbBatchPairs += nbMessage - endRow - 1;
+      endRow++;
     }
 
+#ifndef CCALLFORDEBUG
+    Py_BEGIN_ALLOW_THREADS
+#endif
+    computeRows(&job, startRow, endRow, nbThreads);
+#ifndef CCALLFORDEBUG
+    Py_END_ALLOW_THREADS
+#endif
+
+    startRow = endRow;
+    nbDonePairs += nbBatchPairs;
+
     /**
        Update the current status
     */
-    double val = (double) 100.0 * (i * nbMessage + nbMessage - 1) / ((nbMessage - 1) * (nbMessage + 1));
+    double val = (nbPairs > 0) ? (double) 100.0 * nbDonePairs / nbPairs : 100.0;
     if (callbackStatus(0,val,"Building Status (%.2lf %%)",(float) val) == -1) {
       printf("Error, error while executing C callback.\n");
     }
   }
+
+  pthread_mutex_destroy(&job.lock);
 }
@@ -143,7 +143,8 @@ moduleLibNeedleman = Extension('netzob._libNeedleman',
                                         opj(argsFactoriesPath, "factory.c"),
                                         opj(toolsPath, "getBID.c")],
                                define_macros=macros,
-                               include_dirs=includes)
+                               include_dirs=includes,
+                               libraries=["pthread"])
 
 # Module ScoreComputation
 moduleLibScoreComputation = Extension('netzob._libScoreComputation',
@@ -156,7 +157,8 @@ moduleLibScoreComputation = Extension('netzob._libScoreComputation',
                                                opj(argsFactoriesPath, "factory.c"),
                                                opj(toolsPath, "getBID.c")],
                                       define_macros=macros,
-                                      include_dirs=includes)
+                                      include_dirs=includes,
+                                      libraries=["pthread"])
 
 # Module Interface
 moduleLibInterface = Extension('netzob._libInterface',
@@ -187,7 +189,6 @@ cythonModules = cythonize(["src/netzob/Fuzzing/Generators/xorshift.pyx"],
 def get_dependencies():
     return """
     getmac==0.8.3
-    bintrees==2.2.0
     bitarray==0.8.1
     colorama==0.4.6
     minepy==1.2.6
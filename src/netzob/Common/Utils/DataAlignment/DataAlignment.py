@@ -65,12 +65,14 @@ class DataAlignment(object):
     :param styled: indicated if the result visualization filter should be applied
     :param memory: A memory used to store variable values during
                    specialization and abstraction of sequence of symbols.
+    :param parsingPlan: the parsing plan of the root of the field, if it is already compiled
     :type data: a :class:`list` of data to align
     :type field: :class:`AbstractField <netzob.Model.Vocabulary.AbstractField.AbstractField>`
     :type depth: :class:`int`
     :type encoded: :class:`bool`
     :type styled: :class:`bool`
     :type memory: :class:`Memory <netzob.Model.Vocabulary.Domain.Variables.Memory>`
+    :type parsingPlan: :class:`ParsingPlan <netzob.Model.Vocabulary.Domain.Parser.ParsingPlan.ParsingPlan>`
 
     For instance, below is a very simple example of data alignment executed
     traditionnaly
@@ -130,7 +132,7 @@ class DataAlignment(object):
 
     """
 
-    def __init__(self, data, field, depth=None, encoded=True, styled=False, memory=None, messageParser=None):
+    def __init__(self, data, field, depth=None, encoded=True, styled=False, memory=None, messageParser=None, parsingPlan=None):
         self.data = data
         self.field = field
         self.depth = depth
@@ -138,6 +140,7 @@ class DataAlignment(object):
         self.styled = styled
         self.memory = memory
         self.messageParser = messageParser
+        self.parsingPlan = parsingPlan
 
     def execute(self):
         """Execute the alignment of data following specified field
@@ -160,25 +163,39 @@ class DataAlignment(object):
 
         result.headers = [str(field.name) for field in targetedFieldLeafFields]
 
+        # The parsing plan is compiled once for all the data
+        parsingPlan = self.parsingPlan
+        if parsingPlan is None:
+            parsingPlan = self.messageParser.compile(self.__root, depth=self.depth)
+
+        # The fields to display, along with their encoding functions,
+        # are also computed once for all the data
+        selectedLeafFields = self.field.getLeafFields(depth=self.depth)
+        outputFields = []
+        for ifield, currentField in enumerate(targetedFieldLeafFields):
+            if currentField not in selectedLeafFields:
+                continue
+            encodingFunctions = []
+            if self.encoded:
+                encodingFunctions = list(currentField.encodingFunctions.values())
+            outputFields.append((ifield, encodingFunctions))
+
         for d in self.data:
-            alignedMsg = next(self.messageParser.parseRaw(d, targetedFieldLeafFields))
+            alignedMsg = next(self.messageParser.parseRaw(d, parsingPlan))
 
             alignedEncodedMsg = []
-            for ifield, currentField in enumerate(targetedFieldLeafFields):
+            for (ifield, encodingFunctions) in outputFields:
 
                 # now we apply encoding and mathematic functions
                 fieldValue = alignedMsg[ifield]
 
-                if self.encoded and len(
-                        list(currentField.encodingFunctions.values())) > 0:
-                    for encodingFunction in list(
-                            currentField.encodingFunctions.values()):
+                if len(encodingFunctions) > 0:
+                    for encodingFunction in encodingFunctions:
                         fieldValue = encodingFunction.encode(fieldValue)
                 else:
                     fieldValue = fieldValue.tobytes()
 
-                if currentField in self.field.getLeafFields(depth=self.depth):
-                    alignedEncodedMsg.append(fieldValue)
+                alignedEncodedMsg.append(fieldValue)
 
             result.append(alignedEncodedMsg)
 
@@ -187,7 +204,7 @@ class DataAlignment(object):
     # Static method
     @staticmethod
     @typeCheck(str, AbstractField, int)
-    def align(data, field, depth=None, encoded=True, memory=None, messageParser=None):
+    def align(data, field, depth=None, encoded=True, memory=None, messageParser=None, parsingPlan=None):
         """Execute an alignment of specified data with provided field.
         Data must be provided as a list of hexastring.
 
@@ -198,17 +215,19 @@ class DataAlignment(object):
         :param memory: A memory used to store variable values during
                        specialization and abstraction of sequence of symbols.
         :param messageParser: The underlying message parser class instance to use.
+        :param parsingPlan: The parsing plan of the root of the field, if it is already compiled.
         :type data: :class:`list`
         :type field: :class:`AbstractField <netzob.Model.Vocabulary.AbstractField.AbstractField>`
         :type depth: :class:`int`.
         :type encoded: :class:`boolean`
         :type memory: :class:`Memory <netzob.Model.Vocabulary.Domain.Variables.Memory>`
         :type messageParser: :class:`MessageParser <netzob.Model.Vocabulary.Domain.Parser.MessageParser.MessageParser>`
+        :type parsingPlan: :class:`ParsingPlan <netzob.Model.Vocabulary.Domain.Parser.ParsingPlan.ParsingPlan>`
         :return: the aligned data
         :rtype: :class:`MatrixList <netzob.Common.Utils.MatrixList.MatrixList>`
         """
 
-        dAlignment = DataAlignment(data, field, depth, encoded=encoded, memory=memory, messageParser=messageParser)
+        dAlignment = DataAlignment(data, field, depth, encoded=encoded, memory=memory, messageParser=messageParser, parsingPlan=parsingPlan)
         return dAlignment.execute()
 
     # Properties
@@ -99,39 +99,112 @@ except Exception as e:
     has_colour = False
 
 
+class _BraceMessage(object):
+    """A log message formatted with :meth:`str.format` when it is emitted."""
+
+    __slots__ = ("fmt", "args", "kwargs")
+
+    def __init__(self, fmt, args, kwargs):
+        self.fmt = fmt
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self):
+        return str(self.fmt).format(*self.args, **self.kwargs)
+
+
+class LazyLogger(logging.LoggerAdapter):
+    """The logger facade installed by :func:`NetzobLogger`.
+
+    Messages are only built when their level is enabled: the arguments
+    following the message are substituted in its replacement fields
+    with :meth:`str.format` when the record is emitted.
+
+    >>> import logging, sys
+    >>> from netzob.Common.Utils.Decorators import LazyLogger
+    >>> logger = logging.getLogger("LazyLoggerExample")
+    >>> logger.addHandler(logging.StreamHandler(sys.stdout))
+    >>> logger.propagate = False
+    >>> class Expensive(object):
+    ...     def __str__(self):
+    ...         print("formatted")
+    ...         return "value"
+    >>> lazyLogger = LazyLogger(logger)
+    >>> lazyLogger.setLevel(logging.INFO)
+    >>> lazyLogger.debug("Debug {}", Expensive())
+    >>> lazyLogger.info("Info {0} {{}}", Expensive())
+    formatted
+    Info value {}
+    >>> lazyLogger.info("Unformatted {}")
+    Unformatted {}
+    """
+
+    def __init__(self, logger):
+        super().__init__(logger, None)
+
+    def log(self, level, msg, *args, **kwargs):
+        if not self.isEnabledFor(level):
+            return
+        if len(args) > 0:
+            msg = _BraceMessage(msg, args, {})
+        # Report the caller of the facade in the records
+        kwargs["stacklevel"] = kwargs.get("stacklevel", 1) + 1
+        self.logger.log(level, msg, **kwargs)
+
+    fatal = logging.LoggerAdapter.critical
+
+
 def NetzobLogger(klass):
     """This class decorator adds (if necessary) an instance
     of the logger (self.__logger) to the attached class
     and removes from the getState the logger.
 
+    The logger is a :class:`LazyLogger` facade: arguments given after the
+    message are only formatted if its level is enabled, which should be
+    preferred to :meth:`str.format` in the hot paths.
+
     """
 
     # Verify if a logger already exists
     found = False
     for k, v in list(klass.__dict__.items()):
-        if isinstance(v, logging.Logger):
+        if isinstance(v, (logging.Logger, logging.LoggerAdapter)):
             found = True
             break
     if not found:
-        klass._logger = logging.getLogger(klass.__name__)
+        logger = logging.getLogger(klass.__name__)
         try:
-            klass._logger.setLevel(int(os.environ['NETZOB_LOG_LEVEL']))
+            logger.setLevel(int(os.environ['NETZOB_LOG_LEVEL']))
         except:
             pass
         handler = ColourStreamHandler(
         ) if has_colour else logging.StreamHandler()
         fmt = '%(relativeCreated)d: [%(levelname)s] %(module)s:%(funcName)s: %(message)s'
         handler.setFormatter(logging.Formatter(fmt))
-        klass._logger.addHandler(handler)
-        klass._logger.propagate = False
+        logger.addHandler(handler)
+        logger.propagate = False
+        klass._logger = LazyLogger(logger)
 
     # Exclude logger from __getstate__
     def getState(self, **kwargs):
         r = dict()
-        for k, v in list(self.__dict__.items()):
-            if not isinstance(v, logging.Logger):
+        for k, v in list(getattr(self, '__dict__', {}).items()):
+            if not isinstance(v, (logging.Logger, logging.LoggerAdapter)):
                 r[k] = v
-        return r
+
+        # Slotted attributes are restored by the default unpickler
+        slots = dict()
+        for cls in type(self).__mro__:
+            for k in cls.__dict__.get('__slots__', ()):
+                if k in ('__weakref__', '__dict__'):
+                    continue
+                if k.startswith('__') and not k.endswith('__'):
+                    k = '_' + cls.__name__.lstrip('_') + k
+                if hasattr(self, k):
+                    slots[k] = getattr(self, k)
+        if len(slots) == 0:
+            return r
+        return (r or None, slots)
 
     def setState(self, dict):
         self.__dict__ = dict
@@ -143,6 +216,86 @@ def NetzobLogger(klass):
     return klass
 
 
+# Type checking state of the modules, see setTypeCheck()
+_typeCheckStates = dict()
+_typeCheckRules = []
+
+
+class _TypeCheckState(object):
+    """Whether the type checking of the functions of a module is enabled."""
+
+    __slots__ = ("enabled", )
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+
+
+def _isModuleMatching(moduleName, module):
+    return module is None or moduleName == module or moduleName.startswith(
+        module + ".")
+
+
+def _getTypeCheckState(moduleName):
+    state = _typeCheckStates.get(moduleName)
+    if state is None:
+        enabled = True
+        for (module, ruleEnabled) in _typeCheckRules:
+            if _isModuleMatching(moduleName, module):
+                enabled = ruleEnabled
+        state = _TypeCheckState(enabled)
+        _typeCheckStates[moduleName] = state
+    return state
+
+
+def setTypeCheck(enabled, module=None):
+    """Enables or disables at runtime the type checking of the functions
+    decorated by :func:`typeCheck` in a module and its submodules, or in
+    every module if module is None. The setting also applies to the
+    modules imported afterwards.
+
+    >>> from netzob.Common.Utils.Decorators import typeCheck, setTypeCheck, isTypeCheckEnabled
+    >>> class Example(object):
+    ...     @typeCheck(int)
+    ...     def set(self, value):
+    ...         return value
+    >>> Example().set("1")
+    Traceback (most recent call last):
+    ...
+    TypeError: Invalid type for arguments, expecting: int and received str
+    >>> setTypeCheck(False, __name__)
+    >>> isTypeCheckEnabled(__name__)
+    False
+    >>> Example().set("1")
+    '1'
+    >>> setTypeCheck(True, __name__)
+    >>> Example().set("1")
+    Traceback (most recent call last):
+    ...
+    TypeError: Invalid type for arguments, expecting: int and received str
+
+    :param enabled: True to check the types of the arguments
+    :type enabled: :class:`bool`
+    :param module: the name of a module or a package, for example 'netzob.Model.Vocabulary'
+    :type module: :class:`str`
+    """
+    enabled = bool(enabled)
+    if module is None:
+        # The rules of the modules are overridden
+        del _typeCheckRules[:]
+    _typeCheckRules.append((module, enabled))
+    for (moduleName, state) in _typeCheckStates.items():
+        if _isModuleMatching(moduleName, module):
+            state.enabled = enabled
+
+
+def isTypeCheckEnabled(module):
+    """Returns whether the type checking is enabled in the specified module.
+
+    :rtype: :class:`bool`
+    """
+    return _getTypeCheckState(module).enabled
+
+
 def typeCheck(*types):
     """Decorator which reduces the amount of code to type-check attributes.
 
@@ -163,31 +316,55 @@ def typeCheck(*types):
 
     .. note:: set type = "SELF" to check the type of the self parameter
     .. note:: type checking can be bypassed by setting :val:`NETZOB_NO_TYPECHECK`
-              as environment variable
+              as environment variable, or at runtime with :func:`setTypeCheck`
     .. warning:: if argument is None, the type checking is not executed on it.
 
     """
 
+    # The self parameter is checked against object
+    checkedTypes = (object, ) + types
+    nbArguments = len(checkedTypes)
+    selfPositions = [
+        i for (i, type) in enumerate(checkedTypes) if type == "SELF"
+    ]
+
+    def raiseTypeError(args, finalTypes):
+        for (argument, type) in zip(args, finalTypes):
+            if argument is not None and not isinstance(argument, type):
+                raise TypeError(
+                    "Invalid type for arguments, expecting: {0} and received {1}".
+                    format(', '.join([t.__name__ for t in finalTypes[1:]]),
+                           argument.__class__.__name__))
+
     def _typeCheck_(func):
-        def wrapped_f(*args, **kwargs):
-            arguments = args[1:]
-            if len(arguments) == len(types):
-                # Replace "SELF" with args[0] type
-                final_types = []
-                for type in types:
-                    if type == "SELF":
-                        final_types.append(args[0].__class__)
-                    else:
-                        final_types.append(type)
-
-                for i, argument in enumerate(arguments):
-                    if argument is not None and not isinstance(argument,
-                                                               final_types[i]):
-                        raise TypeError(
-                            "Invalid type for arguments, expecting: {0} and received {1}".
-                            format(', '.join([t.__name__ for t in final_types
-                                              ]), argument.__class__.__name__))
-            return func(*args, **kwargs)
+        state = _getTypeCheckState(func.__module__)
+
+        if len(selfPositions) > 0:
+            def wrapped_f(*args, **kwargs):
+                if len(args) == nbArguments and state.enabled:
+                    # Replace "SELF" with args[0] type
+                    finalTypes = list(checkedTypes)
+                    for i in selfPositions:
+                        finalTypes[i] = args[0].__class__
+                    raiseTypeError(args, finalTypes)
+                return func(*args, **kwargs)
+        elif nbArguments == 2:
+            type = checkedTypes[1]
+
+            def wrapped_f(*args, **kwargs):
+                if len(args) == 2 and state.enabled:
+                    argument = args[1]
+                    if argument is not None and not isinstance(argument, type):
+                        raiseTypeError(args, checkedTypes)
+                return func(*args, **kwargs)
+        else:
+            def wrapped_f(*args, **kwargs):
+                if len(args) == nbArguments and state.enabled:
+                    for (argument, type) in zip(args, checkedTypes):
+                        if argument is not None and not isinstance(argument,
+                                                                   type):
+                            raiseTypeError(args, checkedTypes)
+                return func(*args, **kwargs)
 
         if 'NETZOB_NO_TYPECHECK' in os.environ:
             return func
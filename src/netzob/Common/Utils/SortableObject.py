@@ -46,6 +46,10 @@ import abc
 
 
 class SortableObject(object, metaclass=abc.ABCMeta):
+
+    # Subclasses may define slots
+    __slots__ = ()
+
     @abc.abstractmethod
     def priority(self):
         raise NotImplementedError(
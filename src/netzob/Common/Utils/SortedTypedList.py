@@ -34,7 +34,7 @@
 #+---------------------------------------------------------------------------+
 #| Standard library imports                                                  |
 #+---------------------------------------------------------------------------+
-from bintrees import AVLTree
+from bisect import bisect_right
 
 #+---------------------------------------------------------------------------+
 #| Related third party imports                                               |
@@ -51,10 +51,12 @@ from netzob.Common.Utils.SortableObject import SortableObject
 class SortedTypedList(object):
     """This data structure manages a sorted
     list of objects inheriting from :class:`SortableObject <netzob.Common.Utils.SortableObject.SortableObject>`.
-    It uses an AVLTree proposed by :mod:`bintrees` to represent elements in the list.
-
-    :TODO: The inner object __tree stores the given element using an AVLTree. Thus
-    exposing new methods only requires the creation of a wrapper method in this class.
+    Elements are kept in a list sorted by priority, along with the list
+    of their priorities. Inserted elements are buffered until the list is
+    read: they are then appended if they come after the last element,
+    inserted with a binary search if there are few of them, or merged
+    with a single sort. Elements sharing the same priority are kept in
+    their insertion order.
 
     >>> from netzob.all import *
     >>> from netzob.Common.Utils.SortedTypedList import SortedTypedList
@@ -75,12 +77,24 @@ class SortedTypedList(object):
     >>> len(l)
     6
 
+    Iterating over the list does not copy it, and elements with the same
+    priority keep their insertion order:
+
+    >>> l.addAll([RawMessage(b"msg7", date=2.0), RawMessage(b"msg8", date=2.0)])
+    >>> [m.data for m in l][:3]
+    [b'msg2', b'msg7', b'msg8']
+
     """
 
+    # Number of buffered elements above which they are merged with a sort
+    SORT_THRESHOLD = 64
+
     def __init__(self, membersTypes, elements=None):
         self.membersTypes = membersTypes
-        self.__treePriorities = AVLTree()
-        self.__mapMessages = dict()
+        self.__priorities = []
+        self.__elements = []
+        self.__pendingPriorities = []
+        self.__pendingElements = []
         if elements is not None and len(elements) > 0:
             self._extend(elements)
 
@@ -112,17 +126,15 @@ class SortedTypedList(object):
 
         :rtype: :mod:list
         """
-
-        l = []
-        for x in list(self.__treePriorities.keys()):
-            l.extend(self.__mapMessages[x])
-        return l
+        self.__flush()
+        return list(self.__elements)
 
     def clear(self):
-        """remove all items from the list.
-        It's a O(n) operation"""
-        self.__treePriorities.clear()
-        self.__mapMessages.clear()
+        """remove all items from the list."""
+        self.__priorities = []
+        self.__elements = []
+        self.__pendingPriorities = []
+        self.__pendingElements = []
 
     def _extend(self, elements):
         """Add all the elements in the current list.
@@ -130,17 +142,43 @@ class SortedTypedList(object):
         :parameter elements: a list of :class:`SortableObject <netzob.Common.Utils.SortableObject.SortableObject>` to insert.
         :raises: TypeError if something is wrong with the given elements
         """
+        # Elements are iterated twice (e.g. messages created on demand by a MessageStore)
+        if not isinstance(elements, list):
+            elements = list(elements)
         for e in elements:
             self._check(e)
-
-        d = dict()
-        for e in elements:
-            d[e.priority()] = None
-            if e.priority() in self.__mapMessages:
-                self.__mapMessages[e.priority()].append(e)
-            else:
-                self.__mapMessages[e.priority()] = [e]
-        self.__treePriorities.update(d)
+        self.__pendingPriorities.extend(e.priority() for e in elements)
+        self.__pendingElements.extend(elements)
+
+    def __flush(self):
+        """Internal method that inserts the buffered elements."""
+        if len(self.__pendingElements) == 0:
+            return
+        pendingPriorities = self.__pendingPriorities
+        pendingElements = self.__pendingElements
+        self.__pendingPriorities = []
+        self.__pendingElements = []
+
+        # The sort is stable and detects the already sorted runs
+        order = sorted(range(len(pendingPriorities)),
+                       key=pendingPriorities.__getitem__)
+        pendingPriorities = [pendingPriorities[i] for i in order]
+        pendingElements = [pendingElements[i] for i in order]
+
+        if len(self.__priorities) == 0 or pendingPriorities[0] >= self.__priorities[-1]:
+            self.__priorities.extend(pendingPriorities)
+            self.__elements.extend(pendingElements)
+        elif len(pendingElements) <= self.SORT_THRESHOLD:
+            for (priority, e) in zip(pendingPriorities, pendingElements):
+                index = bisect_right(self.__priorities, priority)
+                self.__priorities.insert(index, priority)
+                self.__elements.insert(index, e)
+        else:
+            priorities = self.__priorities + pendingPriorities
+            elements = self.__elements + pendingElements
+            order = sorted(range(len(priorities)), key=priorities.__getitem__)
+            self.__priorities = [priorities[i] for i in order]
+            self.__elements = [elements[i] for i in order]
 
     def _check(self, v):
         if not isinstance(v, self.membersTypes):
@@ -155,14 +193,16 @@ class SortedTypedList(object):
     def __len__(self):
         """Returns the number of elements in the sorted list which takes
         O(1) operation :)"""
-        return len(self.__treePriorities)
+        return len(self.__elements) + len(self.__pendingElements)
 
     def __str__(self):
-        return ', \n'.join([str(v) for v in list(self.values())])
+        self.__flush()
+        return ', \n'.join([str(v) for v in self.__elements])
 
     def __repr__(self):
         return repr(str(self))
 
     def __iter__(self):
         """SortedTypedList is an iterable over its values (and not its keys)."""
-        return list(self.__treePriorities.values()).__iter__()
+        self.__flush()
+        return iter(self.__elements)
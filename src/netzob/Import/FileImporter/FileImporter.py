@@ -29,6 +29,10 @@
 #| Standard library imports
 #+---------------------------------------------------------------------------+
 import errno
+import itertools
+import mmap
+import struct
+from gettext import gettext as _
 
 #+---------------------------------------------------------------------------+
 #| Related third party imports
@@ -85,19 +89,32 @@ class FileImporter(object):
     './test/resources/files/test_import_raw_message2.dat'
     >>> messages[707].file_message_number
     353
+
+    Files where each message is preceded by its length are read with the
+    parameter `lengthPrefix`, a :mod:`struct` format of the length field:
+
+    >>> import struct, tempfile
+    >>> with tempfile.NamedTemporaryFile(suffix=".dat") as f:
+    ...     _ = f.write(b"".join(struct.pack("!H", len(m)) + m for m in [b"hello", b"\n", b"world"]))
+    ...     f.flush()
+    ...     messages = FileImporter.readFile(f.name, lengthPrefix="!H").values()
+    >>> [m.data for m in messages]
+    [b'hello', b'\n', b'world']
     """
 
     def __init__(self):
         pass
 
-    @typeCheck(list, bytes)
-    def readMessages(self, filePathList, delimitor=b"\n"):
+    @typeCheck(list, bytes, str)
+    def readMessages(self, filePathList, delimitor=b"\n", lengthPrefix=None):
         """Read all the messages found in the specified filePathList and given a delimitor.
 
         :param filePathList: paths of the file to parse
         :type filePathList: a list of :class:`str`
         :param delimitor: the delimitor used to find messages in the same file
         :type delimitor: :class:`str`
+        :param lengthPrefix: if not None, the :mod:`struct` format of the length that precedes each message, which is used instead of the delimitor
+        :type lengthPrefix: :class:`str`
         :return: a sorted list of messages
         :rtype: a :class:`SortedTypedList <netzob.Common.Utils.SortedTypedList.SortedTypedList>` of :class:`AbstractMessage <netzob.Model.Vocabulary.Messages.AbstractMessage>`
         """
@@ -122,47 +139,108 @@ class FileImporter(object):
                 
         self.messages = SortedTypedList(AbstractMessage)
         for filePath in filePathList:
-            self.__readMessagesFromFile(filePath, delimitor)
+            self.messages.addAll(
+                self.__iterMessages(filePath, delimitor, lengthPrefix))
         
         return self.messages
-    
-    @typeCheck(str, bytes)
-    def __readMessagesFromFile(self, filePath, delimitor=b'\n'):
+
+    def __checkFraming(self, filePath, delimitor, lengthPrefix):
+        """Internal method that verifies the parameters of a file import.
+        It returns the :class:`struct.Struct` of the length prefix, if any."""
         if filePath is None or len(str(filePath).strip()) == 0:
             raise TypeError("Filepath cannot be None or empty")
- 
-        if delimitor is None or len(str(delimitor)) == 0:
+
+        if lengthPrefix is not None:
+            try:
+                header = struct.Struct(lengthPrefix)
+                valid = len(header.unpack(bytes(header.size))) == 1
+            except struct.error:
+                valid = False
+            if not valid:
+                raise ValueError(
+                    "The length prefix must be a struct format of a single integer")
+            return header
+
+        if delimitor is None or len(delimitor) == 0:
             raise TypeError("Delimitor cannot be None or empty")
+        return None
 
-        file_content = None
+    def __iterMessages(self, filePath, delimitor=b'\n', lengthPrefix=None):
+        """Internal generator of the messages of a file. The file is
+        memory-mapped and scanned incrementally, so that only the current
+        message is copied in memory."""
+        header = self.__checkFraming(filePath, delimitor, lengthPrefix)
         with open(filePath, 'rb') as fd:
-            file_content = fd.read()
+            try:
+                buffer = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                return
+            with buffer:
+                if header is None:
+                    chunks = self.__splitDelimited(buffer, delimitor)
+                else:
+                    chunks = self.__splitLengthPrefixed(buffer, header, filePath)
+                for (number, start, end) in chunks:
+                    yield FileMessage(buffer[start:end], file_path=filePath,
+                                      file_message_number=number)
 
-        if file_content is None:
-            raise Exception("No content found in '{}'".format(filePath))
+    def __splitDelimited(self, buffer, delimitor):
+        """Internal generator of the number and the bounds of the non-empty
+        messages separated by the delimitor. Messages are numbered as the
+        items of :meth:`bytes.split`."""
+        size = len(buffer)
+        position = 0
+        number = 0
+        while position <= size:
+            end = buffer.find(delimitor, position)
+            if end < 0:
+                end = size
+            if end > position:
+                yield (number, position, end)
+            number += 1
+            position = end + len(delimitor)
 
-        for i_data, data in enumerate(file_content.split(delimitor)):
-            if len(data) > 0:
-                self.messages.add(FileMessage(data, file_path = filePath, file_message_number = i_data))
+    def __splitLengthPrefixed(self, buffer, header, filePath):
+        """Internal generator of the number and the bounds of the non-empty
+        messages that are preceded by their length."""
+        size = len(buffer)
+        position = 0
+        number = 0
+        while position + header.size <= size:
+            (length, ) = header.unpack_from(buffer, position)
+            start = position + header.size
+            position = start + length
+            if length < 0 or position > size:
+                break
+            if length > 0:
+                yield (number, start, position)
+            number += 1
+        if position != size:
+            self._logger.warn("The last message of {0} is truncated".format(
+                filePath))
 
     @staticmethod
-    @typeCheck(list, bytes)
-    def readFiles(filePathList, delimitor=b'\n'):
+    @typeCheck(list, bytes, str)
+    def readFiles(filePathList, delimitor=b'\n', lengthPrefix=None):
         """Read all messages from a list of files. A delimitor must be specified to delimit messages.
 
         :param filePathList: a list of files to read
         :type filePathList: a list of :class:`str`
         :param delimitor: the delimitor.
         :type delimitor: :class:`str`
+        :param lengthPrefix: if not None, the :mod:`struct` format of the length that precedes each message, which is used instead of the delimitor
+        :type lengthPrefix: :class:`str`
         :return: a list of captured messages
         :rtype: a :class:`SortedTypedList <netzob.Common.Utils.SortedTypedList.SortedTypedList>` of :class:`AbstractMessage <netzob.Model.Vocabulary.Messages.AbstractMessage>`
         """
         importer = FileImporter()
-        return importer.readMessages(filePathList, delimitor = delimitor)
+        return importer.readMessages(filePathList, delimitor = delimitor,
+                                     lengthPrefix = lengthPrefix)
     
     @staticmethod
-    @typeCheck(str, bytes)
-    def readFile(filePath, delimitor=b'\n'):
+    @typeCheck(str, bytes, str)
+    def readFile(filePath, delimitor=b'\n', lengthPrefix=None):
         """Read all messages from the specified file. 
         Messages are found based on the specified delimitor. 
 
@@ -170,8 +248,55 @@ class FileImporter(object):
         :type filePath: :class:`str`
         :param delimitor: the delimitor used to find messages in the specified file
         :type delimitor: :class:`str`
+        :param lengthPrefix: if not None, the :mod:`struct` format of the length that precedes each message, which is used instead of the delimitor
+        :type lengthPrefix: :class:`str`
         :return: a list of captured messages
         :rtype: a :class:`SortedTypedList <netzob.Common.Utils.SortedTypedList.SortedTypedList>` of :class:`AbstractMessage <netzob.Model.Vocabulary.Messages.AbstractMessage>`
         """
         importer = FileImporter()        
-        return importer.readFiles([filePath], delimitor = delimitor)
+        return importer.readFiles([filePath], delimitor = delimitor,
+                                  lengthPrefix = lengthPrefix)
+
+    @staticmethod
+    def iterFile(filePath, delimitor=b'\n', lengthPrefix=None, maxMessages=0):
+        r"""Iterate over the messages of the specified file as they are
+        found. Contrary to :meth:`readFile`, the file is never loaded in
+        memory and messages are not kept, so that files of any size are
+        read with a constant memory footprint.
+
+        >>> from netzob.all import *
+        >>> for message in FileImporter.iterFile("./test/resources/files/test_import_text_message.txt", maxMessages=2):
+        ...     print(message.file_message_number, repr(message.data))
+        0 b'The life that I have'
+        1 b'Is all that I have'
+
+        :param filePath: the path of the file
+        :type filePath: :class:`str`
+        :param delimitor: the delimitor used to find messages in the specified file
+        :type delimitor: :class:`bytes`
+        :param lengthPrefix: if not None, the :mod:`struct` format of the length that precedes each message, which is used instead of the delimitor
+        :type lengthPrefix: :class:`str`
+        :param maxMessages: the maximum number of messages to produce (0 for no limit)
+        :type maxMessages: :class:`int`
+        :return: a generator of messages
+        :rtype: a generator of :class:`FileMessage <netzob.Model.Vocabulary.Messages.FileMessage.FileMessage>`
+        """
+        if maxMessages < 0:
+            raise ValueError(
+                "A positive (or null) value is required for the maximum number of messages."
+            )
+
+        # Errors are raised before the iteration starts
+        importer = FileImporter()
+        importer.__checkFraming(filePath, delimitor, lengthPrefix)
+        try:
+            open(filePath, 'rb').close()
+        except IOError as e:
+            raise NetzobImportException(
+                "File", _("Error while trying to open the file {0}: {1}").
+                format(filePath, e))
+
+        messages = importer.__iterMessages(filePath, delimitor, lengthPrefix)
+        if maxMessages > 0:
+            messages = itertools.islice(messages, maxMessages)
+        return messages
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011-2017 Georges Bossert and Frédéric Guihéry              |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import ast
+import glob
+import hashlib
+import os
+import tempfile
+import zipfile
+
+#+---------------------------------------------------------------------------+
+#| Related third party imports
+#+---------------------------------------------------------------------------+
+import numpy
+
+#+---------------------------------------------------------------------------+
+#| Local application imports
+#+---------------------------------------------------------------------------+
+from netzob.Common.Utils.Decorators import NetzobLogger
+from netzob.Model.Vocabulary.Messages.MessageStore import MessageStore
+
+
+@NetzobLogger
+class CaptureCache(object):
+    r"""A sidecar cache of the packets decoded from a capture file.
+
+    For each import layer, BPF filter and number of packets, the decoded
+    packets are saved as the columns of a :class:`MessageStore
+    <netzob.Model.Vocabulary.Messages.MessageStore.MessageStore>` (the
+    payloads, the dates, and the dictionary-encoded protocols, addresses
+    and ports) in an uncompressed NumPy archive next to the capture. The
+    archive records the size, the modification time and the SHA-256 of
+    the capture: it is ignored once the content of the capture changes.
+
+    >>> import os, shutil, tempfile
+    >>> from netzob.all import *
+    >>> directory = tempfile.mkdtemp()
+    >>> filePath = os.path.join(directory, "capture.pcap")
+    >>> _ = shutil.copy("./test/resources/pcaps/test_import_udp.pcap", filePath)
+    >>> cache = CaptureCache(filePath)
+    >>> print(cache.load(importLayer=5, bpfFilter="udp"))
+    None
+    >>> cache.save(PCAPImporter.readFile(filePath, "udp", asMessageStore=True), importLayer=5, bpfFilter="udp")
+    >>> store = cache.load(importLayer=5, bpfFilter="udp")
+    >>> len(store)
+    14
+    >>> store[0].source
+    '127.0.0.1:57831'
+
+    The cache is invalidated when the capture changes:
+
+    >>> with open(filePath, "ab") as f:
+    ...     _ = f.write(b"\x00")
+    >>> print(cache.load(importLayer=5, bpfFilter="udp"))
+    None
+    >>> cache.clear()
+    >>> shutil.rmtree(directory)
+
+    :parameter filePath: the path of the capture file
+    :type filePath: :class:`str`
+    :parameter cacheDirectory: the directory of the cache files, the directory of the capture if None
+    :type cacheDirectory: :class:`str`
+    """
+
+    VERSION = 1
+    EXTENSION = ".netzob-cache"
+
+    def __init__(self, filePath, cacheDirectory=None):
+        self.filePath = filePath
+        if cacheDirectory is None:
+            cacheDirectory = os.path.dirname(os.path.abspath(filePath))
+        self.cacheDirectory = cacheDirectory
+
+    def getCachePath(self, importLayer, bpfFilter="", nbPackets=0):
+        """Return the path of the cache file of the specified import.
+
+        :rtype: :class:`str`
+        """
+        key = repr((importLayer, bpfFilter, nbPackets)).encode("utf-8")
+        return os.path.join(
+            self.cacheDirectory, "{0}.{1}{2}".format(
+                os.path.basename(self.filePath),
+                hashlib.sha1(key).hexdigest()[:16], self.EXTENSION))
+
+    def load(self, importLayer, bpfFilter="", nbPackets=0):
+        """Return the packets decoded by a previous import of the capture,
+        or None if they are not cached or if the capture has changed.
+
+        :rtype: :class:`MessageStore <netzob.Model.Vocabulary.Messages.MessageStore.MessageStore>`
+        """
+        cachePath = self.getCachePath(importLayer, bpfFilter, nbPackets)
+        if not os.path.exists(cachePath):
+            return None
+        try:
+            with numpy.load(cachePath, allow_pickle=False) as archive:
+                (version, fileSize, modificationTime) = archive["header"].tolist()
+                if version != self.VERSION:
+                    return None
+                stat = os.stat(self.filePath)
+                if stat.st_size != fileSize:
+                    return None
+                refresh = False
+                if stat.st_mtime_ns != modificationTime:
+                    # The capture was touched, check its content
+                    if self.__digest() != archive["digest"].tobytes():
+                        return None
+                    refresh = True
+
+                values = [ast.literal_eval(value)
+                          for value in archive["values"].tolist()]
+                store = MessageStore()
+                store.__setstate__(
+                    (archive["payloads"].tobytes(), archive["offsets"],
+                     archive["dates"], archive["kinds"], archive["codes"],
+                     archive["ports"], values))
+        except (OSError, KeyError, ValueError, SyntaxError,
+                zipfile.BadZipFile) as e:
+            self._logger.warning("Ignoring the invalid cache file {0}: {1}".
+                                 format(cachePath, e))
+            return None
+
+        if refresh:
+            self.save(store, importLayer, bpfFilter, nbPackets)
+        return store
+
+    def save(self, store, importLayer, bpfFilter="", nbPackets=0):
+        """Save the packets decoded from the capture. Errors are logged but
+        not raised, an import not being prevented by its cache.
+
+        :parameter store: the decoded packets
+        :type store: :class:`MessageStore <netzob.Model.Vocabulary.Messages.MessageStore.MessageStore>`
+        """
+        (_, _, columns) = store.__reduce__()
+        (payloads, offsets, dates, kinds, codes, ports, values) = columns
+        values = [repr(value) for value in values]
+        try:
+            if [ast.literal_eval(value) for value in values] != list(columns[6]):
+                self._logger.debug("The packets of {0} cannot be cached".format(
+                    self.filePath))
+                return
+        except (ValueError, SyntaxError):
+            self._logger.debug("The packets of {0} cannot be cached".format(
+                self.filePath))
+            return
+
+        cachePath = self.getCachePath(importLayer, bpfFilter, nbPackets)
+        temporaryPath = None
+        try:
+            stat = os.stat(self.filePath)
+            digest = self.__digest()
+            (fd, temporaryPath) = tempfile.mkstemp(dir=self.cacheDirectory,
+                                                   suffix=self.EXTENSION)
+            with os.fdopen(fd, "wb") as f:
+                numpy.savez(
+                    f,
+                    header=numpy.array([self.VERSION, stat.st_size,
+                                        stat.st_mtime_ns], dtype=numpy.int64),
+                    digest=numpy.frombuffer(digest, dtype=numpy.uint8),
+                    payloads=numpy.frombuffer(payloads, dtype=numpy.uint8),
+                    offsets=offsets, dates=dates, kinds=kinds, codes=codes,
+                    ports=ports, values=numpy.array(values, dtype=numpy.str_))
+            os.replace(temporaryPath, cachePath)
+        except OSError as e:
+            self._logger.warning("Cannot write the cache file {0}: {1}".
+                                 format(cachePath, e))
+            if temporaryPath is not None and os.path.exists(temporaryPath):
+                os.remove(temporaryPath)
+
+    def clear(self):
+        """Remove the cache files of the capture."""
+        pattern = os.path.join(
+            glob.escape(self.cacheDirectory),
+            glob.escape(os.path.basename(self.filePath)) + ".*" + self.EXTENSION)
+        for cachePath in glob.glob(pattern):
+            os.remove(cachePath)
+
+    def __digest(self):
+        """Internal method that computes the SHA-256 of the capture."""
+        digest = hashlib.sha256()
+        with open(self.filePath, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.digest()
@@ -0,0 +1,570 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011-2017 Georges Bossert and Frédéric Guihéry              |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import array
+import mmap
+import struct
+from gettext import gettext as _
+
+#+---------------------------------------------------------------------------+
+#| Related third party imports
+#+---------------------------------------------------------------------------+
+import numpy
+
+#+---------------------------------------------------------------------------+
+#| Local application imports
+#+---------------------------------------------------------------------------+
+from netzob.Common.Utils.Decorators import NetzobLogger
+from netzob.Common.NetzobException import NetzobImportException
+
+
+@NetzobLogger
+class CaptureFile(object):
+    r"""A capture file (PCAP or PCAPNG) read without libpcap.
+
+    The file is memory-mapped and its packets are read sequentially by
+    :meth:`iterPackets`, without keeping anything about them. The first
+    random access (its length, a packet by index, a selection, ...)
+    indexes the packets in a single scan: the offset, the captured
+    length, the date and the interface of each packet are kept in NumPy
+    arrays. Packets can then be accessed in any order without reading
+    the file again.
+
+    >>> from netzob.all import *
+    >>> capture = CaptureFile("./test/resources/pcaps/test_import_udp.pcap")
+    >>> [len(data) for (date, linkType, data) in capture.iterPackets()][:3]
+    [65, 62, 54]
+    >>> len(capture)
+    14
+    >>> capture.format
+    'pcap'
+    >>> capture.linkTypes
+    [1]
+    >>> capture[13][-15:]
+    b'RESbye#\x00\x00\x00\x00\x00\x00\x00\x00'
+    >>> print(capture.dates[0])
+    1388154953.318295
+
+    PCAPNG files are supported, including the timestamp resolution of
+    each interface:
+
+    >>> capture = CaptureFile("./test/resources/pcaps/atm_capture1.pcap")
+    >>> (capture.format, len(capture), capture.linkTypes)
+    ('pcapng', 12, [106])
+    >>> (date, linkType, data) = capture.getPacket(1)
+    >>> (date, linkType, len(data))
+    (970527281.555236, 106, 84)
+
+    A subset of the packets is selected without scanning the file again:
+
+    >>> subset = capture.select([3, 1])
+    >>> subset.getData(1) == capture.getData(1)
+    True
+
+    The packets can be split in shards of about the same size in bytes,
+    to be read by several processes:
+
+    >>> sum(len(list(capture.iterShard(shard, 3))) for shard in range(3))
+    12
+    >>> capture.close()
+
+    :parameter filePath: the path of the capture file
+    :type filePath: :class:`str`
+    :raise: :class:`NetzobImportException` if the file is neither a PCAP nor a PCAPNG file
+    """
+
+    # Magic numbers of the PCAP files, and the number of timestamp units
+    # per second they use
+    PCAP_MAGIC_NUMBERS = {0xa1b2c3d4: 10**6, 0xa1b23c4d: 10**9}
+    PCAP_HEADER_SIZE = 24
+    PCAPNG_BYTE_ORDER_MAGIC = 0x1A2B3C4D
+
+    # Types of the PCAPNG blocks
+    BLOCK_SECTION_HEADER = 0x0A0D0D0A
+    BLOCK_INTERFACE_DESCRIPTION = 1
+    BLOCK_PACKET = 2  # obsolete
+    BLOCK_SIMPLE_PACKET = 3
+    BLOCK_ENHANCED_PACKET = 6
+
+    # Options of the interface description blocks
+    OPTION_END = 0
+    OPTION_TIMESTAMP_RESOLUTION = 9
+    OPTION_TIMESTAMP_OFFSET = 14
+
+    # Snapshot length assumed when it is not specified
+    MAXIMUM_SNAPSHOT_LENGTH = 262144
+
+    # Number of packets converted at once when iterating over the index
+    CHUNK_SIZE = 4096
+
+    # Number of bytes read sequentially before the pages already read are
+    # released
+    RELEASE_SIZE = 16 * 2**20
+
+    def __init__(self, filePath):
+        self.filePath = filePath
+        self.__file = None
+        self.__buffer = None
+        self.__open()
+        self.__index = None
+        # Link type, snapshot length, timestamp units per second and
+        # timestamp offset (in seconds) of each interface, completed while
+        # the packets are read
+        self.linkTypes = []
+        self.snapLengths = []
+        self.__timestampUnits = []
+        self.__timestampOffsets = []
+        self.__readHeader()
+
+    def __open(self):
+        try:
+            self.__file = open(self.filePath, 'rb')
+        except IOError as e:
+            raise NetzobImportException(
+                "PCAP", _("Error while trying to open the file {0}: {1}").
+                format(self.filePath, e))
+        try:
+            self.__buffer = mmap.mmap(self.__file.fileno(), 0,
+                                      access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self.__buffer = b""
+
+    def __readHeader(self):
+        """Internal method that identifies the format of the file, and reads
+        the interfaces declared before its first packet."""
+        buffer = self.__buffer
+        if len(buffer) >= 4:
+            for endianness in ("<", ">"):
+                (magicNumber, ) = struct.unpack_from(endianness + "I", buffer)
+                if magicNumber in self.PCAP_MAGIC_NUMBERS:
+                    self.format = "pcap"
+                    self.__readPcapHeader(endianness, magicNumber)
+                    return
+                if magicNumber == self.BLOCK_SECTION_HEADER:
+                    self.format = "pcapng"
+                    next(self.__walkPcapng(), None)
+                    return
+        raise NetzobImportException(
+            "PCAP", _("The file {0} is neither a PCAP nor a PCAPNG file").
+            format(self.filePath))
+
+    def __readPcapHeader(self, endianness, magicNumber):
+        if len(self.__buffer) < self.PCAP_HEADER_SIZE:
+            raise NetzobImportException(
+                "PCAP", _("The PCAP file {0} is truncated").format(self.filePath))
+        (snapLength, linkType) = struct.unpack_from(endianness + "II",
+                                                    self.__buffer, 16)
+        self.__packetHeader = struct.Struct(endianness + "IIII")
+        self.linkTypes.append(linkType)
+        self.snapLengths.append(snapLength or self.MAXIMUM_SNAPSHOT_LENGTH)
+        self.__timestampUnits.append(self.PCAP_MAGIC_NUMBERS[magicNumber])
+        self.__timestampOffsets.append(0)
+
+    def __setIndex(self, offsets, lengths, dates, interfaces):
+        self.__index = (offsets, lengths, dates, interfaces)
+        dates.flags.writeable = False
+
+    def __getIndex(self):
+        """Internal method that returns the offsets, the lengths, the dates
+        and the interfaces of the packets, indexing them if necessary."""
+        if self.__index is None:
+            self.__setIndex(*self.__scan())
+        return self.__index
+
+    def close(self):
+        """Unmap and close the capture file. Data previously returned
+        remains valid."""
+        if isinstance(self.__buffer, mmap.mmap):
+            self.__buffer.close()
+        if self.__file is not None:
+            self.__file.close()
+        self.__buffer = None
+        self.__file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self.__getIndex()[0])
+
+    def __getitem__(self, index):
+        return self.getData(index)
+
+    def __iter__(self):
+        for (_, _, data) in self.iterPackets():
+            yield data
+
+    def __reduce__(self):
+        # The file is mapped again, but not scanned, when unpickled
+        return (CaptureFile._fromIndex,
+                (self.filePath, self.format, self.linkTypes, self.snapLengths)
+                + self.__getIndex())
+
+    @staticmethod
+    def _fromIndex(filePath, format, linkTypes, snapLengths, offsets, lengths,
+                   dates, interfaces):
+        """Internal method that maps a capture file whose packets are
+        already indexed."""
+        capture = CaptureFile.__new__(CaptureFile)
+        capture.filePath = filePath
+        capture.__file = None
+        capture.__buffer = None
+        capture.__open()
+        capture.format = format
+        capture.linkTypes = linkTypes
+        capture.snapLengths = snapLengths
+        capture.__setIndex(offsets, lengths, dates.copy(), interfaces)
+        return capture
+
+    @property
+    def dates(self):
+        """The capture date of each packet, in seconds since the epoch
+        (read-only NumPy array).
+
+        :type: :class:`numpy.ndarray`
+        """
+        return self.__getIndex()[2]
+
+    @property
+    def capturedLengths(self):
+        """The number of captured bytes of each packet.
+
+        :type: :class:`numpy.ndarray`
+        """
+        return self.__getIndex()[1]
+
+    @property
+    def datalink(self):
+        """The link type of the first interface of the capture, None if the
+        capture has no interface.
+
+        :type: :class:`int`
+        """
+        if len(self.linkTypes) == 0:
+            return None
+        return self.linkTypes[0]
+
+    def getData(self, index):
+        """Return the captured bytes of the specified packet.
+
+        :parameter index: the index of the packet
+        :type index: :class:`int`
+        :rtype: :class:`bytes`
+        """
+        (offsets, lengths, _, _) = self.__getIndex()
+        offset = int(offsets[index])
+        return self.__buffer[offset:offset + int(lengths[index])]
+
+    def getPacket(self, index):
+        """Return the date, the link type and the captured bytes of the
+        specified packet.
+
+        :parameter index: the index of the packet
+        :type index: :class:`int`
+        :rtype: a tuple (:class:`float`, :class:`int`, :class:`bytes`)
+        """
+        (_, _, dates, interfaces) = self.__getIndex()
+        return (float(dates[index]), self.linkTypes[interfaces[index]],
+                self.getData(index))
+
+    def iterPackets(self, start=0, end=None):
+        """Iterate over the date, the link type and the captured bytes of the
+        packets, from index `start` (included) to index `end` (excluded).
+        Unless the packets are already indexed, iterating over all of them
+        reads the file sequentially, with a constant memory footprint. The
+        link types of the interfaces are known once they are read.
+
+        :rtype: a generator of tuples (:class:`float`, :class:`int`, :class:`bytes`)
+        """
+        if self.__index is None and start == 0 and end is None:
+            return self.__iterWalk(self.__walk())
+        return self.__iterIndex(numpy.arange(start, len(self) if end is None else end))
+
+    def iterShard(self, shard, nbShards):
+        """Iterate over the packets of the shard-th of nbShards consecutive
+        ranges of bytes of the file, of about the same size. Each packet
+        belongs to exactly one shard: the one containing its first byte.
+        Unless the packets are already indexed, the file is read
+        sequentially up to the end of the shard, but only the packets of
+        the shard are produced.
+
+        :parameter shard: the index of the shard, from 0 to nbShards - 1
+        :type shard: :class:`int`
+        :parameter nbShards: the number of shards
+        :type nbShards: :class:`int`
+        :rtype: a generator of tuples (:class:`float`, :class:`int`, :class:`bytes`)
+        """
+        if not 0 <= shard < nbShards:
+            raise ValueError("The shard should be in [0, {0}[".format(nbShards))
+        if self.format == "pcap":
+            first = self.PCAP_HEADER_SIZE
+        else:
+            first = 0
+        size = max(len(self.__buffer) - first, 0)
+        startPosition = first + size * shard // nbShards
+        endPosition = first + size * (shard + 1) // nbShards
+        if self.__index is None:
+            return self.__iterWalk(self.__walk(startPosition, endPosition))
+        offsets = self.__index[0]
+        return self.__iterIndex(numpy.flatnonzero(
+            (offsets >= startPosition) & (offsets < endPosition)))
+
+    def __iterWalk(self, records):
+        """Internal generator of the packets of a sequential read."""
+        buffer = self.__buffer
+        linkTypes = self.linkTypes
+        timestampUnits = self.__timestampUnits
+        timestampOffsets = self.__timestampOffsets
+        for (offset, length, interface, seconds, fraction) in records:
+            # Same conversion as __toDates()
+            date = float(seconds) + float(
+                fraction * 1000000 // timestampUnits[interface]) / 1000000.0
+            if timestampOffsets[interface] != 0:
+                date += timestampOffsets[interface]
+            yield (date, linkTypes[interface], buffer[offset:offset + length])
+
+    def __release(self, start, end):
+        """Internal method that releases the mapped pages from start to end,
+        so that reading a large file sequentially does not keep it in
+        memory (they are read again if needed). It returns the end of the
+        released pages."""
+        end -= end % mmap.PAGESIZE
+        if isinstance(self.__buffer, mmap.mmap) and hasattr(mmap, "MADV_DONTNEED"):
+            self.__buffer.madvise(mmap.MADV_DONTNEED, start, end - start)
+        return end
+
+    def __iterIndex(self, indexes):
+        """Internal generator of the specified indexed packets, converted
+        by chunks."""
+        buffer = self.__buffer
+        linkTypes = self.linkTypes
+        (allOffsets, allLengths, allDates, allInterfaces) = self.__getIndex()
+        for chunk in range(0, len(indexes), self.CHUNK_SIZE):
+            chunkIndexes = indexes[chunk:chunk + self.CHUNK_SIZE]
+            for (offset, length, date, interface) in zip(
+                    allOffsets[chunkIndexes].tolist(),
+                    allLengths[chunkIndexes].tolist(),
+                    allDates[chunkIndexes].tolist(),
+                    allInterfaces[chunkIndexes].tolist()):
+                yield (date, linkTypes[interface], buffer[offset:offset + length])
+
+    def select(self, indexes):
+        """Return a capture file made of the specified packets, in the
+        specified order. The file is not scanned again.
+
+        :parameter indexes: the indexes of the packets to keep, or a :class:`slice`
+        :type indexes: a sequence of :class:`int`
+        :rtype: :class:`CaptureFile`
+        """
+        if not isinstance(indexes, slice):
+            indexes = numpy.asarray(indexes, dtype=numpy.int64)
+        (offsets, lengths, dates, interfaces) = self.__getIndex()
+        return CaptureFile._fromIndex(
+            self.filePath, self.format, self.linkTypes, self.snapLengths,
+            offsets[indexes], lengths[indexes], dates[indexes],
+            interfaces[indexes])
+
+    def __walk(self, startPosition=0, endPosition=None):
+        """Internal method that returns a generator of the offset, the
+        captured length, the interface and the timestamp (seconds and
+        fraction of a second) of the packets whose data starts between
+        startPosition (included) and endPosition (excluded)."""
+        if self.format == "pcap":
+            return self.__walkPcap(startPosition, endPosition)
+        return self.__walkPcapng(startPosition, endPosition)
+
+    def __walkPcap(self, startPosition=0, endPosition=None):
+        """Internal generator of the packets of a PCAP file."""
+        buffer = self.__buffer
+        fileSize = len(buffer)
+        if endPosition is None:
+            endPosition = fileSize
+        unpackHeader = self.__packetHeader.unpack_from
+        headerSize = self.__packetHeader.size
+        position = self.PCAP_HEADER_SIZE
+        released = 0
+        while position + headerSize <= fileSize:
+            if position - released >= self.RELEASE_SIZE:
+                released = self.__release(released, position)
+            (secs, fraction, capturedLength,
+             originalLength) = unpackHeader(buffer, position)
+            position += headerSize
+            if position >= endPosition:
+                return
+            if position + capturedLength > fileSize:
+                self._logger.warn("The last packet of {0} is truncated".format(
+                    self.filePath))
+                return
+            if position >= startPosition:
+                yield (position, capturedLength, 0, secs, fraction)
+            position += capturedLength
+
+    def __walkPcapng(self, startPosition=0, endPosition=None):
+        """Internal generator of the packets of a PCAPNG file. The
+        interfaces of all its sections are numbered consecutively, and
+        recorded the first time they are read."""
+        buffer = self.__buffer
+        fileSize = len(buffer)
+        if endPosition is None:
+            endPosition = fileSize
+        endianness = "<"
+        nbInterfaces = 0
+        sectionInterface = 0
+        position = 0
+        released = 0
+        while position + 12 <= fileSize:
+            if position - released >= self.RELEASE_SIZE:
+                released = self.__release(released, position)
+            (blockType, ) = struct.unpack_from(endianness + "I", buffer, position)
+            if blockType == self.BLOCK_SECTION_HEADER:
+                for endianness in ("<", ">"):
+                    (byteOrder, ) = struct.unpack_from(endianness + "I", buffer,
+                                                       position + 8)
+                    if byteOrder == self.PCAPNG_BYTE_ORDER_MAGIC:
+                        break
+                else:
+                    raise NetzobImportException(
+                        "PCAP", _("Invalid section header in the PCAPNG file {0}").
+                        format(self.filePath))
+                sectionInterface = nbInterfaces
+            (blockLength, ) = struct.unpack_from(endianness + "I", buffer,
+                                                 position + 4)
+            if blockLength < 12 or position + blockLength > fileSize:
+                self._logger.warn("The last block of {0} is truncated".format(
+                    self.filePath))
+                return
+            body = position + 8
+
+            packet = None
+            if blockType == self.BLOCK_INTERFACE_DESCRIPTION:
+                if nbInterfaces == len(self.linkTypes):
+                    (linkType, snapLength) = struct.unpack_from(
+                        endianness + "H2xI", buffer, body)
+                    (units, offset) = self.__readInterfaceOptions(
+                        endianness, body + 8, position + blockLength - 4)
+                    self.linkTypes.append(linkType)
+                    self.snapLengths.append(snapLength or self.MAXIMUM_SNAPSHOT_LENGTH)
+                    self.__timestampUnits.append(units)
+                    self.__timestampOffsets.append(offset)
+                nbInterfaces += 1
+            elif blockType == self.BLOCK_ENHANCED_PACKET:
+                (interface, high, low, capturedLength) = struct.unpack_from(
+                    endianness + "IIII", buffer, body)
+                packet = (body + 20, capturedLength, sectionInterface + interface,
+                          (high << 32) | low)
+            elif blockType == self.BLOCK_PACKET:
+                (interface, high, low, capturedLength) = struct.unpack_from(
+                    endianness + "H2xIII", buffer, body)
+                packet = (body + 20, capturedLength, sectionInterface + interface,
+                          (high << 32) | low)
+            elif blockType == self.BLOCK_SIMPLE_PACKET:
+                # Simple packets have no timestamp and come from the
+                # first interface of the section
+                (originalLength, ) = struct.unpack_from(endianness + "I",
+                                                        buffer, body)
+                packet = (body + 4, min(originalLength, blockLength - 16),
+                          sectionInterface, 0)
+            position += blockLength
+
+            if packet is None:
+                continue
+            (offset, capturedLength, interface, timestamp) = packet
+            if offset >= endPosition:
+                return
+            if interface >= nbInterfaces:
+                raise NetzobImportException(
+                    "PCAP", _("A packet of the PCAPNG file {0} refers to an unknown interface").
+                    format(self.filePath))
+            if offset >= startPosition:
+                units = self.__timestampUnits[interface]
+                yield (offset, capturedLength, interface, timestamp // units,
+                       timestamp % units)
+
+    def __scan(self):
+        """Internal method that indexes the packets of the file."""
+        offsets = array.array("q")
+        lengths = array.array("q")
+        interfaces = array.array("H")
+        seconds = array.array("Q")
+        fractions = array.array("Q")
+        for (offset, length, interface, secs, fraction) in self.__walk():
+            offsets.append(offset)
+            lengths.append(length)
+            interfaces.append(interface)
+            seconds.append(secs)
+            fractions.append(fraction)
+
+        interfaces = numpy.frombuffer(interfaces, dtype=numpy.uint16)
+        seconds = numpy.frombuffer(seconds, dtype=numpy.uint64)
+        fractions = numpy.frombuffer(fractions, dtype=numpy.uint64)
+        dates = numpy.zeros(len(interfaces), dtype=numpy.float64)
+        for interface in range(len(self.linkTypes)):
+            mask = interfaces == interface
+            dates[mask] = self.__toDates(seconds[mask], fractions[mask],
+                                         self.__timestampUnits[interface])
+            if self.__timestampOffsets[interface] != 0:
+                dates[mask] += self.__timestampOffsets[interface]
+        return (numpy.frombuffer(offsets, dtype=numpy.int64),
+                numpy.frombuffer(lengths, dtype=numpy.int64), dates, interfaces)
+
+    def __readInterfaceOptions(self, endianness, position, end):
+        """Internal method that reads the timestamp resolution and offset of
+        an interface description block."""
+        units = 10**6
+        offset = 0
+        buffer = self.__buffer
+        while position + 4 <= end:
+            (code, length) = struct.unpack_from(endianness + "HH", buffer,
+                                                position)
+            position += 4
+            if code == self.OPTION_END:
+                break
+            if code == self.OPTION_TIMESTAMP_RESOLUTION and length >= 1:
+                resolution = buffer[position]
+                if resolution & 0x80:
+                    units = 2**(resolution & 0x7F)
+                else:
+                    units = 10**resolution
+            elif code == self.OPTION_TIMESTAMP_OFFSET and length >= 8:
+                (offset, ) = struct.unpack_from(endianness + "q", buffer,
+                                                position)
+            position += (length + 3) & ~3
+        return (units, offset)
+
+    def __toDates(self, seconds, fractions, units):
+        """Internal method that converts timestamps to dates with a
+        microsecond precision, as libpcap does."""
+        microseconds = fractions * numpy.uint64(10**6) // numpy.uint64(units)
+        return seconds.astype(numpy.float64) + (
+            microseconds.astype(numpy.float64) / 1000000.0)
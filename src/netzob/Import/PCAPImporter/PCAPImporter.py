@@ -29,12 +29,19 @@
 #| Standard library imports
 #+---------------------------------------------------------------------------+
 import errno
+import multiprocessing
+import socket
+import struct
 from gettext import gettext as _
 
 #+---------------------------------------------------------------------------+
 #| Related third party imports
 #+---------------------------------------------------------------------------+
-import pcapy
+try:
+    import pcapy
+except ImportError:
+    # pcapy (libpcap) is only required to apply BPF filters
+    pcapy = None
 
 from impacket import ImpactPacket as Packets
 from impacket import ImpactDecoder as Decoders
@@ -52,6 +59,21 @@ from netzob.Model.Vocabulary.Messages.RawMessage import RawMessage
 from netzob.Model.Vocabulary.Messages.L2NetworkMessage import L2NetworkMessage
 from netzob.Model.Vocabulary.Messages.L3NetworkMessage import L3NetworkMessage
 from netzob.Model.Vocabulary.Messages.L4NetworkMessage import L4NetworkMessage
+from netzob.Model.Vocabulary.Messages.MessageStore import MessageStore
+from netzob.Import.PCAPImporter.CaptureFile import CaptureFile
+from netzob.Import.PCAPImporter.CaptureCache import CaptureCache
+from netzob.Import.PCAPImporter.TCPReassembler import TCPReassembler
+
+
+def _readMessagesTask(task):
+    """Wrapper used to import PCAP files, or shards of them, using a
+    pool of processes.
+    """
+    (filePath, shard, nbShards, bpfFilter, importLayer, nbPackets,
+     fastDecoding) = task
+    importer = PCAPImporter(fastDecoding=fastDecoding)
+    return importer._readMessagesTask(filePath, shard, nbShards, bpfFilter,
+                                      importLayer, nbPackets)
 
 
 @NetzobLogger
@@ -127,7 +149,7 @@ class PCAPImporter(object):
     >>> print(repr(messages[0].data))
     b'GET / HTTP/1.1\r\nHost: www.free.fr\r\nUser-Agent: aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa(bbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbb)ccccccccccccccccccccccccccccccccccccccccccccccccccccccccccccccccccccccccccccccccccc\r\nAccept: text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8\r\nAccept-Language: en-US,en;q=0.5\r\nAccept-Encoding: gzip, deflate\r\nConnection: keep-alive\r\n\r\n'
 
-    Parameter `mergePacketsInFlow` can be use to merge consecutive messages that share the same source and destination (mimic a TCP flow). In practice, this parameter was introduced for L5 network messages to support TCP flows but it can be use for any level of network messages.
+    Parameter `mergePacketsInFlow` can be use to reassemble TCP flows: when importing layer 4 or 5, the payloads of the TCP segments of each connection are reordered with their sequence numbers (see :class:`TCPReassembler <netzob.Import.PCAPImporter.TCPReassembler.TCPReassembler>`) and one message is produced for each turn of the connection. For any level of network messages, other consecutive messages that share the same source and destination are merged.
 
     >>> from netzob.all import *
     >>> messages = PCAPImporter.readFile("./test/resources/pcaps/test_import_http_flow.pcap", mergePacketsInFlow=False).values()
@@ -140,6 +162,29 @@ class PCAPImporter(object):
     2
     >>> len(messages[1].data)
     3224
+
+    Parameter `asMessageStore` keeps the packets of large captures in a
+    columnar :class:`MessageStore <netzob.Model.Vocabulary.Messages.MessageStore.MessageStore>`,
+    messages being only created when they are accessed.
+
+    >>> store = PCAPImporter.readFile("./test/resources/pcaps/test_import_udp.pcap", asMessageStore=True)
+    >>> len(store)
+    14
+    >>> store.getData(1)
+    b'RESidentify#\x00\x00\x00\x00\x00\x00\x00\x00'
+    >>> [m.data for m in messages] == [m.data for m in PCAPImporter.readFile("./test/resources/pcaps/test_import_http_flow.pcap", mergePacketsInFlow=True, asMessageStore=True)]
+    True
+
+    Parameter `nbProcesses` decodes the files, or shards of a single PCAP
+    file, in a pool of processes. Messages are the same, in the same order,
+    as with a serial import.
+
+    >>> files = ["./test/resources/pcaps/test_import_udp.pcap", "./test/resources/pcaps/test_import_http.pcap"]
+    >>> messages = PCAPImporter.readFiles(files).values()
+    >>> [m.data for m in messages] == [m.data for m in PCAPImporter.readFiles(files, nbProcesses=2).values()]
+    True
+    >>> [m.data for m in messages[:14]] == [m.data for m in PCAPImporter.readFile(files[0], nbProcesses=3).values()]
+    True
     """
 
     INVALID_BPF_FILTER = 0
@@ -149,39 +194,78 @@ class PCAPImporter(object):
 
     PROTOCOL201 = 201
 
-    # Supported datalinks (by pcapy)
+    # Headers decoded with struct in the fast decoding path
+    ETHERNET_VLAN_TAGS = (b'\x81\x00', b'\x88\xa8', b'\x91\x00')
+    ETHERTYPE_IPV6 = 0x86DD
+    IPV6_EXTENSION_HEADERS = (0, 43, 60)  # hop-by-hop, routing, destination options
+    __uint16Header = struct.Struct("!H")
+    __ipv4Header = struct.Struct("!BxH5xB2x4s4s")
+    __ipv6Header = struct.Struct("!4xHBx16s16s")
+    __ipv6ExtensionHeader = struct.Struct("!BB")
+    __portsHeader = struct.Struct("!HH")
+    __tcpHeader = struct.Struct("!HHI4xBB")
+
+    # Link types of the capture files (see http://www.tcpdump.org/linktypes.html)
+    LINKTYPE_ETHERNET = 1
+    LINKTYPE_RAW = 101
+    LINKTYPE_LINUX_SLL = 113
+    # Raw IP captures may also use the DLT_RAW values of some platforms
+    RAW_LINKTYPES = (LINKTYPE_RAW, 12, 14)
+    # Link types whose DLT value (used by libpcap to compile BPF
+    # filters) is different, except raw IP whose DLT value depends on
+    # the platform
+    LINKTYPE_DLTS = {100: 11}
+
+    # Supported datalinks
     SUPPORTED_DATALINKS = {
-        pcapy.DLT_ARCNET: "DLT_ARCNET",
-        pcapy.DLT_FDDI: "DLT_FDDI",
-        pcapy.DLT_LOOP: "DLT_LOOP",
-        pcapy.DLT_PPP_ETHER: "DLT_PPP_ETHER",
-        pcapy.DLT_ATM_RFC1483: "DLT_ATM_RFC1483",
-        pcapy.DLT_IEEE802: "DLT_IEEE802",
-        pcapy.DLT_LTALK: "DLT_LTALK",
-        pcapy.DLT_PPP_SERIAL: "DLT_PPP_SERIAL",
-        pcapy.DLT_C_HDLC: "DLT_C_HDLC",
-        pcapy.DLT_IEEE802_11: "IEEE802_11",
-        pcapy.DLT_NULL: "DLT_NULL",
-        pcapy.DLT_RAW: "DLT_RAW",
-        pcapy.DLT_EN10MB: "DLT_EN10MB",
-        pcapy.DLT_LINUX_SLL: "LINUX_SLL",
-        pcapy.DLT_PPP: "DLT_PPP",
-        pcapy.DLT_SLIP: "DLT_SLIP",
+        7: "DLT_ARCNET",
+        10: "DLT_FDDI",
+        108: "DLT_LOOP",
+        51: "DLT_PPP_ETHER",
+        100: "DLT_ATM_RFC1483",
+        6: "DLT_IEEE802",
+        114: "DLT_LTALK",
+        50: "DLT_PPP_SERIAL",
+        104: "DLT_C_HDLC",
+        105: "IEEE802_11",
+        0: "DLT_NULL",
+        101: "DLT_RAW",
+        1: "DLT_EN10MB",
+        113: "LINUX_SLL",
+        9: "DLT_PPP",
+        8: "DLT_SLIP",
     }
 
-    def __init__(self):
-        pass
+    def __init__(self, fastDecoding=True):
+        """
+        :parameter fastDecoding: if True, the common Ethernet, Linux SLL and raw
+                                 IP captures of IPv4/IPv6 and TCP/UDP packets are
+                                 decoded with :mod:`struct`, impacket only being used
+                                 for the other packets
+        :type fastDecoding: :class:`bool`
+        """
+        self.fastDecoding = fastDecoding
+        self.__tcpReassembler = None
 
     @typeCheck(str, str, int)
     def __readMessagesFromFile(self, filePath, bpfFilter, nbPackets):
         """Internal methods to read all messages from a given PCAP file."""
-        if (filePath is None):
-            raise TypeError("filePath cannot be None")
         if (nbPackets < 0):
             raise ValueError(
                 "A positive (or null) value is required for the number of packets to read."
             )
 
+        capture = self.__openFile(filePath, bpfFilter)
+        with capture:
+            self.__readCapture(capture, bpfFilter, nbPackets)
+
+    def __openFile(self, filePath, bpfFilter):
+        """Internal method that opens a PCAP or PCAPNG file, compiles its
+        BPF filter and checks its datalinks can be decoded. It returns
+        the capture file."""
+        if (filePath is None):
+            raise TypeError("filePath cannot be None")
+
         # Check file can be opened (and read)
         try:
             fp = open(filePath, 'r')
@@ -194,137 +278,298 @@ class PCAPImporter(object):
             else:
                 raise e
 
-        # Check (and configure) the bpf filter
-        packetReader = pcapy.open_offline(filePath)
+        capture = CaptureFile(filePath)
         try:
-            packetReader.setfilter(bpfFilter)
+            # Check the datalinks and the bpf filter of the interfaces
+            # declared before the first packet
+            for linkType in capture.linkTypes:
+                self.__compileFilter(capture, linkType, bpfFilter)
         except:
-            raise ValueError(
-                "The provided BPF filter is not valid (it should follow the BPF format)"
-            )
+            capture.close()
+            raise
 
-        # Check the datalink
-        self.datalink = packetReader.datalink()
-        if self.datalink not in list(PCAPImporter.SUPPORTED_DATALINKS.keys()):
+        return capture
+
+    def __checkDatalink(self, datalink):
+        """Internal method that raises an exception if packets of the
+        datalink cannot be decoded at the import layer."""
+        if datalink not in list(PCAPImporter.SUPPORTED_DATALINKS.keys()):
             self._logger.debug("Unkown datalinks")
 
-        if self.importLayer > 1 and self.datalink != pcapy.DLT_EN10MB and self.datalink != pcapy.DLT_LINUX_SLL \
-                and self.datalink != pcapy.DLT_RAW and self.datalink != PCAPImporter.PROTOCOL201:
-            self._logger.debug('Datalink: ' + str(self.datalink))
+        if self.importLayer > 1 and datalink != self.LINKTYPE_ETHERNET and datalink != self.LINKTYPE_LINUX_SLL \
+                and datalink not in self.RAW_LINKTYPES and datalink != PCAPImporter.PROTOCOL201:
+            self._logger.debug('Datalink: {0}', datalink)
             errorMessage = _("This pcap cannot be imported since the " +
                              "layer 2 is not supported ({0})").format(
-                                 str(self.datalink))
+                                 str(datalink))
             raise NetzobImportException("PCAP", errorMessage,
                                         self.INVALID_LAYER2)
+
+    def __compileFilter(self, capture, linkType, bpfFilter):
+        """Internal method that checks the datalink of an interface of the
+        capture and compiles the BPF filter for its link type. It returns
+        None if there is no filter."""
+        self.__checkDatalink(linkType)
+        if len(bpfFilter) == 0:
+            return None
+        if pcapy is None:
+            raise NetzobImportException(
+                "PCAP", _("pcapy is required to apply BPF filters"),
+                self.INVALID_BPF_FILTER)
+        snapLength = max(capture.snapLengths or [CaptureFile.MAXIMUM_SNAPSHOT_LENGTH])
+        if linkType == self.LINKTYPE_RAW:
+            datalink = pcapy.DLT_RAW
         else:
-            packetReader.loop(nbPackets, self.__packetHandler)
+            datalink = self.LINKTYPE_DLTS.get(linkType, linkType)
+        try:
+            return pcapy.compile(datalink, snapLength, bpfFilter, 1, 0)
+        except:
+            raise ValueError(
+                "The provided BPF filter is not valid (it should follow the BPF format)"
+            )
 
-    def __packetHandler(self, header, payload):
-        """Internal callback executed on each packet when parsing the pcap"""
-        (secs, usecs) = header.getts()
-        epoch = secs + (usecs / 1000000.0)
-        self._logger.debug('ImportLayer = '+ str(self.importLayer))
+    def __iterPackets(self, capture, bpfFilter, packets=None):
+        """Internal generator of the date and the payload of the packets of
+        a capture (all of them, unless an iterator of some of its packets
+        is specified) that match the BPF filter. The datalink of each
+        packet is set before it is produced. As the interfaces of a PCAPNG
+        file may be declared anywhere in it, the BPF filter is compiled
+        for each link type the first time one of its packets is read."""
+        if packets is None:
+            packets = capture.iterPackets()
+        bpfPrograms = dict()
+        for (epoch, datalink, payload) in packets:
+            if datalink not in bpfPrograms:
+                bpfPrograms[datalink] = self.__compileFilter(capture, datalink,
+                                                             bpfFilter)
+            bpfProgram = bpfPrograms[datalink]
+            if bpfProgram is not None and bpfProgram.filter(payload) == 0:
+                continue
+            self.datalink = datalink
+            yield (epoch, payload)
+
+    def __readCapture(self, capture, bpfFilter, nbPackets, packets=None):
+        """Internal method that decodes the packets of a capture, or the
+        specified packets of it, up to nbPackets packets matching the BPF
+        filter if it is not null."""
+        nbRead = 0
+        for (epoch, payload) in self.__iterPackets(capture, bpfFilter,
+                                                   packets):
+            packet = self.__decodePacket(payload, epoch)
+            if packet is not None:
+                self.__addMessage(*packet)
+            nbRead += 1
+            if nbRead == nbPackets:
+                break
+
+    def __decodePacket(self, payload, epoch):
+        """Internal method that decodes a packet up to the import layer.
+        It returns the class, the payload, the date and the addresses of
+        the message to build, or None if the packet must be ignored. TCP
+        segments are given to the TCP reassembler, if any."""
         if self.importLayer == 1:
             if len(payload) == 0:
                 return
             # Build the RawMessage
-            rawMessage = RawMessage(payload, epoch, source=None, destination=None)
-
-            self.messages.add(rawMessage)
+            return (RawMessage, payload, epoch)
 
         elif self.importLayer == 2:
             try:
                 (l2Proto, l2SrcAddr, l2DstAddr, l2Payload,
-                 etherType) = self.__decodeLayer2(header, payload)
+                 etherType) = self.__decodeLayer2(payload)
             except NetzobImportException as e:
                 self._logger.warn(
-                    "An error occured while decoding layer2 of a packet: {0}".
-                    format(e))
+                    "An error occured while decoding layer2 of a packet: {0}", e)
                 return
             if len(l2Payload) == 0:
                 return
 
             # Build the L2NetworkMessage
-            l2Message = L2NetworkMessage(l2Payload, epoch, l2Proto, l2SrcAddr,
-                                         l2DstAddr)
-
-            self.messages.add(l2Message)
+            return (L2NetworkMessage, l2Payload, epoch, l2Proto, l2SrcAddr,
+                    l2DstAddr)
 
         elif self.importLayer == 3:
             try:
                 (l2Proto, l2SrcAddr, l2DstAddr, l2Payload,
-                 etherType) = self.__decodeLayer2(header, payload)
+                 etherType) = self.__decodeLayer2(payload)
                 (l3Proto, l3SrcAddr, l3DstAddr, l3Payload,
                  ipProtocolNum) = self.__decodeLayer3(etherType, l2Payload)
             except NetzobImportException as e:
                 self._logger.warn(
-                    "An error occured while decoding layer2 and layer3 of a packet: {0}".
-                    format(e))
+                    "An error occured while decoding layer2 and layer3 of a packet: {0}", e)
                 return
 
             if len(l3Payload) == 0:
                 return
 
             # Build the L3NetworkMessage
-            l3Message = L3NetworkMessage(l3Payload, epoch, l2Proto, l2SrcAddr,
-                                         l2DstAddr, l3Proto, l3SrcAddr,
-                                         l3DstAddr)
-            self.messages.add(l3Message)
+            return (L3NetworkMessage, l3Payload, epoch, l2Proto, l2SrcAddr,
+                    l2DstAddr, l3Proto, l3SrcAddr, l3DstAddr)
 
         elif self.importLayer == 4:
             try:
                 (l2Proto, l2SrcAddr, l2DstAddr, l2Payload,
-                 etherType) = self.__decodeLayer2(header, payload)
+                 etherType) = self.__decodeLayer2(payload)
                 (l3Proto, l3SrcAddr, l3DstAddr, l3Payload,
                  ipProtocolNum) = self.__decodeLayer3(etherType, l2Payload)
-                (l4Proto, l4SrcPort, l4DstPort,
-                 l4Payload) = self.__decodeLayer4(ipProtocolNum, l3Payload)
+                (l4Proto, l4SrcPort, l4DstPort, l4Payload,
+                 tcpHeader) = self.__decodeLayer4(ipProtocolNum, l3Payload)
             except NetzobImportException as e:
                 self._logger.warn(
-                    "An error occured while decoding layer2, layer3 or layer4 of a packet: {0}".
-                    format(e))
+                    "An error occured while decoding layer2, layer3 or layer4 of a packet: {0}", e)
+                return
+            if tcpHeader is not None and self.__tcpReassembler is not None:
+                self.__tcpReassembler.addSegment(
+                    (l3SrcAddr, l4SrcPort), (l3DstAddr, l4DstPort),
+                    tcpHeader[0], tcpHeader[1], l4Payload,
+                    (L4NetworkMessage, epoch, l2Proto, l2SrcAddr, l2DstAddr,
+                     l3Proto, l3SrcAddr, l3DstAddr, l4Proto, l4SrcPort,
+                     l4DstPort))
                 return
             if len(l4Payload) == 0:
                 return
 
             # Build the L4NetworkMessage
-            l4Message = L4NetworkMessage(
-                l4Payload, epoch, l2Proto, l2SrcAddr, l2DstAddr, l3Proto,
-                l3SrcAddr, l3DstAddr, l4Proto, l4SrcPort, l4DstPort)
-
-            self.messages.add(l4Message)
+            return (L4NetworkMessage, l4Payload, epoch, l2Proto, l2SrcAddr,
+                    l2DstAddr, l3Proto, l3SrcAddr, l3DstAddr, l4Proto,
+                    l4SrcPort, l4DstPort)
 
         else:
             try:
                 (l2Proto, l2SrcAddr, l2DstAddr, l2Payload,
-                 etherType) = self.__decodeLayer2(header, payload)
+                 etherType) = self.__decodeLayer2(payload)
                 (l3Proto, l3SrcAddr, l3DstAddr, l3Payload,
                  ipProtocolNum) = self.__decodeLayer3(etherType, l2Payload)
-                (l4Proto, l4SrcPort, l4DstPort,
-                 l4Payload) = self.__decodeLayer4(ipProtocolNum, l3Payload)
+                (l4Proto, l4SrcPort, l4DstPort, l4Payload,
+                 tcpHeader) = self.__decodeLayer4(ipProtocolNum, l3Payload)
             except NetzobImportException as e:
                 self._logger.warn(
-                    "An error occured while decoding layer2, layer3, layer4 or layer5 of a packet: {0}".
-                    format(e))
+                    "An error occured while decoding layer2, layer3, layer4 or layer5 of a packet: {0}", e)
+                return
+            if tcpHeader is not None and self.__tcpReassembler is not None:
+                self.__tcpReassembler.addSegment(
+                    (l3SrcAddr, l4SrcPort), (l3DstAddr, l4DstPort),
+                    tcpHeader[0], tcpHeader[1], l4Payload,
+                    (L4NetworkMessage, epoch, l2Proto, l2SrcAddr, l2DstAddr,
+                     l3Proto, l3SrcAddr, l3DstAddr, l4Proto, l4SrcPort,
+                     l4DstPort))
                 return
             if len(l4Payload) == 0:
                 return
 
-            l5Message = L4NetworkMessage(
-                l4Payload, epoch, l2Proto, l2SrcAddr, l2DstAddr, l3Proto,
-                l3SrcAddr, l3DstAddr, l4Proto, l4SrcPort, l4DstPort)
-            
-            self.messages.add(l5Message)
+            return (L4NetworkMessage, l4Payload, epoch, l2Proto, l2SrcAddr,
+                    l2DstAddr, l3Proto, l3SrcAddr, l3DstAddr, l4Proto,
+                    l4SrcPort, l4DstPort)
 
-    def __decodeLayer2(self, header, payload):
-        """Internal method that parses the specified header and extracts
+    def __addMessage(self, messageClass, data, date, *addresses):
+        """Internal method that stores a decoded packet, either as a new
+        message or as a row of the message store"""
+        if isinstance(self.messages, MessageStore):
+            self.messages.addPacket(messageClass, data, date, *addresses)
+        else:
+            self.messages.add(messageClass(data, date, *addresses))
+
+    def __addReassembledMessage(self, message, data):
+        """Internal callback of the TCP reassembler, that keeps the message
+        of each turn until all the packets are read"""
+        (messageClass, date) = message[:2]
+        self.__reassembledPackets.append(
+            (messageClass, data, date) + message[2:])
+
+    def __fastDecode(self, decoder, *args):
+        """Internal method that runs one of the fast decoders. It returns
+        None if the impacket decoders must be used instead."""
+        if not self.fastDecoding:
+            return None
+        try:
+            return decoder(*args)
+        except struct.error:
+            return None
+
+    def __fastDecodeLayer2(self, payload):
+        """Internal method that extracts the layer2 related proprieties
+        of Ethernet, Linux SLL and raw IP captures."""
+        if self.datalink == self.LINKTYPE_ETHERNET:
+            offset = 12
+            while payload[offset:offset + 2] in self.ETHERNET_VLAN_TAGS:
+                offset += 4
+            (etherType, ) = self.__uint16Header.unpack_from(payload, offset)
+            return ("Ethernet", payload[6:12].hex(":"), payload[0:6].hex(":"),
+                    payload[offset + 2:], etherType)
+        elif self.datalink == self.LINKTYPE_LINUX_SLL:
+            (etherType, ) = self.__uint16Header.unpack_from(payload, 14)
+            return ("Linux SLL", payload[6:14], None, payload[16:], etherType)
+        elif self.datalink in self.RAW_LINKTYPES:
+            if len(payload) > 0 and payload[0] >> 4 == 6:
+                etherType = self.ETHERTYPE_IPV6
+            else:
+                etherType = Packets.IP.ethertype
+            return (None, None, None, payload, etherType)
+        return None
+
+    def __fastDecodeLayer3(self, etherType, l2Payload):
+        """Internal method that extracts the layer3 related proprieties
+        of IPv4 and IPv6 packets."""
+        if etherType == Packets.IP.ethertype:
+            (versionAndLength, totalLength, ipProtocolNum, l3SrcAddr,
+             l3DstAddr) = self.__ipv4Header.unpack_from(l2Payload)
+            headerSize = (versionAndLength & 0x0F) * 4
+            if versionAndLength >> 4 != 4 or headerSize < 20:
+                return None
+            paddingSize = len(l2Payload) - totalLength
+            l3Payload = l2Payload[headerSize:]
+            if paddingSize > 0 and len(l3Payload) > paddingSize:
+                l3Payload = l3Payload[:len(l3Payload) - paddingSize]
+            return ("IP", socket.inet_ntoa(l3SrcAddr),
+                    socket.inet_ntoa(l3DstAddr), l3Payload, ipProtocolNum)
+        elif etherType == self.ETHERTYPE_IPV6:
+            (payloadLength, ipProtocolNum, l3SrcAddr,
+             l3DstAddr) = self.__ipv6Header.unpack_from(l2Payload)
+            if payloadLength > 0:
+                l3Payload = l2Payload[40:40 + payloadLength]
+            else:
+                l3Payload = l2Payload[40:]
+            while ipProtocolNum in self.IPV6_EXTENSION_HEADERS:
+                (ipProtocolNum, extensionLength
+                 ) = self.__ipv6ExtensionHeader.unpack_from(l3Payload)
+                l3Payload = l3Payload[(extensionLength + 1) * 8:]
+            return ("IPv6", socket.inet_ntop(socket.AF_INET6, l3SrcAddr),
+                    socket.inet_ntop(socket.AF_INET6, l3DstAddr), l3Payload,
+                    ipProtocolNum)
+        return None
+
+    def __fastDecodeLayer4(self, ipProtocolNum, l3Payload):
+        """Internal method that extracts the layer4 related proprieties
+        of UDP and TCP segments."""
+        if ipProtocolNum == Packets.UDP.protocol:
+            if len(l3Payload) < 8:
+                return None
+            (l4SrcPort, l4DstPort) = self.__portsHeader.unpack_from(l3Payload)
+            return ("UDP", l4SrcPort, l4DstPort, l3Payload[8:], None)
+        elif ipProtocolNum == Packets.TCP.protocol:
+            if len(l3Payload) < 20:
+                return None
+            (l4SrcPort, l4DstPort, sequenceNumber, dataOffset,
+             flags) = self.__tcpHeader.unpack_from(l3Payload)
+            headerSize = (dataOffset >> 4) * 4
+            if headerSize < 20 or headerSize > len(l3Payload):
+                return None
+            return ("TCP", l4SrcPort, l4DstPort, l3Payload[headerSize:],
+                    (sequenceNumber, flags))
+        return None
+
+    def __decodeLayer2(self, payload):
+        """Internal method that parses the specified packet and extracts
         layer2 related proprieties."""
+        decoded = self.__fastDecode(self.__fastDecodeLayer2, payload)
+        if decoded is not None:
+            return decoded
 
         def formatMacAddress(arrayMac):
             return ":".join("{0:0>2}".format(hex(b)[2:])
                             for b in arrayMac.tolist())
 
-        if self.datalink == pcapy.DLT_EN10MB:
+        if self.datalink == self.LINKTYPE_ETHERNET:
             l2Decoder = Decoders.EthDecoder()
             l2Proto = "Ethernet"
             layer2 = l2Decoder.decode(payload)
@@ -332,7 +577,7 @@ class PCAPImporter(object):
             l2DstAddr = formatMacAddress(layer2.get_ether_dhost())
             l2Payload = payload[layer2.get_header_size():]
             etherType = layer2.get_ether_type()
-        elif self.datalink == pcapy.DLT_LINUX_SLL:
+        elif self.datalink == self.LINKTYPE_LINUX_SLL:
             l2Decoder = Decoders.LinuxSLLDecoder()
             l2Proto = "Linux SLL"
             layer2 = l2Decoder.decode(payload)
@@ -350,7 +595,7 @@ class PCAPImporter(object):
             l2DstAddr = None
             l2Payload = payload[8:]
             etherType = payload[4:6]
-        elif self.datalink == pcapy.DLT_RAW:
+        elif self.datalink in self.RAW_LINKTYPES:
             l2Proto = None
             l2SrcAddr = None
             l2DstAddr = None
@@ -362,6 +607,10 @@ class PCAPImporter(object):
     def __decodeLayer3(self, etherType, l2Payload):
         """Internal method that parses the specified header and extracts
         layer3 related proprieties."""
+        decoded = self.__fastDecode(self.__fastDecodeLayer3, etherType,
+                                    l2Payload)
+        if decoded is not None:
+            return decoded
 
         if etherType == Packets.IP.ethertype:
             l3Proto = "IP"
@@ -397,6 +646,10 @@ class PCAPImporter(object):
     def __decodeLayer4(self, ipProtocolNum, l3Payload):
         """Internal method that parses the specified header and extracts
         layer4 related proprieties."""
+        decoded = self.__fastDecode(self.__fastDecodeLayer4, ipProtocolNum,
+                                    l3Payload)
+        if decoded is not None:
+            return decoded
 
         if ipProtocolNum == Packets.UDP.protocol:
             l4Proto = "UDP"
@@ -405,7 +658,7 @@ class PCAPImporter(object):
             l4SrcPort = layer4.get_uh_sport()
             l4DstPort = layer4.get_uh_dport()
             l4Payload = layer4.get_data_as_string()
-            return (l4Proto, l4SrcPort, l4DstPort, l4Payload)
+            return (l4Proto, l4SrcPort, l4DstPort, l4Payload, None)
         elif ipProtocolNum == Packets.TCP.protocol:
             l4Proto = "TCP"
             l4Decoder = Decoders.TCPDecoder()
@@ -413,7 +666,8 @@ class PCAPImporter(object):
             l4SrcPort = layer4.get_th_sport()
             l4DstPort = layer4.get_th_dport()
             l4Payload = layer4.get_data_as_string()
-            return (l4Proto, l4SrcPort, l4DstPort, l4Payload)
+            return (l4Proto, l4SrcPort, l4DstPort, l4Payload,
+                    (layer4.get_th_seq(), layer4.get_th_flags()))
         else:
             warnMessage = _("Cannot import one of the provided packets since "
                             + "its layer 4 is unsupported (Only UDP and TCP " +
@@ -423,13 +677,16 @@ class PCAPImporter(object):
             raise NetzobImportException("PCAP", warnMessage,
                                         self.INVALID_LAYER4)
 
-    @typeCheck(list, str, int, int, bool)
+    @typeCheck(list, str, int, int, bool, bool, int, bool)
     def readMessages(self,
                      filePathList,
                      bpfFilter="",
                      importLayer=5,
                      nbPackets=0,
                      mergePacketsInFlow=False,
+                     asMessageStore=False,
+                     nbProcesses=1,
+                     useCache=False,
                     ):
         """Read all messages from a list of PCAP files. A BPF filter
         can be set to limit the captured packets. The layer of import
@@ -448,10 +705,16 @@ class PCAPImporter(object):
         :type importLayer: :class:`int`
         :param nbPackets: the number of packets to import
         :type nbPackets: :class:`int`
-        :param mergePacketsInFlow: if True, consecutive packets with same source and destination ar merged (i.e. to mimic a flow) 
+        :param mergePacketsInFlow: if True, TCP segments are reassembled into one message per turn of their connection, and other consecutive packets with same source and destination are merged
         :type mergePacketsInFlow: :class:`bool`
+        :param asMessageStore: if True, the packets are stored in a :class:`MessageStore <netzob.Model.Vocabulary.Messages.MessageStore.MessageStore>` sorted by date instead of creating a message for each of them
+        :type asMessageStore: :class:`bool`
+        :param nbProcesses: the number of processes decoding the files (or shards of a PCAP file) in parallel, None for the number of CPUs. The messages are the same, in the same order, as with a single process (TCP reassembly is always done by a single process)
+        :type nbProcesses: :class:`int`
+        :param useCache: if True, the packets decoded from each file are saved in a :class:`CaptureCache <netzob.Import.PCAPImporter.CaptureCache.CaptureCache>` next to it, and later imports of the unchanged file with the same layer, filter and number of packets load them instead of decoding the file again (TCP reassembly is not cached)
+        :type useCache: :class:`bool`
         :return: a list of captured messages
-        :rtype: a list of :class:`AbstractMessage <netzob.Model.Vocabulary.Messages.AbstractMessage>`
+        :rtype: a list of :class:`AbstractMessage <netzob.Model.Vocabulary.Messages.AbstractMessage>`, or a :class:`MessageStore <netzob.Model.Vocabulary.Messages.MessageStore.MessageStore>`
         """
 
         # Verify the existence of input files
@@ -480,28 +743,135 @@ class PCAPImporter(object):
                 "Only layers level {0} are available.".format(availableLayers))
         self.importLayer = importLayer
 
+        if nbProcesses is None:
+            nbProcesses = multiprocessing.cpu_count()
+
+        # TCP segments are reassembled in a single pass over the packets
+        if mergePacketsInFlow and importLayer >= 4:
+            self.__tcpReassembler = TCPReassembler(self.__addReassembledMessage)
+            self.__reassembledPackets = []
+            if nbProcesses > 1:
+                self._logger.debug("TCP reassembly requires a serial import")
+                nbProcesses = 1
+
+        # Load the files from their cache, or decode and cache them
+        cachedStores = None
+        if useCache and self.__tcpReassembler is not None:
+            self._logger.debug("TCP reassembly is not cached")
+        elif useCache:
+            cachedStores = []
+            for filePath in filePathList:
+                cache = CaptureCache(filePath)
+                store = cache.load(importLayer, bpfFilter, nbPackets)
+                if store is None:
+                    store = PCAPImporter(self.fastDecoding).readMessages(
+                        [filePath], bpfFilter, importLayer, nbPackets,
+                        asMessageStore=True, nbProcesses=nbProcesses)
+                    cache.save(store, importLayer, bpfFilter, nbPackets)
+                cachedStores.append(store)
+
         # Call the method that does the import job for each PCAP file
-        self.messages = SortedTypedList(AbstractMessage)
-        for filePath in filePathList:
-            self.__readMessagesFromFile(filePath, bpfFilter, nbPackets)
-        
+        if cachedStores is not None or nbProcesses > 1:
+            if cachedStores is not None:
+                store = MessageStore.merge(cachedStores)
+            else:
+                store = self.__readMessagesInParallel(filePathList, bpfFilter,
+                                                      nbPackets, nbProcesses)
+            if asMessageStore:
+                self.messages = store
+            else:
+                self.messages = SortedTypedList(AbstractMessage)
+                self.messages.addAll(store)
+        else:
+            if asMessageStore:
+                self.messages = MessageStore()
+            else:
+                self.messages = SortedTypedList(AbstractMessage)
+            for filePath in filePathList:
+                self.__readMessagesFromFile(filePath, bpfFilter, nbPackets)
+
+        # The turns of the TCP connections take their place among the
+        # other messages before they are merged
+        if self.__tcpReassembler is not None:
+            self.__tcpReassembler.flush()
+            self.__tcpReassembler = None
+            for packet in self.__reassembledPackets:
+                self.__addMessage(*packet)
+            self.__reassembledPackets = None
+
+        if asMessageStore:
+            self.messages.sort()
+
         # if requested, we merge consecutive messages that share same source and destination
         if mergePacketsInFlow:
-            mergedMessages = SortedTypedList(AbstractMessage)
-            previousMessage = None
-            for message in self.messages.values():
-                if previousMessage is not None and message.source == previousMessage.source and message.destination == previousMessage.destination:
-                    previousMessage.data += message.data
-                else:
-                    mergedMessages.add(message)
-                    previousMessage = message
-            self.messages = mergedMessages
-            
+            if asMessageStore:
+                self.messages = self.messages.mergeConsecutive()
+            else:
+                self.messages = self.__mergeConsecutiveMessages(self.messages)
+
+        return self.messages
+
+    def __mergeConsecutiveMessages(self, messages):
+        """Internal method that merges consecutive messages that share same
+        source and destination"""
+        mergedMessages = SortedTypedList(AbstractMessage)
+        previousMessage = None
+        chunks = []
+        for message in messages.values():
+            if previousMessage is not None and message.source == previousMessage.source and message.destination == previousMessage.destination:
+                chunks.append(message.data)
+            else:
+                if len(chunks) > 1:
+                    previousMessage.data = b"".join(chunks)
+                mergedMessages.add(message)
+                previousMessage = message
+                chunks = [message.data]
+        if len(chunks) > 1:
+            previousMessage.data = b"".join(chunks)
+        return mergedMessages
+
+    def __readMessagesInParallel(self, filePathList, bpfFilter, nbPackets,
+                                 nbProcesses):
+        """Internal method that imports the files in a pool of processes
+        and merges their messages by date. When there are less files than
+        processes, the files are split into shards of consecutive packets,
+        each one opened and read by a process."""
+        if (nbPackets < 0):
+            raise ValueError(
+                "A positive (or null) value is required for the number of packets to read."
+            )
+
+        tasks = []
+        for filePath in filePathList:
+            # Errors on the files are raised before starting the processes
+            self.__openFile(filePath, bpfFilter).close()
+            nbShards = 1
+            if nbPackets == 0 and len(filePathList) < nbProcesses:
+                nbShards = nbProcesses
+            for shard in range(nbShards):
+                tasks.append((filePath, shard, nbShards, bpfFilter,
+                              self.importLayer, nbPackets, self.fastDecoding))
+
+        with multiprocessing.Pool(nbProcesses) as pool:
+            stores = pool.map(_readMessagesTask, tasks)
+        return MessageStore.merge(stores)
+
+    def _readMessagesTask(self, filePath, shard, nbShards, bpfFilter,
+                          importLayer, nbPackets):
+        """Internal method executed by the processes of the pool. It reads
+        the packets of the shard-th of nbShards shards of a capture file,
+        and returns them in a MessageStore sorted by date."""
+        self.importLayer = importLayer
+        self.messages = MessageStore()
+        with CaptureFile(filePath) as capture:
+            self.__readCapture(capture, bpfFilter, nbPackets,
+                               capture.iterShard(shard, nbShards))
+        self.messages.sort()
         return self.messages
 
     @staticmethod
-    @typeCheck(list, str, int, int, bool)
-    def readFiles(filePathList, bpfFilter="", importLayer=5, nbPackets=0, mergePacketsInFlow=False):
+    @typeCheck(list, str, int, int, bool, bool, int, bool)
+    def readFiles(filePathList, bpfFilter="", importLayer=5, nbPackets=0, mergePacketsInFlow=False, asMessageStore=False, nbProcesses=1, useCache=False):
         """Read all messages from a list of PCAP files. A BPF filter
         can be set to limit the captured packets. The layer of import
         can also be specified:
@@ -519,18 +889,24 @@ class PCAPImporter(object):
         :type importLayer: :class:`int`
         :param nbPackets: the number of packets to import
         :type nbPackets: :class:`int`
-        :param mergePacketsInFlow: if True, consecutive packets with same source and destination ar merged (i.e. to mimic a flow) 
-        :type mergePacketsInFlow: :class:`bool`        
+        :param mergePacketsInFlow: if True, TCP segments are reassembled into one message per turn of their connection, and other consecutive packets with same source and destination are merged
+        :type mergePacketsInFlow: :class:`bool`
+        :param asMessageStore: if True, the packets are stored in a :class:`MessageStore <netzob.Model.Vocabulary.Messages.MessageStore.MessageStore>` sorted by date instead of creating a message for each of them
+        :type asMessageStore: :class:`bool`
+        :param nbProcesses: the number of processes decoding the files (or shards of a PCAP file) in parallel, None for the number of CPUs. The messages are the same, in the same order, as with a single process (TCP reassembly is always done by a single process)
+        :type nbProcesses: :class:`int`
+        :param useCache: if True, the packets decoded from each file are saved in a :class:`CaptureCache <netzob.Import.PCAPImporter.CaptureCache.CaptureCache>` next to it, and later imports of the unchanged file with the same layer, filter and number of packets load them instead of decoding the file again (TCP reassembly is not cached)
+        :type useCache: :class:`bool`
         :return: a list of captured messages
-        :rtype: a list of :class:`AbstractMessage <netzob.Model.Vocabulary.Messages.AbstractMessage>`
+        :rtype: a list of :class:`AbstractMessage <netzob.Model.Vocabulary.Messages.AbstractMessage>`, or a :class:`MessageStore <netzob.Model.Vocabulary.Messages.MessageStore.MessageStore>`
         """
 
         importer = PCAPImporter()
-        return importer.readMessages(filePathList,bpfFilter, importLayer, nbPackets, mergePacketsInFlow)
+        return importer.readMessages(filePathList,bpfFilter, importLayer, nbPackets, mergePacketsInFlow, asMessageStore, nbProcesses, useCache)
 
     @staticmethod
-    @typeCheck(str, str, int, int, bool)
-    def readFile(filePath, bpfFilter="", importLayer=5, nbPackets=0, mergePacketsInFlow=False):
+    @typeCheck(str, str, int, int, bool, bool, int, bool)
+    def readFile(filePath, bpfFilter="", importLayer=5, nbPackets=0, mergePacketsInFlow=False, asMessageStore=False, nbProcesses=1, useCache=False):
         """Read all messages from the specified PCAP file. A BPF filter
         can be set to limit the captured packets. The layer of import
         can also be specified:
@@ -548,15 +924,99 @@ class PCAPImporter(object):
         :type importLayer: :class:`int`
         :param nbPackets: the number of packets to import
         :type nbPackets: :class:`int`
-        :param mergePacketsInFlow: if True, consecutive packets with same source and destination ar merged (i.e. to mimic a flow) 
+        :param mergePacketsInFlow: if True, TCP segments are reassembled into one message per turn of their connection, and other consecutive packets with same source and destination are merged
         :type mergePacketsInFlow: :class:`bool`
+        :param asMessageStore: if True, the packets are stored in a :class:`MessageStore <netzob.Model.Vocabulary.Messages.MessageStore.MessageStore>` sorted by date instead of creating a message for each of them
+        :type asMessageStore: :class:`bool`
+        :param nbProcesses: the number of processes decoding the files (or shards of a PCAP file) in parallel, None for the number of CPUs. The messages are the same, in the same order, as with a single process (TCP reassembly is always done by a single process)
+        :type nbProcesses: :class:`int`
+        :param useCache: if True, the packets decoded from each file are saved in a :class:`CaptureCache <netzob.Import.PCAPImporter.CaptureCache.CaptureCache>` next to it, and later imports of the unchanged file with the same layer, filter and number of packets load them instead of decoding the file again (TCP reassembly is not cached)
+        :type useCache: :class:`bool`
         :return: a list of captured messages
-        :rtype: a list of :class:`AbstractMessage <netzob.Model.Vocabulary.Messages.AbstractMessage>`
+        :rtype: a list of :class:`AbstractMessage <netzob.Model.Vocabulary.Messages.AbstractMessage>`, or a :class:`MessageStore <netzob.Model.Vocabulary.Messages.MessageStore.MessageStore>`
         """
 
         importer = PCAPImporter()
         return importer.readFiles([filePath], bpfFilter, importLayer,
-                                  nbPackets, mergePacketsInFlow)
+                                  nbPackets, mergePacketsInFlow, asMessageStore,
+                                  nbProcesses, useCache)
+
+    @staticmethod
+    def iterFile(filePath, bpfFilter="", importLayer=5, maxMessages=0, startDate=None, endDate=None):
+        r"""Iterate over the messages of the specified PCAP file as they are
+        decoded. Contrary to :meth:`readFile`, messages are neither kept nor
+        sorted, so that captures of any size are read with a constant memory
+        footprint. Messages are produced in the order of the capture, and
+        the iteration can be stopped at any time.
+
+        >>> from netzob.all import *
+        >>> for message in PCAPImporter.iterFile("./test/resources/pcaps/test_import_udp.pcap", maxMessages=2):
+        ...     print(repr(message.data))
+        b'CMDidentify#\x07\x00\x00\x00Roberto'
+        b'RESidentify#\x00\x00\x00\x00\x00\x00\x00\x00'
+
+        A time window can be specified to only produce the messages captured
+        between two dates:
+
+        >>> messages = PCAPImporter.iterFile("./test/resources/pcaps/test_import_udp.pcap", startDate=1388154953.3199, endDate=1388154953.3203)
+        >>> for message in messages:
+        ...     print(repr(message.data[:10]))
+        b'CMDauthent'
+        b'RESauthent'
+        b'CMDencrypt'
+        b'RESencrypt'
+
+        :param filePath: the pcap path
+        :type filePath: :class:`str`
+        :param bpfFilter: a string representing a BPF filter.
+        :type bpfFilter: :class:`str`
+        :param importLayer: an integer representing the protocol layer to start importing.
+        :type importLayer: :class:`int`
+        :param maxMessages: the maximum number of messages to produce (0 for no limit)
+        :type maxMessages: :class:`int`
+        :param startDate: if specified, packets captured before this date are skipped
+        :type startDate: :class:`float`
+        :param endDate: if specified, the iteration stops at the first packet captured after this date
+        :type endDate: :class:`float`
+        :return: a generator of captured messages
+        :rtype: a generator of :class:`AbstractMessage <netzob.Model.Vocabulary.Messages.AbstractMessage>`
+        """
+        if maxMessages < 0:
+            raise ValueError(
+                "A positive (or null) value is required for the maximum number of messages."
+            )
+        availableLayers = [1, 2, 3, 4, 5]
+        if not importLayer in availableLayers:
+            raise Exception(
+                "Only layers level {0} are available.".format(availableLayers))
+
+        # The file is opened here so that errors are raised before the iteration starts
+        importer = PCAPImporter()
+        importer.importLayer = importLayer
+        capture = importer.__openFile(filePath, bpfFilter)
+        return importer.__iterMessages(capture, bpfFilter, maxMessages,
+                                       startDate, endDate)
+
+    def __iterMessages(self, capture, bpfFilter, maxMessages, startDate,
+                       endDate):
+        """Internal generator that decodes the packets of an opened capture
+        file one at a time."""
+        nbMessages = 0
+        with capture:
+            for (epoch, payload) in self.__iterPackets(capture, bpfFilter):
+                if startDate is not None and epoch < startDate:
+                    continue
+                if endDate is not None and epoch > endDate:
+                    break
+
+                packet = self.__decodePacket(payload, epoch)
+                if packet is None:
+                    continue
+                (messageClass, data, date, *addresses) = packet
+                yield messageClass(data, date, *addresses)
+                nbMessages += 1
+                if nbMessages == maxMessages:
+                    break
 
     @staticmethod
     @typeCheck(L2NetworkMessage)
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011-2017 Georges Bossert and Frédéric Guihéry              |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+from collections import OrderedDict
+
+#+---------------------------------------------------------------------------+
+#| Related third party imports
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Local application imports
+#+---------------------------------------------------------------------------+
+from netzob.Common.Utils.Decorators import NetzobLogger
+
+
+class _TCPDirection(object):
+    """State of one direction of a TCP connection"""
+
+    __slots__ = ("nextSequenceNumber", "pendingSegments", "finished")
+
+    def __init__(self):
+        # Sequence number of the next expected byte, None until known
+        self.nextSequenceNumber = None
+        # Out of order segments, by sequence number
+        self.pendingSegments = dict()
+        self.finished = False
+
+
+class _TCPConnection(object):
+    """State of a TCP connection: both directions and the current turn"""
+
+    __slots__ = ("directions", "turnDirection", "turnMessage", "turnChunks")
+
+    def __init__(self):
+        self.directions = (_TCPDirection(), _TCPDirection())
+        # Direction sending the data of the current turn, its first
+        # segment's message and its payloads (joined once emitted)
+        self.turnDirection = None
+        self.turnMessage = None
+        self.turnChunks = []
+
+
+@NetzobLogger
+class TCPReassembler(object):
+    """Reassembles the payloads of TCP segments into application messages,
+    one message for each turn of a connection, i.e. all the data a peer
+    sends before the other one answers.
+
+    Connections are identified by the addresses and ports of their peers.
+    Segments are ordered with their sequence numbers: retransmitted data is
+    dropped and out of order segments are kept until the missing data
+    arrives (at most `maxPendingSegments` per direction, beyond which the
+    gap is skipped). At most `maxConnections` connections are tracked, the
+    least recently active one being flushed when a new connection would
+    exceed that limit, and connections are forgotten when they are reset or
+    closed by both peers, so that the memory does not depend on the length
+    of the capture.
+
+    Each segment comes with a `message` object, the reassembler gives back
+    the one of the first segment of each turn along with the data of the
+    turn to the `callback`.
+
+    >>> from netzob.Import.PCAPImporter.TCPReassembler import TCPReassembler
+    >>> turns = []
+    >>> reassembler = TCPReassembler(lambda message, data: turns.append((message, data)))
+    >>> client, server = ("10.0.0.1", 1024), ("10.0.0.2", 80)
+    >>> reassembler.addSegment(client, server, 1000, TCPReassembler.SYN, b"", "syn")
+    >>> reassembler.addSegment(server, client, 5000, TCPReassembler.SYN | TCPReassembler.ACK, b"", "syn-ack")
+    >>> reassembler.addSegment(client, server, 1001, TCPReassembler.ACK, b"GET / ", "request")
+    >>> reassembler.addSegment(client, server, 1013, TCPReassembler.ACK, b".1\\r\\n", "out of order")
+    >>> reassembler.addSegment(client, server, 1007, TCPReassembler.ACK, b"HTTP/1", "end of request")
+    >>> reassembler.addSegment(client, server, 1001, TCPReassembler.ACK, b"GET / ", "retransmission")
+    >>> reassembler.addSegment(server, client, 5001, TCPReassembler.ACK, b"HTTP/1.1 200 OK", "response")
+    >>> turns
+    [('request', b'GET / HTTP/1.1\\r\\n')]
+    >>> reassembler.addSegment(server, client, 5016, TCPReassembler.FIN | TCPReassembler.ACK, b"", "fin")
+    >>> turns[1]
+    ('response', b'HTTP/1.1 200 OK')
+    >>> reassembler.nbConnections
+    1
+    >>> reassembler.addSegment(client, server, 1017, TCPReassembler.FIN | TCPReassembler.ACK, b"", "fin")
+    >>> reassembler.nbConnections
+    0
+
+    """
+
+    FIN = 0x01
+    SYN = 0x02
+    RST = 0x04
+    ACK = 0x10
+
+    def __init__(self, callback, maxConnections=1000000, maxPendingSegments=64):
+        """
+        :parameter callback: function called with the message of the first segment and the data of each turn
+        :type callback: a callable
+        :parameter maxConnections: the maximum number of connections tracked at the same time
+        :type maxConnections: :class:`int`
+        :parameter maxPendingSegments: the maximum number of out of order segments kept for each direction
+        :type maxPendingSegments: :class:`int`
+        """
+        self.callback = callback
+        self.maxConnections = maxConnections
+        self.maxPendingSegments = maxPendingSegments
+        # Connections, from the least to the most recently active
+        self.__connections = OrderedDict()
+
+    @property
+    def nbConnections(self):
+        """The number of connections currently tracked
+
+        :type: :class:`int`
+        """
+        return len(self.__connections)
+
+    def addSegment(self, source, destination, sequenceNumber, flags, payload, message):
+        """Process a TCP segment, in the order of the capture.
+
+        :parameter source: the address and port of the sender
+        :type source: a hashable object, e.g. a :class:`tuple`
+        :parameter destination: the address and port of the receiver
+        :type destination: a hashable object, e.g. a :class:`tuple`
+        :parameter sequenceNumber: the sequence number of the segment
+        :type sequenceNumber: :class:`int`
+        :parameter flags: the TCP flags of the segment
+        :type flags: :class:`int`
+        :parameter payload: the data of the segment
+        :type payload: :class:`bytes`
+        :parameter message: the object given back to the callback if the segment starts a turn
+        """
+        if source <= destination:
+            key = (source, destination)
+            directionIndex = 0
+        else:
+            key = (destination, source)
+            directionIndex = 1
+
+        connection = self.__connections.get(key)
+        if connection is None:
+            if len(payload) == 0 and not flags & self.SYN:
+                return
+            connection = _TCPConnection()
+            self.__connections[key] = connection
+            if len(self.__connections) > self.maxConnections:
+                (_, evictedConnection) = self.__connections.popitem(last=False)
+                self.__flushConnection(evictedConnection)
+        else:
+            self.__connections.move_to_end(key)
+
+        direction = connection.directions[directionIndex]
+        if flags & self.SYN:
+            # The SYN flag consumes one sequence number
+            sequenceNumber = (sequenceNumber + 1) & 0xFFFFFFFF
+            direction.nextSequenceNumber = sequenceNumber
+        elif direction.nextSequenceNumber is None and len(payload) > 0:
+            direction.nextSequenceNumber = sequenceNumber
+
+        if len(payload) > 0:
+            if len(direction.pendingSegments) == 0 and sequenceNumber == direction.nextSequenceNumber:
+                # Expected segment
+                self.__appendToTurn(connection, directionIndex, payload, message)
+                direction.nextSequenceNumber = (sequenceNumber + len(payload)) & 0xFFFFFFFF
+            else:
+                direction.pendingSegments[sequenceNumber] = (payload, message)
+                self.__drain(connection, directionIndex)
+                if len(direction.pendingSegments) > self.maxPendingSegments:
+                    self.__skipGap(connection, directionIndex)
+
+        if flags & self.RST:
+            self.__flushConnection(connection)
+            del self.__connections[key]
+        elif flags & self.FIN:
+            while len(direction.pendingSegments) > 0:
+                self.__skipGap(connection, directionIndex)
+            if connection.turnDirection == directionIndex:
+                self.__emitTurn(connection)
+            direction.finished = True
+            if all(d.finished for d in connection.directions):
+                del self.__connections[key]
+
+    def flush(self):
+        """Give the data of all the pending turns to the callback and forget
+        all the connections."""
+        for connection in self.__connections.values():
+            self.__flushConnection(connection)
+        self.__connections.clear()
+
+    @staticmethod
+    def __offset(sequenceNumber, nextSequenceNumber):
+        """Position of a sequence number relative to the next expected one,
+        considering the wrap around of sequence numbers."""
+        offset = (sequenceNumber - nextSequenceNumber) & 0xFFFFFFFF
+        if offset >= 0x80000000:
+            offset -= 0x100000000
+        return offset
+
+    def __drain(self, connection, directionIndex):
+        """Append the segments following the received data to the turn."""
+        direction = connection.directions[directionIndex]
+        pendingSegments = direction.pendingSegments
+        found = True
+        while found and len(pendingSegments) > 0:
+            found = False
+            for sequenceNumber in list(pendingSegments.keys()):
+                offset = self.__offset(sequenceNumber, direction.nextSequenceNumber)
+                if offset > 0:
+                    continue
+                (payload, message) = pendingSegments.pop(sequenceNumber)
+                if len(payload) + offset <= 0:
+                    # Retransmitted data
+                    continue
+                self.__appendToTurn(connection, directionIndex, payload[-offset:], message)
+                direction.nextSequenceNumber = (direction.nextSequenceNumber + len(payload) + offset) & 0xFFFFFFFF
+                found = True
+
+    def __skipGap(self, connection, directionIndex):
+        """Give up on missing data and resume at the first pending segment."""
+        direction = connection.directions[directionIndex]
+        if len(direction.pendingSegments) == 0:
+            return
+        direction.nextSequenceNumber = min(
+            direction.pendingSegments.keys(),
+            key=lambda sequenceNumber: self.__offset(sequenceNumber, direction.nextSequenceNumber))
+        self.__drain(connection, directionIndex)
+
+    def __appendToTurn(self, connection, directionIndex, data, message):
+        if connection.turnDirection != directionIndex:
+            self.__emitTurn(connection)
+            connection.turnDirection = directionIndex
+            connection.turnMessage = message
+        connection.turnChunks.append(data)
+
+    def __emitTurn(self, connection):
+        if len(connection.turnChunks) > 0:
+            self.callback(connection.turnMessage, b"".join(connection.turnChunks))
+        connection.turnDirection = None
+        connection.turnMessage = None
+        connection.turnChunks = []
+
+    def __flushConnection(self, connection):
+        """Give the remaining data of a connection to the callback, the data
+        of the current turn first."""
+        if connection.turnDirection == 1:
+            directionIndexes = (1, 0)
+        else:
+            directionIndexes = (0, 1)
+        for directionIndex in directionIndexes:
+            while len(connection.directions[directionIndex].pendingSegments) > 0:
+                self.__skipGap(connection, directionIndex)
+        self.__emitTurn(connection)
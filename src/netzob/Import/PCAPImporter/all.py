@@ -29,20 +29,17 @@
 # List subpackages to import with the current one
 # see docs.python.org/2/tutorial/modules.html
 
-pcapy_available = False
-#impacket_available = False
+impacket_available = False
 
 try:
-    import pcapy
-    pcapy_available = True
+    import impacket
+    impacket_available = True
 except ImportError:
     pass
 
-# try:
-#     import impacket
-#     impacket_available = True
-# except ImportError:
-#     pass
+from netzob.Import.PCAPImporter.CaptureFile import CaptureFile
+from netzob.Import.PCAPImporter.CaptureCache import CaptureCache
 
-if pcapy_available:  # and impacket_available:
+# pcapy is only required by the PCAPImporter to apply BPF filters
+if impacket_available:
     from netzob.Import.PCAPImporter.PCAPImporter import PCAPImporter
@@ -45,6 +45,7 @@
 from netzob.Common.Utils.Decorators import typeCheck
 from netzob.Model.Vocabulary.AbstractField import AbstractField
 from netzob.Model.Vocabulary.Symbol import Symbol
+from netzob.Model.Vocabulary.Messages.MessageStore import MessageStore
 from netzob.Model.Vocabulary.Types.AbstractType import AbstractType, UnitSize
 from netzob.Inference.Vocabulary.FormatOperations.FieldSplitStatic.FieldSplitStatic import FieldSplitStatic
 from netzob.Inference.Vocabulary.FormatOperations.FieldSplitDelimiter import FieldSplitDelimiter
@@ -66,7 +67,11 @@ class Format(object):
 
     @staticmethod
     @typeCheck(AbstractField)
-    def splitAligned(field, useSemantic=True, doInternalSlick=False):
+    def splitAligned(field,
+                     useSemantic=True,
+                     doInternalSlick=False,
+                     progressive=False,
+                     guideTree=None):
         r"""Split the specified field according to the variations of message bytes.
         Relies on a sequence alignment algorithm.
 
@@ -83,12 +88,17 @@ class Format(object):
         >>> len(symbol.getCells())
         2
 
+        :keyword progressive: align the identical messages once, following a guide tree
+        :type progressive: :class:`bool`
+        :keyword guideTree: the guide tree of the progressive alignment, a tree of pairs (tuples) whose leaves are the messages of the field
+        :type guideTree: :class:`tuple`
         """
         if field is None:
             raise TypeError("Field cannot be None")
 
-        fs = FieldSplitAligned(doInternalSlick=doInternalSlick)
-        fs.execute(field, useSemantic)
+        fs = FieldSplitAligned(
+            doInternalSlick=doInternalSlick, progressive=progressive)
+        fs.execute(field, useSemantic, guideTree)
 
     @staticmethod
     @typeCheck(AbstractField, str)
@@ -360,16 +370,24 @@ class Format(object):
 
     @staticmethod
     @typeCheck(list)
-    def clusterByAlignment(messages, minEquivalence=50, internalSlick=True):
+    def clusterByAlignment(messages, minEquivalence=50, internalSlick=True,
+                           nbThread=None, lshBands=None, progressive=False):
         """This clustering process regroups messages in groups that maximes
         their alignement. It provides the required methods to compute clustering
         between multiple symbols/messages using UPGMA algorithms (see U{http://en.wikipedia.org/wiki/UPGMA}).
         When processing, the matrix of scores is computed by the C extensions (L{_libScoreComputation}
         and used to regroup messages and symbols into equivalent cluster.
+        The matrix is computed by nbThread threads (by default, one per
+        available cpu). If lshBands is not None, only the messages sharing
+        n-grams are aligned (see :attr:`ClusterByAlignment.lshBands
+        <netzob.Inference.Vocabulary.FormatOperations.ClusterByAlignment.ClusterByAlignment.lshBands>`).
+        If progressive is True, the messages of each symbol are aligned
+        following the merges of the clustering.
         """
         clustering = ClusterByAlignment(
-            minEquivalence=minEquivalence, internalSlick=internalSlick)
-        return clustering.cluster(messages)
+            minEquivalence=minEquivalence, internalSlick=internalSlick,
+            nbThread=nbThread, lshBands=lshBands, progressive=progressive)
+        return clustering.cluster(list(messages))
 
     @staticmethod
     @typeCheck(list)
@@ -401,6 +419,9 @@ class Format(object):
 
         """
 
+        if isinstance(messages, MessageStore):
+            return Format._clusterMessageStore(messages, messages.getSource)
+
         clusters = dict()
         for message in messages:
             if message.source in clusters.keys():
@@ -440,6 +461,9 @@ class Format(object):
 
         """
 
+        if isinstance(messages, MessageStore):
+            return Format._clusterMessageStore(messages, messages.getDestination)
+
         clusters = dict()
         for message in messages:
             if message.destination in clusters.keys():
@@ -449,6 +473,27 @@ class Format(object):
 
         return list(clusters.values())
 
+    @staticmethod
+    def _clusterMessageStore(store, keyFunction):
+        """Regroup the messages of a store sharing the same key, without
+        creating them. Each cluster holds a sub-store of the messages.
+
+        >>> from netzob.all import *
+        >>> store = MessageStore([RawMessage(b"a", source="A"), RawMessage(b"b", source="B"), RawMessage(b"c", source="A")])
+        >>> for symbol in Format.clusterBySource(store):
+        ...     print(symbol.name, list(symbol.messages.iterData()))
+        Symbol-A [b'a', b'c']
+        Symbol-B [b'b']
+
+        """
+        indexesByKey = dict()
+        for index in range(len(store)):
+            indexesByKey.setdefault(keyFunction(index), []).append(index)
+
+        return [
+            Symbol(name="Symbol-{}".format(key), messages=store.select(indexes))
+            for key, indexes in indexesByKey.items()
+        ]
 
     @staticmethod
     @typeCheck(list)
@@ -504,7 +549,7 @@ class Format(object):
             )
 
         cluster = ClusterByApplicativeData()
-        return cluster.cluster(messages, appDatas)
+        return cluster.cluster(list(messages), appDatas)
 
     @staticmethod
     @typeCheck(AbstractField, AbstractField)
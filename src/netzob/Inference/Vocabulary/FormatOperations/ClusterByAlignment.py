@@ -34,11 +34,12 @@
 # +---------------------------------------------------------------------------+
 # | Standard library imports                                                  |
 # +---------------------------------------------------------------------------+
-from collections import OrderedDict
+import multiprocessing
 
 # +---------------------------------------------------------------------------+
 # | Related third party imports                                               |
 # +---------------------------------------------------------------------------+
+import numpy
 
 # +---------------------------------------------------------------------------+
 # | Local application imports                                                 |
@@ -62,6 +63,20 @@ class ClusterByAlignment(object):
     When processing, the matrix of scores is computed by the C extensions (L{_libScoreComputation}
     and used to regroup messages and symbols into equivalent cluster.
 
+    The scores are stored in a condensed matrix (the upper triangle of the
+    similarity matrix, as a NumPy float32 array). The highest score of each
+    cluster is cached, so that finding the two clusters to merge and
+    updating the scores of the merged cluster are vectorized operations.
+    The similarity matrix is computed by several threads (see :attr:`nbThread`).
+    Only the scores of the alignments are computed, which can be restricted
+    to a diagonal band (see :attr:`bandWidth`) or stopped as soon as they
+    cannot reach the minimum equivalence (see :attr:`earlyExit`).
+
+    Aligning every pair of messages is quadratic. With :attr:`lshBands`,
+    the messages are first pre-clustered in buckets of messages sharing
+    n-grams (by locality-sensitive hashing of their MinHash signatures),
+    and only the messages of the same bucket are aligned.
+
 
     >>> from netzob.all import *
     >>> pseudos = ["kurt", "ditrich", "toto", "carlito"]
@@ -105,15 +120,50 @@ class ClusterByAlignment(object):
     'hello ' | 'toto'    | ", what's up in " | 'Barcelone' | ' ?'   
     -------- | --------- | ----------------- | ----------- | -------
 
+    The clusters do not depend on the number of threads:
+
+    >>> symbols2 = ClusterByAlignment(nbThread=3).cluster(messages)
+    >>> [len(s.messages) for s in symbols2] == [len(s.messages) for s in symbols]
+    True
+
+    The pre-clustering only aligns the messages sharing n-grams:
+
+    >>> symbols3 = ClusterByAlignment(lshBands=16).cluster(messages)
+    >>> sorted(len(s.messages) for s in symbols3)
+    [3, 16, 48]
+
+    The messages of each symbol can be aligned progressively, following
+    the merges of the clustering:
+
+    >>> symbols4 = ClusterByAlignment(progressive=True).cluster(messages)
+    >>> [len(s.fields) for s in symbols4] == [len(s.fields) for s in symbols]
+    True
+
     """
 
+    # Size (in bytes) of the n-grams of the pre-clustering
+    NGRAM_SIZE = 3
+    # Number of MinHash values of each band of the pre-clustering
+    LSH_ROWS = 2
+    LSH_SEED = 0
+
     def __init__(self,
                  minEquivalence=50,
                  internalSlick=True,
-                 recomputeMatrixThreshold=None):
+                 recomputeMatrixThreshold=None,
+                 nbThread=None,
+                 bandWidth=None,
+                 earlyExit=False,
+                 lshBands=None,
+                 progressive=False):
         self.minEquivalence = minEquivalence
         self.internalSlick = internalSlick
         self.recomputeMatrixThreshold = recomputeMatrixThreshold
+        self.nbThread = nbThread
+        self.bandWidth = bandWidth
+        self.earlyExit = earlyExit
+        self.lshBands = lshBands
+        self.progressive = progressive
 
     @typeCheck(list)
     def cluster(self, messages):
@@ -135,22 +185,40 @@ class ClusterByAlignment(object):
         self._logger.debug(
             "Initiating the clustering by alignment on {0} messages...".format(
                 len(messages)))
-        symbols = self._processUPGMA(messages, self.recomputeMatrixThreshold)
+        if self.lshBands is None:
+            (symbols, guideTrees) = self._processUPGMA(
+                messages, self.recomputeMatrixThreshold)
+        else:
+            symbols = []
+            guideTrees = []
+            for bucket in self._preCluster(messages):
+                (bucketSymbols, bucketTrees) = self._processUPGMA(
+                    bucket, self.recomputeMatrixThreshold)
+                symbols.extend(bucketSymbols)
+                guideTrees.extend(bucketTrees)
         self._logger.debug("Clustering completed, computing final alignment.")
 
         # Retrieve the alignment of each symbol and the build the associated regular expression
-        for symbol in symbols:
+        for (symbol, guideTree) in zip(symbols, guideTrees):
             self._logger.debug(
                 "Align messages from symbol {0}".format(symbol.name))
             from netzob.Inference.Vocabulary.Format import Format
-            Format.splitAligned(symbol, useSemantic=False)
+            if self.progressive:
+                Format.splitAligned(
+                    symbol,
+                    useSemantic=False,
+                    progressive=True,
+                    guideTree=guideTree)
+            else:
+                Format.splitAligned(symbol, useSemantic=False)
 
         return symbols
 
     @typeCheck(list)
     def _processUPGMA(self, messages, recomputeMatrixThreshold=None):
         """Computes the matrix of equivalences (in C) and reduces it
-        iteratively."""
+        iteratively. Returns the symbols and their guide trees (see
+        :meth:`_computePhylogenicTree`)."""
         if messages is None:
             raise TypeError("Messages cannot be None")
         if len(messages) == 0:
@@ -173,8 +241,78 @@ class ClusterByAlignment(object):
         return self._computePhylogenicTree(initialSymbols,
                                            recomputeMatrixThreshold)
 
+    def _getNgrams(self, data):
+        """Returns the distinct n-grams of the data, as integers. A data
+        shorter than an n-gram is its only n-gram."""
+        n = self.NGRAM_SIZE
+        values = numpy.frombuffer(data, dtype=numpy.uint8).astype(numpy.uint64)
+        if len(values) < n:
+            return numpy.array(
+                [((len(values) + 1) << (8 * n)) | int.from_bytes(data, "big")],
+                dtype=numpy.uint64)
+        nbNgrams = len(values) - n + 1
+        ngrams = values[:nbNgrams].copy()
+        for k in range(1, n):
+            ngrams <<= numpy.uint64(8)
+            ngrams |= values[k:k + nbNgrams]
+        return numpy.unique(ngrams)
+
+    def _computeMinHashes(self, messages):
+        """Computes the MinHash signatures of the messages: the minimum of
+        each hash function over the n-grams of a message."""
+        nbHashes = self.lshBands * self.LSH_ROWS
+        # Multiply-shift hash functions, drawn with a fixed seed
+        random = numpy.random.RandomState(self.LSH_SEED)
+        multipliers = random.randint(
+            0, 2**63, size=nbHashes, dtype=numpy.uint64) * numpy.uint64(2) + numpy.uint64(1)
+        increments = random.randint(0, 2**63, size=nbHashes, dtype=numpy.uint64)
+
+        signatures = numpy.empty((len(messages), nbHashes), dtype=numpy.uint32)
+        for (i, message) in enumerate(messages):
+            ngrams = self._getNgrams(message.data)
+            hashes = (ngrams[:, None] * multipliers + increments) >> numpy.uint64(32)
+            signatures[i] = hashes.min(axis=0)
+        return signatures
+
+    def _preCluster(self, messages):
+        """Regroups the messages in buckets of candidate clusters: two
+        messages are in the same bucket if they share the same MinHash
+        values in one of the bands (or are linked by such messages).
+        The buckets are ordered by their first message."""
+        signatures = self._computeMinHashes(messages)
+        parents = numpy.arange(len(messages))
+
+        def find(i):
+            while parents[i] != i:
+                parents[i] = parents[parents[i]]
+                i = parents[i]
+            return i
+
+        keyType = numpy.dtype((numpy.void, 4 * self.LSH_ROWS))
+        for band in range(self.lshBands):
+            keys = numpy.ascontiguousarray(
+                signatures[:, band * self.LSH_ROWS:(band + 1) *
+                           self.LSH_ROWS]).view(keyType).ravel()
+            (_, firsts, inverse) = numpy.unique(
+                keys, return_index=True, return_inverse=True)
+            firsts = firsts[inverse.ravel()]
+            for i in numpy.flatnonzero(firsts != numpy.arange(len(messages))):
+                (root_i, root_j) = (find(i), find(firsts[i]))
+                if root_i != root_j:
+                    parents[max(root_i, root_j)] = min(root_i, root_j)
+
+        buckets = dict()
+        for (i, message) in enumerate(messages):
+            buckets.setdefault(find(i), []).append(message)
+        self._logger.debug("{0} messages pre-clustered in {1} buckets",
+                           len(messages), len(buckets))
+        return list(buckets.values())
+
     @typeCheck(list)
     def _computeSimilarityMatrix(self, symbols):
+        """Computes (in C) the scores of each pair of symbols, and returns
+        them in a condensed matrix: the score of the symbols i < j is at
+        index :meth:`_condensedIndex(i, j) <_condensedIndex>`."""
         if symbols is None:
             raise TypeError("Symbols cannot be None")
         for symbol in symbols:
@@ -187,135 +325,189 @@ class ClusterByAlignment(object):
         wrapper = WrapperArgsFactory(
             "_libScoreComputation.computeSimilarityMatrix")
         wrapper.typeList[wrapper.function](symbols)
-        self._logger.debug("wrapper = {0}".format(wrapper))
+        self._logger.debug("wrapper = {0}", wrapper)
 
-        (listScores) = _libScoreComputation.computeSimilarityMatrix(
+        scores = _libScoreComputation.computeSimilarityMatrix(
             self.internalSlick, self._cb_executionStatus, self._isFinish,
-            debug, wrapper)
-        # Retrieve the scores for each association of symbols
-        scores = OrderedDict()
-        for (iuid, juid, score) in listScores:
-            if iuid not in list(scores.keys()):
-                scores[iuid] = OrderedDict()
-            if juid not in list(scores.keys()):
-                scores[juid] = OrderedDict()
-            scores[iuid][juid] = score
-            if iuid not in list(scores[juid].keys()):
-                scores[juid][iuid] = score
-        return scores
+            debug, wrapper, self.nbThread, self.bandWidth or 0,
+            float(self.minEquivalence) if self.earlyExit else 0.0)
+
+        # The scores are a buffer of floats, listed by rows of the upper triangle
+        return numpy.frombuffer(scores, dtype=numpy.float32)
+
+    @staticmethod
+    def _condensedIndex(i, j, nbSymbols):
+        """Returns the index of the score of the symbols i < j in a
+        condensed matrix. i can be an array."""
+        return i * nbSymbols - i * (i + 1) // 2 + j - i - 1
+
+    def _getRow(self, k):
+        """Returns the scores of the cluster k with all the clusters."""
+        n = self.__nbSlots
+        row = numpy.empty(n, dtype=numpy.float32)
+        row[:k] = self.scores[self._condensedIndex(self.__lowerSlots[:k], k, n)]
+        row[k] = -numpy.inf
+        start = self._condensedIndex(k, k + 1, n)
+        row[k + 1:] = self.scores[start:start + n - k - 1]
+        return row
+
+    def _setRow(self, k, row):
+        """Updates the scores of the cluster k with all the clusters."""
+        n = self.__nbSlots
+        self.scores[self._condensedIndex(self.__lowerSlots[:k], k, n)] = row[:k]
+        start = self._condensedIndex(k, k + 1, n)
+        self.scores[start:start + n - k - 1] = row[k + 1:]
+
+    def _computeRowMaximum(self, k, row=None):
+        """Caches the highest score of the cluster k. When several clusters
+        have this score, the oldest one is kept."""
+        if row is None:
+            row = self._getRow(k)
+        row[~self.__active] = -numpy.inf
+        maximum = row.max()
+        candidates = numpy.flatnonzero(row == maximum)
+        self.__rowMaximum[k] = maximum
+        self.__rowArgMaximum[k] = candidates[numpy.argmin(self.__ranks[candidates])]
+        self.__outdated[k] = False
+
+    def _initClusters(self, symbols):
+        """Initializes the clusters with the specified symbols, in this order."""
+        n = len(symbols)
+        self.__nbSlots = n
+        self.__lowerSlots = numpy.arange(n)
+        self.__active = numpy.ones(n, dtype=bool)
+        # The rank of a cluster is its order of creation
+        self.__ranks = numpy.arange(n)
+        self.__nextRank = n
+        self.__sizes = numpy.array([len(symbol.messages) for symbol in symbols])
+        self.__rowMaximum = numpy.full(n, -numpy.inf, dtype=numpy.float32)
+        self.__rowArgMaximum = numpy.zeros(n, dtype=numpy.int64)
+        # The highest score of an outdated cluster is only an upper bound
+        self.__outdated = numpy.zeros(n, dtype=bool)
+        if n > 1:
+            for k in range(n):
+                self._computeRowMaximum(k)
 
     def _computePhylogenicTree(self, symbols, recomputeMatrixThreshold):
-        """Compute the phylogenic tree
-        @var max_i: uid of i_maximum
-        @var max_j: uid of j_maximum
-        @var maxScore: the highest global score"""
-        maxScore = 0
-        (float(100) - float(self.minEquivalence)) / float(100)
+        """Compute the phylogenic tree: the two most similar clusters are
+        merged until their score is lower than the minimum equivalence.
+
+        The scores are in the condensed matrix :attr:`scores` of the
+        specified symbols. When several pairs have the highest score, the
+        pair of the oldest clusters is merged first. The remaining symbols
+        are returned in their order of creation, with their guide trees:
+        the tree of the merges of their messages, whose nodes are pairs and
+        leaves are messages."""
         self.lastScore = None
-
-        if len(self.scores) > 1:
-            max_i = max(self.scores, key=lambda x: self.scores[x][max(self.scores[x], key=lambda y: self.scores[x][y])])
-            max_j = max(self.scores[max_i],
-                        key=lambda y: self.scores[max_i][y])
-            maxScore = self.scores[max_i][max_j]
-        while len(self.scores) > 1 and maxScore >= self.minEquivalence:
-
-            symbols_uid = [str(id(s))
-                           for s in symbols]  # List of the UID in of symbols
-            (i_maximum, j_maximum) = (symbols_uid.index(max_i),
-                                      symbols_uid.index(max_j))
-            size_i = len(symbols[i_maximum].messages)
-            size_j = len(symbols[j_maximum].messages)
-
-            self._logger.debug("Clustering {0} with {1} (score = {2})".format(
-                str(i_maximum), str(j_maximum), str(maxScore)))
-
-            newuid = self._mergeEffectiveRowCol(symbols, i_maximum, j_maximum)
-            self._updateScore(symbols, max_i, max_j, newuid, size_i, size_j,
-                              recomputeMatrixThreshold)
-            #            self.log.debug("Score après: {0}".format(str(self.scores)))
-            if len(self.scores) > 1:
-                max_i = max(self.scores, key=lambda x: self.scores[x][max(self.scores[x], key=lambda y: self.scores[x][y])])
-                max_j = max(self.scores[max_i],
-                            key=lambda y: self.scores[max_i][y])
-                maxScore = self.scores[max_i][max_j]
-        return symbols
-
-    def _mergeEffectiveRowCol(self, symbols, i_maximum, j_maximum):
-        """Merge the symbols i and j in the "symbols" structure
-        @param i_maximum: id of the first symbol to merge
-        @param j_maximum: id of the second symbol to merge
-        @return the newly created symbol result of the merged process"""
-        # Extract symbols i and j
-        if i_maximum > j_maximum:
-            symbol1 = symbols.pop(i_maximum)
-            symbol2 = symbols.pop(j_maximum)
-        else:
-            symbol1 = symbols.pop(j_maximum)
-            symbol2 = symbols.pop(i_maximum)
-
-        # Merge the symbols i and j
-        messages = []
-        messages.extend(symbol1.messages)
-        messages.extend(symbol2.messages)
-
-        newSymbol = Symbol(messages=messages)
-
-        # Append th new symbol to the "symbols" structure
-        symbols.append(newSymbol)
-
-        return str(id(newSymbol))
-
-    def _updateScore(self,
-                     symbols,
-                     iuid,
-                     juid,
-                     newuid,
-                     size_i,
-                     size_j,
-                     recomputeMatrixThreshold=None):
-        """Update the score of two merged clusters.
-        @param iuid: id of the first cluster merged
-        @param juid: id of the second cluster merged
-        @param newuid: new id of the merged cluster
-        @param size_i: size of the first cluster
-        @param size_j: size of the second cluster"""
-
-        self._logger.debug("Update score (recompte matrix : {0})".format(
-            recomputeMatrixThreshold))
-
-        currentScore = self.scores[iuid][juid]
-
-        # Delete row and col
-        del self.scores[iuid]
-        del self.scores[juid]
-        # Create a new col
-        self.scores[newuid] = OrderedDict()
-
-        # Should we recompute
-        if self.lastScore is None:
-            self.lastScore = currentScore
-
-        if recomputeMatrixThreshold is None or abs(
-                currentScore - self.lastScore) <= recomputeMatrixThreshold:
-            self._logger.debug("Ok no need in recomputing the matrix")
-
-            total_size = size_i + size_j
-
-            for k in list(self.scores.keys()):
-                if k != newuid:
-                    self.scores[k][newuid] = (
-                        size_i * self.scores[k][iuid] + size_j *
-                        self.scores[k][juid]) * 1.0 / total_size
-                    del self.scores[k][iuid]
-                    del self.scores[k][juid]
-                    self.scores[newuid][k] = self.scores[k][newuid]
-        else:
-            self._logger.debug(
-                "Merge and recompute matrix similarity threshold")
-            self.scores = self.computeSimilarityMatrix(symbols)
-
-        self.lastScore = currentScore
+        self._initClusters(symbols)
+
+        # Each cluster is either an initial symbol or a list of messages
+        clusters = list(symbols)
+        guideTrees = [symbol.messages[0] for symbol in symbols]
+        while numpy.count_nonzero(self.__active) > 1:
+            i_maximum = self._findMaximum()
+            maxScore = self.__rowMaximum[i_maximum]
+            j_maximum = int(self.__rowArgMaximum[i_maximum])
+            if maxScore < self.minEquivalence:
+                break
+
+            self._logger.debug("Clustering {0} with {1} (score = {2})",
+                               i_maximum, j_maximum, maxScore)
+
+            # The messages of the newest cluster are first
+            if self.__ranks[i_maximum] < self.__ranks[j_maximum]:
+                (first, second) = (j_maximum, i_maximum)
+            else:
+                (first, second) = (i_maximum, j_maximum)
+            messages = []
+            for k in (first, second):
+                if isinstance(clusters[k], Symbol):
+                    messages.extend(clusters[k].messages)
+                else:
+                    messages.extend(clusters[k])
+            clusters[i_maximum] = messages
+            clusters[j_maximum] = None
+            guideTrees[i_maximum] = (guideTrees[first], guideTrees[second])
+            guideTrees[j_maximum] = None
+
+            if self.lastScore is None:
+                self.lastScore = maxScore
+            if recomputeMatrixThreshold is not None and abs(
+                    maxScore - self.lastScore) > recomputeMatrixThreshold:
+                self._logger.debug(
+                    "Merge and recompute matrix similarity threshold")
+                self.__active[j_maximum] = False
+                self.__ranks[i_maximum] = self.__nextRank
+                self.__nextRank += 1
+                (clusters, guideTrees) = self._buildSymbols(
+                    clusters, guideTrees, self.__ranks)
+                self.scores = self._computeSimilarityMatrix(clusters)
+                self._initClusters(clusters)
+            else:
+                self._mergeClusters(i_maximum, j_maximum)
+            self.lastScore = maxScore
+
+        return self._buildSymbols(clusters, guideTrees, self.__ranks)
+
+    def _findMaximum(self):
+        """Returns the oldest cluster having the highest score. The highest
+        scores of the outdated clusters are computed again only when one
+        of them may be the highest, so that merges tied with many clusters
+        do not require to scan all their rows."""
+        while True:
+            maxScore = self.__rowMaximum.max()
+            candidates = numpy.flatnonzero(self.__rowMaximum == maxScore)
+            k = int(candidates[numpy.argmin(self.__ranks[candidates])])
+            if not self.__outdated[k]:
+                return k
+            self._computeRowMaximum(k)
+
+    def _mergeClusters(self, i_maximum, j_maximum):
+        """Merges the cluster j_maximum in the cluster i_maximum, whose
+        scores are the averages of the scores of both clusters weighted by
+        their sizes."""
+        size_i = self.__sizes[i_maximum]
+        size_j = self.__sizes[j_maximum]
+        row_i = self._getRow(i_maximum)
+        row_j = self._getRow(j_maximum)
+        row = ((size_i * row_i.astype(numpy.float64) + size_j * row_j) /
+               (size_i + size_j)).astype(numpy.float32)
+
+        self.__active[j_maximum] = False
+        self.__rowMaximum[j_maximum] = -numpy.inf
+        self.__outdated[j_maximum] = False
+        self.__sizes[i_maximum] = size_i + size_j
+        self.__ranks[i_maximum] = self.__nextRank
+        self.__nextRank += 1
+        self._setRow(i_maximum, row)
+        self._computeRowMaximum(i_maximum, row.copy())
+
+        # Update the highest scores of the other clusters. The merged
+        # scores are averages, so the highest score of a cluster which
+        # was closest to i_maximum or j_maximum can only be lower: it is
+        # kept as an upper bound until needed (see _findMaximum)
+        others = self.__active.copy()
+        others[i_maximum] = False
+        self.__outdated[others & ((self.__rowArgMaximum == i_maximum) |
+                                  (self.__rowArgMaximum == j_maximum))] = True
+        higher = others & ~self.__outdated & (row > self.__rowMaximum)
+        self.__rowMaximum[higher] = row[higher]
+        self.__rowArgMaximum[higher] = i_maximum
+
+    def _buildSymbols(self, clusters, guideTrees, ranks):
+        """Returns the symbols of the clusters and their guide trees, in
+        their order of creation."""
+        symbols = []
+        symbolTrees = []
+        for k in numpy.argsort(ranks, kind="stable"):
+            cluster = clusters[k]
+            if cluster is None:
+                continue
+            if not isinstance(cluster, Symbol):
+                cluster = Symbol(messages=cluster)
+            symbols.append(cluster)
+            symbolTrees.append(guideTrees[k])
+        return (symbols, symbolTrees)
 
     def _cb_executionStatus(self, stage, donePercent, currentMessage):
         """Callback function called by the C extension to provide info on status
@@ -367,3 +559,105 @@ class ClusterByAlignment(object):
     @recomputeMatrixThreshold.setter  # type: ignore
     def recomputeMatrixThreshold(self, recomputeMatrixThreshold):
         self.__recomputeMatrixThreshold = recomputeMatrixThreshold
+
+    @property
+    def nbThread(self):
+        """The number of threads which compute the similarity matrix.
+
+        If set to None, the number of threads is the number of available cpu.
+        The scores do not depend on the number of threads.
+
+        :type: :class:`int`
+        """
+        return self.__nbThread
+
+    @nbThread.setter  # type: ignore
+    @typeCheck(int)
+    def nbThread(self, nbThread):
+        if nbThread is None:
+            nbThread = multiprocessing.cpu_count()
+
+        if nbThread <= 0:
+            raise ValueError(
+                "NbThread must be >0, use None to use all the available cpu.")
+
+        self.__nbThread = nbThread
+
+    @property
+    def bandWidth(self):
+        """If not None, the alignments of the similarity matrix only consider
+        the cells of the Needleman-Wunsch matrix at most bandWidth cells away
+        from its diagonals. The scores of messages whose best alignment has
+        more gaps can change, but the memory and the time of an alignment
+        become linear in the length of the messages.
+
+        :type: :class:`int`
+        """
+        return self.__bandWidth
+
+    @bandWidth.setter  # type: ignore
+    @typeCheck(int)
+    def bandWidth(self, bandWidth):
+        if bandWidth is not None and bandWidth <= 0:
+            raise ValueError(
+                "BandWidth must be >0, use None to compute the whole alignments.")
+        self.__bandWidth = bandWidth
+
+    @property
+    def earlyExit(self):
+        """If True, the alignment of two messages stops as soon as their
+        score cannot reach the minimum equivalence. Their score is then an
+        upper bound lower than the minimum equivalence, which changes the
+        averaged scores of the clusters. As the alignment is only one of the
+        three components of the score, this is only effective for minimum
+        equivalences above 82.
+
+        :type: :class:`bool`
+        """
+        return self.__earlyExit
+
+    @earlyExit.setter  # type: ignore
+    @typeCheck(bool)
+    def earlyExit(self, earlyExit):
+        if earlyExit is None:
+            raise TypeError("earlyExit cannot be None")
+        self.__earlyExit = earlyExit
+
+    @property
+    def lshBands(self):
+        """If not None, the number of bands of the locality-sensitive hashing
+        which pre-clusters the messages: only the messages of the same
+        bucket are aligned. Two messages whose n-grams have a Jaccard
+        similarity s share a bucket with a probability of at least
+        1 - (1 - s^2)^lshBands: more bands find more similar messages, but
+        build bigger buckets, whose alignment is longer.
+
+        :type: :class:`int`
+        """
+        return self.__lshBands
+
+    @lshBands.setter  # type: ignore
+    @typeCheck(int)
+    def lshBands(self, lshBands):
+        if lshBands is not None and lshBands <= 0:
+            raise ValueError(
+                "lshBands must be >0, use None to align all the messages.")
+        self.__lshBands = lshBands
+
+    @property
+    def progressive(self):
+        """If True, the messages of each symbol are aligned progressively,
+        following the tree of the merges of the clustering, rather than one
+        after the other (see :class:`FieldSplitAligned
+        <netzob.Inference.Vocabulary.FormatOperations.FieldSplitAligned.FieldSplitAligned.FieldSplitAligned>`).
+
+        :type: :class:`bool`
+        """
+        return self.__progressive
+
+    @progressive.setter  # type: ignore
+    @typeCheck(bool)
+    def progressive(self, progressive):
+        if progressive is None:
+            raise TypeError("progressive cannot be None")
+        self.__progressive = progressive
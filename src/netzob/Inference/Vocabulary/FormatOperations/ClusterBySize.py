@@ -35,6 +35,7 @@
 #| Standard library imports                                                  |
 #+---------------------------------------------------------------------------+
 from collections import OrderedDict
+from collections.abc import Sequence
 
 #+---------------------------------------------------------------------------+
 #| Related third party imports                                               |
@@ -50,6 +51,7 @@ from netzob.Model.Vocabulary.Symbol import Symbol
 from netzob.Model.Vocabulary.Types.HexaString import HexaString
 from netzob.Model.Vocabulary.Types.Raw import Raw
 from netzob.Model.Vocabulary.Messages.RawMessage import RawMessage
+from netzob.Model.Vocabulary.Messages.MessageStore import MessageStore
 from netzob.Model.Vocabulary.Domain.DomainFactory import DomainFactory
 
 
@@ -59,7 +61,7 @@ class ClusterBySize(object):
         size.
     """
 
-    @typeCheck(list)
+    @typeCheck(Sequence)
     def cluster(self, messages):
         """Create and return new symbols according to the messages size.
 
@@ -92,8 +94,16 @@ class ClusterBySize(object):
         '00ffffffff1100abcd'
         --------------------
 
+        Messages of a :class:`MessageStore <netzob.Model.Vocabulary.Messages.MessageStore.MessageStore>`
+        are clustered without being created, each symbol holding a sub-store:
+
+        >>> store = MessageStore(messages)
+        >>> print([len(sym.messages) for sym in clusterer.cluster(store)])
+        [3, 2, 1]
+
         :param messages: the messages to cluster.
         :type messages: a list of :class:`AbstractMessage <netzob.Model.Vocabulary.Messages.AbstractMessage.AbstractMessage>`
+                        or a :class:`MessageStore <netzob.Model.Vocabulary.Messages.MessageStore.MessageStore>`
         :raise Exception if something bad happens
         """
 
@@ -101,6 +111,15 @@ class ClusterBySize(object):
         if messages is None:
             raise TypeError("'messages' should not be None")
 
+        if isinstance(messages, MessageStore):
+            indexesByLen = OrderedDict()
+            for index, l in enumerate(messages.payloadSizes.tolist()):
+                indexesByLen.setdefault(l, []).append(index)
+            return [
+                Symbol(messages=messages.select(indexes), name="symbol_{0}".format(str(length)))
+                for (length, indexes) in indexesByLen.items()
+            ]
+
         # Cluster messages by size
         messagesByLen = OrderedDict()
         for msg in messages:
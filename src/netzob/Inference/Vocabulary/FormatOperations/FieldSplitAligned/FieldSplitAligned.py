@@ -111,6 +111,25 @@ class FieldSplitAligned(object):
     'hello ' | 'sygus'  | ", what's up in " | 'Germany' | ' ?'   
     -------- | -------- | ----------------- | --------- | -------
 
+    In progressive mode, the identical messages are aligned once, and the
+    messages are aligned following a guide tree. Here, the guide tree
+    aligns the first two messages together, then the last two, and
+    finally the two resulting alignments:
+
+    >>> messages.append(RawMessage(data=samples[0]))
+    >>> symbol = Symbol(messages=messages)
+    >>> fs = FieldSplitAligned(progressive=True)
+    >>> guideTree = ((messages[0], messages[1]), (messages[2], messages[3]))
+    >>> fs.execute(symbol, useSemantic=False, guideTree=guideTree)
+    >>> print(symbol.str_data())
+    Field00  | Field01  | Field02           | Field03   | Field04
+    -------- | -------- | ----------------- | --------- | -------
+    'hello ' | 'toto'   | ", what's up in " | 'France'  | ' ?'   
+    'hello ' | 'netzob' | ", what's up in " | 'UK'      | ' ?'   
+    'hello ' | 'sygus'  | ", what's up in " | 'Germany' | ' ?'   
+    'hello ' | 'toto'   | ", what's up in " | 'France'  | ' ?'   
+    -------- | -------- | ----------------- | --------- | -------
+
     # Let's illustrate the use of semantic constrained sequence alignment with a simple example
 
     >>> samples = [b"John-0108030405--john.doe@gmail.com", b"Mathieu-0908070605-31 rue de Paris, 75000 Paris, France-mat@yahoo.fr", b"Olivia-0348234556-7 allee des peupliers, 13000 Marseille, France-olivia.tortue@hotmail.fr"]
@@ -165,19 +184,23 @@ class FieldSplitAligned(object):
     """
 
     def __init__(self, unitSize=UnitSize.SIZE_8,
-                 doInternalSlick=False):
+                 doInternalSlick=False,
+                 progressive=False):
         """Constructor.
 
         """
         self.doInternalSlick = doInternalSlick
         self.unitSize = unitSize
+        self.progressive = progressive
 
     @typeCheck(AbstractField, bool)
-    def execute(self, field, useSemantic=True):
+    def execute(self, field, useSemantic=True, guideTree=None):
         """Execute the alignement on the specified field.
 
         :parameter field: the field that will be aligned
         :type field: :class:`AbstractField <netzob.Model.Vocabulary.AbstractField.AbstractField>`
+        :keyword guideTree: the order of the progressive alignment, a tree of pairs (tuples) whose leaves are the messages of the field
+        :type guideTree: :class:`tuple`
         """
         if field is None:
             raise TypeError("Field cannot be None")
@@ -203,9 +226,23 @@ class FieldSplitAligned(object):
         if len(list(messageValues.values())) == 0:
             return
 
+        # The leaves of the guide tree are replaced by the index of their values
+        if guideTree is not None:
+            indexes = dict((id(message), iMessage)
+                           for (iMessage, message) in enumerate(messageValues))
+
+            def getIndex(message):
+                if id(message) not in indexes:
+                    raise ValueError(
+                        "The guide tree should only contain messages of the field")
+                return indexes[id(message)]
+
+            guideTree = self._foldGuideTree(guideTree, getIndex,
+                                            lambda left, right: (left, right))
+
         # Execute the alignement
         (alignment, semanticTags, score) = self._alignData(
-            list(messageValues.values()), semanticTags)
+            list(messageValues.values()), semanticTags, guideTree)
 
         # Check the results
         if alignment is None:
@@ -360,14 +397,23 @@ class FieldSplitAligned(object):
     #         field.fields.append(innerField)
 
     @typeCheck(list, list)
-    def _alignData(self, values, semanticTags=None):
+    def _alignData(self, values, semanticTags=None, guideTree=None):
         """Align the specified data with respect to the semantic tags
         identified over the data.
 
+        By default, the values are folded one after the other into the
+        alignment of the previous ones. In progressive mode (or if a guide
+        tree is given), the identical values are first discarded, and the
+        alignments of the two children of each node of the guide tree are
+        aligned together. Without a guide tree, the values are sorted and
+        aligned by pairs, then the pairs by pairs, and so on.
+
         :parameter values: values to align
         :type values: a list of hexastring.
         :keyword semanticTags: semantic tags to consider when aligning
         :type semanticTags: a dict of :class:`SemanticTag <netzob.Model.Vocabulary.SemanticTag.SemanticTag>`
+        :keyword guideTree: a tree of pairs (tuples) whose leaves are the indexes of the values
+        :type guideTree: :class:`tuple`
         :return: the alignment, its score and the semantic tags
         :rtype: a tuple (alignement, semanticTags, score)
         """
@@ -391,13 +437,18 @@ class FieldSplitAligned(object):
         toSend = [(values[iValue], semanticTags[iValue])
                   for iValue in range(len(values))]
 
+        merges = None
+        if self.progressive or guideTree is not None:
+            (toSend, merges) = self._getProgressiveMerges(toSend, guideTree)
+
         wrapper = WrapperArgsFactory("_libNeedleman.alignMessages")
         wrapper.typeList[wrapper.function](toSend)
 
         debug = False
         (score1, score2, score3, regex, mask,
          semanticTags) = _libNeedleman.alignMessages(
-             self.doInternalSlick, self._cb_executionStatus, debug, wrapper)
+             self.doInternalSlick, self._cb_executionStatus, debug, wrapper,
+             merges)
         scores = (score1, score2, score3)
 
         # Deserialize returned info
@@ -406,6 +457,96 @@ class FieldSplitAligned(object):
                                                      self.unitSize)
         return (alignment, semanticTags, scores)
 
+    def _getProgressiveMerges(self, toSend, guideTree=None):
+        """Discard the duplicated values and compute the merges of the
+        progressive alignment, in the format of
+        :func:`_libNeedleman.alignMessages`: the alignment of the i-th pair
+        of nodes is the node len(uniqueValues) + i.
+
+        :return: the unique values and their merges
+        :rtype: a tuple (uniqueValues, merges)
+        """
+        uniqueValues = []
+        uniqueIndexes = []
+        knownValues = dict()
+        for (value, tags) in toSend:
+            key = (value, tuple(tags.items()))
+            if key not in knownValues:
+                knownValues[key] = len(uniqueValues)
+                uniqueValues.append((value, tags))
+            uniqueIndexes.append(knownValues[key])
+
+        merges = []
+
+        def merge(left, right):
+            if left is None:
+                return right
+            if right is None:
+                return left
+            merges.append((left, right))
+            return len(uniqueValues) + len(merges) - 1
+
+        if guideTree is None:
+            # Similar values are close once sorted
+            nodes = sorted(
+                range(len(uniqueValues)), key=lambda i: uniqueValues[i][0])
+            while len(nodes) > 1:
+                parents = [merge(nodes[i], nodes[i + 1])
+                           for i in range(0, len(nodes) - 1, 2)]
+                if len(nodes) % 2 == 1:
+                    parents.append(nodes[-1])
+                nodes = parents
+            return (uniqueValues, merges)
+
+        seenIndexes = set()
+        alignedValues = set()
+
+        def getLeaf(iValue):
+            if not isinstance(iValue, int) or not 0 <= iValue < len(toSend) \
+               or iValue in seenIndexes:
+                raise ValueError(
+                    "The guide tree should contain each value exactly once")
+            seenIndexes.add(iValue)
+            # The duplicated values are not aligned again
+            if uniqueIndexes[iValue] in alignedValues:
+                return None
+            alignedValues.add(uniqueIndexes[iValue])
+            return uniqueIndexes[iValue]
+
+        self._foldGuideTree(guideTree, getLeaf, merge)
+        if len(seenIndexes) != len(toSend):
+            raise ValueError(
+                "The guide tree should contain each value exactly once")
+        return (uniqueValues, merges)
+
+    @staticmethod
+    def _foldGuideTree(guideTree, leaf, node):
+        """Fold the specified guide tree in post-order, without recursion
+        as the trees built by a clustering can be very deep.
+
+        :parameter leaf: the function applied on each leaf
+        :parameter node: the function applied on the results of the children of each node
+        :return: the result of the root
+        """
+        results = []
+        stack = [(guideTree, False)]
+        while len(stack) > 0:
+            (tree, visited) = stack.pop()
+            if not isinstance(tree, tuple):
+                results.append(leaf(tree))
+            elif visited:
+                right = results.pop()
+                left = results.pop()
+                results.append(node(left, right))
+            else:
+                if len(tree) != 2:
+                    raise ValueError(
+                        "Each node of the guide tree should be a pair")
+                stack.append((tree, True))
+                stack.append((tree[1], False))
+                stack.append((tree[0], False))
+        return results[0]
+
     @typeCheck(AbstractMessage)
     def __searchApplicativeDataInMessage(self, message):
         """This internal method search any applicative data that could be identified
@@ -716,6 +857,22 @@ class FieldSplitAligned(object):
             raise TypeError("doInternalSlick cannot be None")
         self.__doInternalSlick = doInternalSlick
 
+    @property
+    def progressive(self):
+        """If True, the identical values are aligned once, and the values are
+        aligned following a guide tree rather than one after the other.
+
+        :type: :class:`bool`
+        """
+        return self.__progressive
+
+    @progressive.setter  # type: ignore
+    @typeCheck(bool)
+    def progressive(self, progressive):
+        if progressive is None:
+            raise TypeError("progressive cannot be None")
+        self.__progressive = progressive
+
     @property
     def unitSize(self):
         return self.__unitSize
@@ -34,6 +34,7 @@
 #+---------------------------------------------------------------------------+
 #| Standard library imports                                                  |
 #+---------------------------------------------------------------------------+
+from collections import OrderedDict
 from collections.abc import Iterable
 
 #+---------------------------------------------------------------------------+
@@ -44,6 +45,15 @@ from netzob.Model.Vocabulary.Symbol import Symbol
 #+---------------------------------------------------------------------------+
 #| Local application imports                                                 |
 #+---------------------------------------------------------------------------+
+from netzob.Model.Vocabulary.UnknownSymbol import UnknownSymbol
+from netzob.Model.Vocabulary.Messages.AbstractMessage import AbstractMessage
+from netzob.Model.Vocabulary.Messages.RawMessage import RawMessage
+from netzob.Model.Vocabulary.Domain.Variables.Memory import Memory
+from netzob.Model.Vocabulary.Domain.Parser.MessageParser import MessageParser
+from netzob.Model.Vocabulary.Domain.Parser.SymbolIndex import SymbolIndex
+from netzob.Model.Vocabulary.Types.TypeConverter import TypeConverter
+from netzob.Model.Vocabulary.Types.BitArray import BitArray
+from netzob.Model.Vocabulary.Types.Raw import Raw
 
 
 class Symbols(dict):
@@ -76,3 +86,69 @@ class Symbols(dict):
 
     def __repr__(self):
         return "Symbols({})".format(', '.join(map(repr, self.values())))
+
+    def abstract_stream(self, messages, memory=None):
+        """The :meth:`abstract_stream` method abstracts each message of a
+        stream into the first symbol that can parse it, in the order of
+        the symbols. The symbols are indexed and compiled once for all
+        the messages (see :class:`SymbolIndex
+        <netzob.Model.Vocabulary.Domain.Parser.SymbolIndex.SymbolIndex>`),
+        and the messages are abstracted lazily.
+
+        A message that cannot be abstracted is reported with an
+        :class:`UnknownSymbol
+        <netzob.Model.Vocabulary.UnknownSymbol.UnknownSymbol>` and an
+        empty structure, instead of raising an exception.
+
+        :param messages: The concrete messages to abstract.
+        :param memory: A memory used to store variable values during
+                       abstraction of the messages, shared by all the
+                       messages. The default value is None: each message
+                       is then abstracted with an empty memory.
+        :type messages: an iterable of :class:`bytes` or :class:`AbstractMessage <netzob.Model.Vocabulary.Messages.AbstractMessage.AbstractMessage>`, required
+        :type memory: :class:`Memory <netzob.Model.Vocabulary.Domain.Variables.Memory.Memory>`, optional
+        :return: For each message, a tuple made of the symbol and the
+                 structure of the parsed data.
+        :rtype: a generator of :class:`tuple`
+
+        >>> from netzob.all import *
+        >>> s1 = Symbol([Field("hello", name="cmd"), Field(String(nbChars=(1, 8)), name="arg")], name="s1")
+        >>> s2 = Symbol([Field("bye", name="cmd")], name="s2")
+        >>> symbols = Symbols(s1, s2)
+        >>> for (symbol, structure) in symbols.abstract_stream([b"hello john", b"bye", b"hi"]):
+        ...     print(symbol.name, structure)
+        s1 OrderedDict([('cmd', b'hello'), ('arg', b' john')])
+        s2 OrderedDict([('cmd', b'bye')])
+        Unknown message b'hi' OrderedDict()
+
+        """
+
+        messageParser = MessageParser(memory=memory)
+        symbolIndex = SymbolIndex(self.values())
+
+        for data in messages:
+            if isinstance(data, AbstractMessage):
+                data = data.data
+
+            symbol = None
+            data_structure = OrderedDict()
+            if len(data) > 0:
+                bitArrayToParse = TypeConverter.convert(data, Raw, BitArray)
+                if memory is None:
+                    # Same as Symbol.abstract(): each message has its own memory
+                    messageParser.memory = Memory()
+                for potentialSymbol in symbolIndex.candidates(bitArrayToParse, messageParser.memory):
+                    parsingPlan = symbolIndex.getPlan(potentialSymbol)
+                    if parsingPlan is None:
+                        continue
+                    try:
+                        data_structure = potentialSymbol._abstractWithPlan(
+                            data, messageParser, parsingPlan, bitArrayToParse=bitArrayToParse)
+                    except Exception:
+                        continue
+                    symbol = potentialSymbol
+                    break
+
+            if symbol is None:
+                symbol = UnknownSymbol(message=RawMessage(data))
+            yield (symbol, data_structure)
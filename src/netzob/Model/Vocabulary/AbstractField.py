@@ -605,17 +605,96 @@ class AbstractField(AbstractMementoCreator, metaclass=abc.ABCMeta):
 
         """
 
-        from netzob.Model.Vocabulary.Domain.Parser.MessageParser import MessageParser, InvalidParsingPathException
+        from netzob.Model.Vocabulary.Domain.Parser.MessageParser import MessageParser
+
+        messageParser = MessageParser(memory=memory)
+        parsingPlan = messageParser.compile(self)
+        return self._abstractWithPlan(data, messageParser, parsingPlan, preset=preset)
+
+    def abstract_many(self, messages, preset=None, memory=None):
+        """The :meth:`abstract_many` method abstracts a sequence of
+        data with the current symbol (or field) model. It is equivalent
+        to calling the :meth:`abstract` method on each data, but the
+        fields are compiled once for all the data.
+
+        The data are abstracted lazily, and the failures are reported
+        for each data instead of being raised, so that a failing data
+        does not stop the processing of a large capture.
+
+        :param messages: The concrete messages to abstract in symbol (or field).
+        :param preset: The configuration used to check values in symbol (or field) structure obtained after message parsing.
+        :param memory: A memory used to store variable values during
+                       abstraction of the messages, shared by all the
+                       messages. The default value is None: each message
+                       is then abstracted with an empty memory.
+        :type messages: an iterable of :class:`bytes` or :class:`AbstractMessage <netzob.Model.Vocabulary.Messages.AbstractMessage.AbstractMessage>`, required
+        :type preset: :class:`Preset <netzob.Model.Vocabulary.Preset.Preset>`, optional
+        :type memory: :class:`Memory <netzob.Model.Vocabulary.Domain.Variables.Memory.Memory>`, optional
+        :return: For each message, a tuple made of the structure of the
+                 parsed data (None if the abstraction failed) and the
+                 exception :meth:`abstract` would have raised (None if
+                 the abstraction succeeded).
+        :rtype: a generator of :class:`tuple`
+
+        >>> from netzob.all import *
+        >>> f1 = Field(name="cmd", domain=Alt(["GET", "PUT"]))
+        >>> f2 = Field(name="sep", domain=" ")
+        >>> f3 = Field(name="arg", domain=String(nbChars=(1, 8)))
+        >>> s = Symbol([f1, f2, f3], name="Symbol-cmd")
+        >>> messages = [b"GET foo", b"PUT bar", b"DEL baz", RawMessage(b"GET baz")]
+        >>> for (structure, error) in s.abstract_many(messages):
+        ...     print(structure if error is None else type(error).__name__)
+        OrderedDict([('cmd', b'GET'), ('sep', b' '), ('arg', b'foo')])
+        OrderedDict([('cmd', b'PUT'), ('sep', b' '), ('arg', b'bar')])
+        AbstractionException
+        OrderedDict([('cmd', b'GET'), ('sep', b' '), ('arg', b'baz')])
+
+        """
+
+        from netzob.Model.Vocabulary.Domain.Parser.MessageParser import MessageParser
+        from netzob.Model.Vocabulary.Domain.Variables.Memory import Memory
+        from netzob.Model.Vocabulary.Messages.AbstractMessage import AbstractMessage
+
+        messageParser = MessageParser(memory=memory)
+        parsingPlan = messageParser.compile(self)
+
+        for data in messages:
+            if isinstance(data, AbstractMessage):
+                data = data.data
+            if memory is None:
+                # Same as abstract(): each message has its own memory
+                messageParser.memory = Memory()
+            try:
+                if isinstance(data, bytes) and len(data) > 0:
+                    # Converts the data without going through the TypeConverter
+                    bitArrayToParse = bitarray(endian='big')
+                    bitArrayToParse.frombytes(data)
+                    data_structure = self._abstractWithPlan(data, messageParser, parsingPlan, preset=preset,
+                                                            bitArrayToParse=bitArrayToParse)
+                else:
+                    data_structure = self._abstractWithPlan(data, messageParser, parsingPlan, preset=preset)
+                yield (data_structure, None)
+            except Exception as e:
+                yield (None, e)
+
+    def _abstractWithPlan(self, data, messageParser, parsingPlan, preset=None, bitArrayToParse=None):
+        """Abstracts the data with the parsing plan of the current field
+        (see :meth:`abstract`). The data can also be provided already
+        converted in a bitarray."""
+
+        from netzob.Model.Vocabulary.Domain.Parser.MessageParser import InvalidParsingPathException
 
         try:
             # Try to align/parse the data with the current field
-            messageParser = MessageParser(memory=memory)
-            alignedData = next(messageParser.parseRaw(data, self.getLeafFields()))
+            if bitArrayToParse is None:
+                alignedData = next(messageParser.parseRaw(data, parsingPlan))
+            else:
+                alignedData = next(messageParser.parseBitarray(bitArrayToParse, parsingPlan))
 
             # If it matches, we build a dict that contains, for each field, the associated value that was present in the message
             data_structure = OrderedDict()
-            for idx, field in enumerate(self.getLeafFields()):
-                data_structure[field.name] = alignedData[idx].tobytes()
+            for (field, value) in zip(parsingPlan.fields, alignedData):
+                data_structure[field.name] = value.tobytes()
 
             # Check that parsed data are coherent with the given preset configuration
             is_preset_ok = True
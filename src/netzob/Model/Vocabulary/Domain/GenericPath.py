@@ -35,6 +35,7 @@
 # +---------------------------------------------------------------------------+
 # | Standard library imports                                                  |
 # +---------------------------------------------------------------------------+
+import logging
 
 # +---------------------------------------------------------------------------+
 # | related third party imports                                               |
@@ -52,6 +53,28 @@ class GenericPath(object):
     """This class allows access to variables data during both abstraction
     and specialization.
 
+    The data assigned to variables and the registered callbacks are
+    shared between a path and its copies (see :meth:`_shareWith`). The
+    shared containers are copied (without copying the data they
+    contain) only when one of the paths modifies them, so that a copy
+    only costs the variables it actually changes.
+
+    >>> from netzob.all import *
+    >>> from netzob.Model.Vocabulary.Domain.Specializer.SpecializingPath import SpecializingPath
+    >>> v1 = Data(dataType=String(nbChars=(5, 10)), name="v1")
+    >>> v2 = Data(dataType=String(nbChars=(5, 10)), name="v2")
+    >>> path = SpecializingPath(memory=Memory())
+    >>> path.assignData(String("john").value, v1)
+    >>> path2 = path.copy()
+    >>> path2.getData(v1) is path.getData(v1)
+    True
+    >>> path2.assignData(String("kurt").value, v2)
+    >>> path.hasData(v2), path2.hasData(v2)
+    (False, True)
+    >>> path2.removeData(v1)
+    >>> path.hasData(v1), path2.hasData(v1)
+    (True, False)
+
     """
 
     def __init__(self,
@@ -72,6 +95,10 @@ class GenericPath(object):
         else:
             self._dataAssignedToVariable = dataAssignedToVariable
 
+        # Tells if the containers are shared with another path (copy-on-write)
+        self._dataAssignedToVariableShared = False
+        self._variablesCallbacksShared = False
+
         self._current_callbacks_operation = []
 
         # List of inaccessible variables during specialization, due to preseting a parent variable
@@ -81,6 +108,30 @@ class GenericPath(object):
     def __str__(self):
         return "Path({})".format(str(id(self)))
 
+    def _shareWith(self, path):
+        """Shares the assigned data and the callbacks of the current path
+        with the specified path (usually, a copy of the current one).
+        Both paths will copy the shared containers on their first
+        modification."""
+
+        path._dataAssignedToVariable = self._dataAssignedToVariable
+        path._variablesCallbacks = self._variablesCallbacks
+        path._dataAssignedToVariableShared = self._dataAssignedToVariableShared = True
+        path._variablesCallbacksShared = self._variablesCallbacksShared = True
+        return path
+
+    def _ownDataAssignedToVariable(self):
+        if self._dataAssignedToVariableShared:
+            self._dataAssignedToVariable = dict(self._dataAssignedToVariable)
+            self._dataAssignedToVariableShared = False
+        return self._dataAssignedToVariable
+
+    def _ownVariablesCallbacks(self):
+        if self._variablesCallbacksShared:
+            self._variablesCallbacks = list(self._variablesCallbacks)
+            self._variablesCallbacksShared = False
+        return self._variablesCallbacks
+
     def addResult(self, variable, result, notify=True):
         """
         This method can be used to register the bitarray obtained after having parsed a variable.
@@ -196,25 +247,25 @@ class GenericPath(object):
         # if variable in self._dataAssignedToVariable:
         #     self._logger.debug("Replacing '{}' by '{}' for variable '{}'".format(self._dataAssignedToVariable[variable].tobytes(), data.tobytes(), variable))
 
-        self._dataAssignedToVariable[variable] = data
+        self._ownDataAssignedToVariable()[variable] = data
 
     def removeData(self, variable):
-        self._logger.debug("Remove assigned data to variable: {}".format(variable))
+        self._logger.debug("Remove assigned data to variable: {}", variable)
         if variable is None:
             raise Exception("Variable cannot be None")
 
         if variable in self._dataAssignedToVariable:
-            del self._dataAssignedToVariable[variable]
+            del self._ownDataAssignedToVariable()[variable]
 
     def removeDataRecursively(self, variable):
         from netzob.Model.Vocabulary.Domain.Variables.Nodes.Agg import SELF
 
-        self._logger.debug("Remove assigned data to variable (and its children): {}".format(variable))
+        self._logger.debug("Remove assigned data to variable (and its children): {}", variable)
         if variable is None:
             raise Exception("Variable cannot be None")
 
         if variable in self._dataAssignedToVariable:
-            del self._dataAssignedToVariable[variable]
+            del self._ownDataAssignedToVariable()[variable]
 
         if self.memory is not None and self.memory.hasValue(variable):
             self.memory.forget(variable)
@@ -230,7 +281,7 @@ class GenericPath(object):
     def setInaccessibleVariableRecursively(self, variable):
         from netzob.Model.Vocabulary.Domain.Variables.Nodes.Agg import SELF
 
-        self._logger.debug("Set the variable (and its children) inaccessible: {}".format(variable))
+        self._logger.debug("Set the variable (and its children) inaccessible: {}", variable)
         if variable is None:
             raise Exception("Variable cannot be None")
 
@@ -267,7 +318,7 @@ class GenericPath(object):
 
         newCB = (targetVariables, currentVariable, parsingCB)
         if newCB not in self._variablesCallbacks:
-            self._variablesCallbacks.append(newCB)
+            self._ownVariablesCallbacks().append(newCB)
         else:
             self._logger.debug("Callback already registered")
 
@@ -283,7 +334,7 @@ class GenericPath(object):
         callbacks_to_execute = []
         potentialCallback = None
         tested_callbacks = []
-        self._logger.debug("Number of callbacks to analyze: {}".format(len(self._variablesCallbacks)))
+        self._logger.debug("Number of callbacks to analyze: {}", len(self._variablesCallbacks))
 
         for potentialCallback in self._variablesCallbacks:
             self._logger.debug("Testing a new callback")
@@ -318,7 +369,7 @@ class GenericPath(object):
                     found = True
                     break
             if found:
-                self._logger.debug("Found a callback on '{}' that should be able to be computed due to triggering variable '{}' from field '{}'".format(currentVariable, triggeringVariable, triggeringVariable.field))
+                self._logger.debug("Found a callback on '{}' that should be able to be computed due to triggering variable '{}' from field '{}'", currentVariable, triggeringVariable, triggeringVariable.field)
                 #break
             else:
 
@@ -343,7 +394,7 @@ class GenericPath(object):
                         potentialCallback = None
                         continue
                     else:
-                        self._logger.debug("Found a callback on '{}' that should be able to be computed due to indirect triggering variable '{}' from field '{}'".format(currentVariable, triggeringVariable, triggeringVariable.field))
+                        self._logger.debug("Found a callback on '{}' that should be able to be computed due to indirect triggering variable '{}' from field '{}'", currentVariable, triggeringVariable, triggeringVariable.field)
                 else:
                     self._logger.debug("Callback not concerned by the triggering variable")
                     potentialCallback = None
@@ -406,14 +457,17 @@ class GenericPath(object):
         remove_cb_cond = self.hasResult(currentVariable)
         remove_cb_cond &= isinstance(currentVariable, (Data, Repeat))
         if remove_cb_cond and callBackToExecute in self._variablesCallbacks:
-            self._variablesCallbacks.remove(callBackToExecute)
+            self._ownVariablesCallbacks().remove(callBackToExecute)
 
         return (True, resultingPaths)
 
     def show(self):
-        self._logger.debug("Variables registered for genericPath: '{}':".format(self))
-        for (var, val) in self._dataAssignedToVariable.items():
-            self._logger.debug("  [+] Variable: '{}' (id={}), with value: '{}', is linked to field '{}'".format(var, id(var), val.tobytes(), var.field))
+        if not self._logger.isEnabledFor(logging.DEBUG):
+            return
+        self._logger.debug("Variables registered for genericPath: '{}':", self)
+        for var in self._dataAssignedToVariable:
+            self._logger.debug("  [+] Variable: '{}' (id={}), with value: '{}', is linked to field '{}'",
+                               var, id(var), self.getData(var).tobytes(), var.field)
 
     @property
     def name(self):
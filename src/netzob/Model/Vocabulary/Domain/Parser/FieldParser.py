@@ -34,6 +34,7 @@
 #+---------------------------------------------------------------------------+
 #| Standard library imports                                                  |
 #+---------------------------------------------------------------------------+
+import logging
 
 #+---------------------------------------------------------------------------+
 #| Related third party imports                                               |
@@ -198,14 +199,10 @@ class FieldParser():
                 "No definition domain specified for field '{0}', cannnot parse the content against it.".
                 format(self.field.name))
 
-        # check we have something to parse
-        data = parsingPath.getData(self.field.domain)
-
-        self._logger.debug("Parse '{}' with field '{}' specifications".
-                           format(data.tobytes(), self.field.name))
-
-        # we assign this data to the field's variable
-        parsingPath.assignData(data.copy(), self.field.domain)
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("Parse '{}' with field '{}' specifications",
+                               parsingPath.getData(domain).tobytes(),
+                               self.field.name)
 
         # we create a first VariableParser and uses it to parse the domain
         variableParser = VariableParser(domain)
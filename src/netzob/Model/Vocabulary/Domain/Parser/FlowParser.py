@@ -35,6 +35,7 @@
 # +---------------------------------------------------------------------------+
 # | Standard library imports                                                  |
 # +---------------------------------------------------------------------------+
+import logging
 
 # +---------------------------------------------------------------------------+
 # | Related third party imports                                               |
@@ -51,6 +52,7 @@ from netzob.Model.Vocabulary.Types.TypeConverter import TypeConverter
 from netzob.Model.Vocabulary.Types.BitArray import BitArray
 from netzob.Model.Vocabulary.Types.Raw import Raw
 from netzob.Model.Vocabulary.Domain.Parser.FieldParser import FieldParser
+from netzob.Model.Vocabulary.Domain.Parser.SymbolIndex import SymbolIndex
 from netzob.Model.Vocabulary.Types.AbstractType import AbstractType, UnitSize
 
 @NetzobLogger
@@ -168,6 +170,7 @@ class FlowParser(object):
             self.memory = Memory()
         else:
             self.memory = memory
+        self.__symbolIndex = None
 
     @typeCheck(AbstractMessage, list)
     def parseFlow(self, message, symbols):
@@ -186,23 +189,33 @@ class FlowParser(object):
         data_to_parse_raw = message.data
         data_to_parse_bitarray = TypeConverter.convert(data_to_parse_raw, Raw, BitArray).copy()
 
-        for result in self._parseFlow_internal(data_to_parse_bitarray, symbols, self.memory):
+        # The index of the symbols is rebuilt when the list of symbols changes
+        if self.__symbolIndex is None or not self.__symbolIndex.isUpToDate(symbols):
+            self.__symbolIndex = SymbolIndex(symbols)
+
+        for result in self._parseFlow_internal(data_to_parse_bitarray, self.__symbolIndex, self.memory):
             return result
 
         raise InvalidParsingPathException("No parsing path returned while parsing '{}'".format(repr(data_to_parse_raw)))
 
-    def _parseFlow_internal(self, data_to_parse_bitarray, symbols, memory):
-        """Parses the specified data"""
+    def _parseFlow_internal(self, data_to_parse_bitarray, symbolIndex, memory):
+        """Parses the specified data with the symbols of the specified
+        :class:`SymbolIndex <netzob.Model.Vocabulary.Domain.Parser.SymbolIndex.SymbolIndex>`."""
 
         if data_to_parse_bitarray is None or len(data_to_parse_bitarray) == 0:
             raise Exception("Nothing to parse")
 
-        for symbol in symbols:
-            self._logger.debug("Parsing '{}' with Symbol '{}'".format(data_to_parse_bitarray.tobytes(), symbol.name))
+        for symbol in symbolIndex.candidates(data_to_parse_bitarray, memory, must_consume_everything=False):
+            if self._logger.isEnabledFor(logging.DEBUG):
+                self._logger.debug("Parsing '{}' with Symbol '{}'", data_to_parse_bitarray.tobytes(), symbol.name)
             flow_parsing_results = []
             try:
                 mp = MessageParser(memory=memory)
-                results = mp.parseBitarray(data_to_parse_bitarray.copy(), symbol.getLeafFields(), must_consume_everything=False)
+                # The parsing plan compiled by the index is reused
+                fields = symbolIndex.getPlan(symbol)
+                if fields is None:
+                    fields = symbol.getLeafFields()
+                results = mp.parseBitarray(data_to_parse_bitarray, fields, must_consume_everything=False)
 
                 for parse_result in results:
                     parse_result_len = sum([len(value) for value in parse_result])
@@ -210,9 +223,10 @@ class FlowParser(object):
                     remainings_bitarray = data_to_parse_bitarray[parse_result_len:]
 
                     if len(remainings_bitarray) > 0:
-                        self._logger.debug("Try to parse the remaining data '{}' with another symbol".format(remainings_bitarray.tobytes()))
+                        if self._logger.isEnabledFor(logging.DEBUG):
+                            self._logger.debug("Try to parse the remaining data '{}' with another symbol", remainings_bitarray.tobytes())
                         try:
-                            child_flow_parsings = self._parseFlow_internal(remainings_bitarray, symbols, memory.copy())
+                            child_flow_parsings = self._parseFlow_internal(remainings_bitarray, symbolIndex, memory.copy())
                             for child_flow_parsing in child_flow_parsings:
                                 flow_parsing_results = [(symbol, parse_result)] + child_flow_parsing
 
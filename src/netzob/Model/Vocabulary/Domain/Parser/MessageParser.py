@@ -35,6 +35,7 @@
 # +---------------------------------------------------------------------------+
 # | Standard library imports                                                  |
 # +---------------------------------------------------------------------------+
+import logging
 from bitarray import bitarray
 
 # +---------------------------------------------------------------------------+
@@ -45,7 +46,7 @@ from netzob.Model.Vocabulary.Domain.Variables.Memory import Memory
 from netzob.Model.Vocabulary.Messages.AbstractMessage import AbstractMessage
 from netzob.Model.Vocabulary.Symbol import Symbol
 from netzob.Model.Vocabulary.Domain.Parser.ParsingPath import ParsingPath
-from netzob.Model.Vocabulary.Domain.Variables.Leafs.AbstractRelationVariableLeaf import AbstractRelationVariableLeaf
+from netzob.Model.Vocabulary.Domain.Parser.ParsingPlan import ParsingPlan
 from netzob.Model.Vocabulary.Types.TypeConverter import TypeConverter
 from netzob.Model.Vocabulary.Types.BitArray import BitArray
 from netzob.Model.Vocabulary.Types.Raw import Raw
@@ -160,6 +161,25 @@ class MessageParser(object):
     >>> print(mp.parseMessage(msg3, s3))
     [bitarray('01101010011011110110100001101110'), bitarray('0010000000111110001000000110100001100101011011000110110001101111')]
 
+    # Let's compile a parsing plan once, and reuse it for each message
+
+    >>> f1 = Field(b"\\x01", name="F1")
+    >>> f2 = Field(Integer(unitSize=UnitSize.SIZE_16), name="F2")
+    >>> f3 = Field(Raw(nbBytes=2), name="F3")
+    >>> s = Symbol(fields=[f1, f2, f3])
+    >>> plan = MessageParser.compile(s)
+    >>> print(plan)
+    ParsingPlan (3 fields, fixedLayout=True)
+    >>> mp = MessageParser()
+    >>> for data in [b"\\x01\\x00\\x0a\\xaa\\xbb", b"\\x01\\x00\\x0b\\xcc\\xdd"]:
+    ...     print(next(mp.parseRaw(data, plan)))
+    [bitarray('00000001'), bitarray('0000000000001010'), bitarray('1010101010111011')]
+    [bitarray('00000001'), bitarray('0000000000001011'), bitarray('1100110011011101')]
+    >>> next(mp.parseRaw(b"\\x02\\x00\\x0a\\xaa\\xbb", plan))
+    Traceback (most recent call last):
+    ...
+    netzob.Model.Vocabulary.Domain.Parser.MessageParser.InvalidParsingPathException: No parsing path returned while parsing 'b'\\x02\\x00\\n\\xaa\\xbb''
+
     """
 
     def __init__(self, memory=None):
@@ -184,9 +204,31 @@ class MessageParser(object):
 
         return next(self.parseRaw(dataToParse, fields))
 
+    @staticmethod
+    def compile(field, depth=None):
+        """This method compiles the parsing plan of the leaf fields of the
+        specified symbol (or field). The plan can then be given, in place
+        of the list of fields, to :meth:`parseRaw` or
+        :meth:`parseBitarray` to parse each message without recomputing
+        the fields properties.
+
+        :param field: the symbol or field to compile
+        :param depth: maximum field depth to consider
+        :type field: :class:`AbstractField <netzob.Model.Vocabulary.AbstractField.AbstractField>`
+        :type depth: :class:`int`
+        :rtype: :class:`ParsingPlan <netzob.Model.Vocabulary.Domain.Parser.ParsingPlan.ParsingPlan>`
+        """
+        if field is None:
+            raise Exception("Specified field is None")
+
+        return ParsingPlan(field.getLeafFields(depth=depth))
+
     @typeCheck(object)
     def parseRaw(self, dataToParse, fields):
-        """This method parses the specified raw against the specification of the provided symbol."""
+        """This method parses the specified raw against the specification of the provided symbol.
+
+        The fields can either be a list of leaf fields or a compiled
+        :class:`ParsingPlan <netzob.Model.Vocabulary.Domain.Parser.ParsingPlan.ParsingPlan>`."""
         if dataToParse is None or len(dataToParse) <= 0:
             raise Exception("Specified data to parse is empty (or None)")
         if fields is None:
@@ -206,21 +248,45 @@ class MessageParser(object):
         the specified fields.
 
         It returns an iterator over all the valid parsing path that can be found.
-        
-        """
 
-        self._logger.debug("New parsing method executed on '{}'".format(bitArrayToParse.tobytes()))
+        The fields can either be a list of leaf fields or a compiled
+        :class:`ParsingPlan <netzob.Model.Vocabulary.Domain.Parser.ParsingPlan.ParsingPlan>`.
+        """
 
-        # We normalize the variables
-        for field in fields:
-            if field.domain is not None and isinstance(field.domain, AbstractRelationVariableLeaf):
-                self._logger.debug("Normalize field targets for field '{}'".format(field.name))
-                field.domain.normalize_targets()
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("New parsing method executed on '{}'", bitArrayToParse.tobytes())
 
-        # building a new parsing path
-        currentParsingPath = ParsingPath(bitArrayToParse.copy(),
-                                         self.memory)
-        currentParsingPath.assignData(bitArrayToParse.copy(), fields[0].domain)
+        # We compile the fields (this normalizes the relation variables)
+        if isinstance(fields, ParsingPlan):
+            plan = fields
+        else:
+            plan = ParsingPlan(fields)
+        fields = plan.fields
+
+        followingValues = None
+        if plan.isApplicable(self.memory):
+            # Fast rejection of data that cannot be consumed by the fields
+            fixedValues = None
+            if plan.acceptsBitSize(len(bitArrayToParse), must_consume_everything):
+                fixedValues = plan.checkFixedSlices(bitArrayToParse)
+            if fixedValues is None:
+                raise InvalidParsingPathException(
+                    "No parsing path returned while parsing '{}'".format(
+                        TypeConverter.convert(bitArrayToParse, BitArray, Raw)))
+
+            # Fixed layout: the fields values are the slices at their offsets
+            if plan.isFixedLayout:
+                yield fixedValues
+                return
+
+            # Static values of the next fields, used to prune the candidate sizes
+            followingValues = plan.followingValues
+
+        # building a new parsing path: the data to parse is copied once, and
+        # then shared (never modified) by all the parsing paths
+        dataToParse = bitArrayToParse.copy()
+        currentParsingPath = ParsingPath(dataToParse, self.memory, followingValues=followingValues)
+        currentParsingPath.assignDataToParse(dataToParse, 0, fields[0].domain)
 
         # field iterator
         i_current_field = 0
@@ -234,9 +300,8 @@ class MessageParser(object):
         has_result = False
         for parsingResult in parsingResults:
             if parsingResult.ok is False:
-                self._logger.debug("Parsing status: {}".format(parsingResult.ok))
-                msg = "The parsed data do not match with the field '{}'".format(field.name)
-                self._logger.debug(msg)
+                self._logger.debug("Parsing status: {}", parsingResult.ok)
+                self._logger.debug("The parsed data do not match with the field '{}'", fields[-1].name)
                 continue
 
             result = []
@@ -246,15 +311,14 @@ class MessageParser(object):
                     field_data = parsingResult.getData(field.domain)
                     result.append(field_data)
                 else:
-                    msg = "The parsed data do not match with the field '{}'".format(field.name)
-                    self._logger.debug(msg)
+                    self._logger.debug("The parsed data do not match with the field '{}'", field.name)
                     field_data_missing = True
                     break
             if field_data_missing:
                 continue
 
             # We update the internal memory
-            self.memory.memory = parsingResult.memory.memory
+            self.memory.restore(parsingResult.memory.save())
 
             has_result = True
             yield result
@@ -268,10 +332,14 @@ class MessageParser(object):
                                 parsingPath,
                                 fields,
                                 i_current_field,
-                                must_consume_everything=True):
+                                must_consume_everything=True,
+                                offset=0):
+        """Parses the data assigned to the current field, which starts at
+        the specified offset (in bits) of the original data to parse."""
+
         self._logger.debug(
-            "_parseBitArrayWithField executed for field {} with path : {}".
-            format(fields[i_current_field], parsingPath))
+            "_parseBitArrayWithField executed for field {} with path : {}",
+            fields[i_current_field], parsingPath)
         currentField = fields[i_current_field]
 
         carnivorous_parsing = (i_current_field == len(fields) - 1)
@@ -279,8 +347,7 @@ class MessageParser(object):
             carnivorous_parsing = False
 
         fp = FieldParser(currentField, carnivorous_parsing)
-        value_before_parsing = parsingPath.getData(
-            currentField.domain).copy()
+        originalDataToParse = parsingPath.originalDataToParse
 
         for newParsingPath in fp.parse(parsingPath):
 
@@ -292,29 +359,26 @@ class MessageParser(object):
                     self._logger.debug(msg)
                     raise InvalidParsingPathException(msg)
 
-                remainingValue = value_before_parsing[len(
-                    value_after_parsing):].copy()
+                # The remaining data is located after the parsed value
+                next_offset = offset + len(value_after_parsing)
 
                 # All the fields except the last one
                 if i_current_field < len(fields) - 1:
-                    newParsingPath.assignData(
-                        remainingValue, fields[i_current_field + 1].domain)
-
-                    if must_consume_everything is False:
-                        generator = self._parseBitArrayWithField(
-                            newParsingPath,
-                            fields,
-                            i_current_field + 1,
-                            must_consume_everything=False)
-                    else:
-                        generator = self._parseBitArrayWithField(
-                            newParsingPath, fields, i_current_field + 1)
+                    newParsingPath.assignDataToParse(
+                        originalDataToParse, next_offset, fields[i_current_field + 1].domain)
+
+                    generator = self._parseBitArrayWithField(
+                        newParsingPath,
+                        fields,
+                        i_current_field + 1,
+                        must_consume_everything=must_consume_everything,
+                        offset=next_offset)
                     yield from generator
 
                 # When we are at the last field
-                elif not must_consume_everything and len(remainingValue) >= 0:
+                elif not must_consume_everything:
                     yield newParsingPath
-                elif len(remainingValue) == 0:
+                elif next_offset == len(originalDataToParse):
 
                     # Double check if everything has been parsed
                     final_parsing = bitarray()
@@ -328,8 +392,8 @@ class MessageParser(object):
                         yield newParsingPath
                     else:
                         self._logger.debug("The content has not been entirely parsed")
-                        self._logger.debug("Content to parse: '{}'".format(parsingPath.originalDataToParse))
-                        self._logger.debug("Content parsed:   '{}'".format(final_parsing))
+                        self._logger.debug("Content to parse: '{}'", parsingPath.originalDataToParse)
+                        self._logger.debug("Content parsed:   '{}'", final_parsing)
 
             except InvalidParsingPathException:
                 pass
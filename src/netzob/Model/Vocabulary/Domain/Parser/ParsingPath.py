@@ -61,35 +61,79 @@ class ParsingPath(GenericPath):
                  dataAssignedToVariable=None,
                  variablesCallbacks=None,
                  ok=None,
-                 parsedData=None):
+                 parsedData=None,
+                 followingValues=None):
         super(ParsingPath, self).__init__(
             memory,
             dataAssignedToVariable=dataAssignedToVariable,
             variablesCallbacks=variablesCallbacks)
-        self.originalDataToParse = dataToParse.copy()
+        # The original data is never modified, so it is shared between copies
+        self.originalDataToParse = dataToParse
         if ok is None:
             self.__ok = True
         else:
             self.__ok = ok
+        # Static values following some variables, provided by the parsing plan
+        if followingValues is None:
+            self.followingValues = {}
+        else:
+            self.followingValues = followingValues
 
     def __str__(self):
         return "ParsingPath ({}, ok={})".format(id(self), self.__ok)
 
     def copy(self):
-        dVariable = {}
-        for key, value in list(self._dataAssignedToVariable.items()):
-            dVariable[key] = value.copy()
-
-        fCall = [x for x in self._variablesCallbacks]
-
         result = ParsingPath(
             self.originalDataToParse,
             memory=self.memory,
-            dataAssignedToVariable=dVariable,
-            variablesCallbacks=fCall,
-            ok=self.ok)
-
-        return result
+            ok=self.ok,
+            followingValues=self.followingValues)
+
+        return self._shareWith(result)
+
+    def assignDataToParse(self, data, offset, variable):
+        """Assign to the specified variable the data to parse, which starts
+        at the specified offset (in bits) of data. The data is not copied
+        (it is shared by the parsing paths and must not be modified): the
+        variables only slice the values they try.
+
+        >>> from netzob.all import *
+        >>> v1 = Data(dataType=String(), name="v1")
+        >>> data = String("john;kurt").value
+        >>> path = ParsingPath(data, Memory())
+        >>> path.assignDataToParse(data, 40, v1)
+        >>> path.getDataToParse(v1)[1]
+        40
+        >>> path.getData(v1).tobytes()
+        b'kurt'
+
+        """
+
+        if data is None:
+            raise Exception("Data cannot be None")
+        if variable is None:
+            raise Exception("Variable cannot be None")
+
+        self._ownDataAssignedToVariable()[variable] = (data, offset)
+
+    def getDataToParse(self, variable):
+        """Return the data to parse by the specified variable and the offset
+        (in bits) where it starts in this data."""
+
+        data = super(ParsingPath, self).getData(variable)
+        if isinstance(data, tuple):
+            return data
+        return (data, 0)
+
+    def getData(self, variable):
+        """Return the data that is assigned to the specified variable. The
+        data to parse is only sliced when it is requested this way."""
+
+        data = super(ParsingPath, self).getData(variable)
+        if isinstance(data, tuple):
+            (data, offset) = data
+            return data[offset:]
+        return data
 
     @property
     def ok(self):
@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+
+# +---------------------------------------------------------------------------+
+# |          01001110 01100101 01110100 01111010 01101111 01100010            |
+# |                                                                           |
+# |               Netzob : Inferring communication protocols                  |
+# +---------------------------------------------------------------------------+
+# | Copyright (C) 2011-2017 Georges Bossert and Frédéric Guihéry              |
+# | This program is free software: you can redistribute it and/or modify      |
+# | it under the terms of the GNU General Public License as published by      |
+# | the Free Software Foundation, either version 3 of the License, or         |
+# | (at your option) any later version.                                       |
+# |                                                                           |
+# | This program is distributed in the hope that it will be useful,           |
+# | but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+# | MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+# | GNU General Public License for more details.                              |
+# |                                                                           |
+# | You should have received a copy of the GNU General Public License         |
+# | along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+# +---------------------------------------------------------------------------+
+# | @url      : http://www.netzob.org                                         |
+# | @contact  : contact@netzob.org                                            |
+# | @sponsors : Amossys, http://www.amossys.fr                                |
+# |             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+# |             ANSSI,   https://www.ssi.gouv.fr                              |
+# +---------------------------------------------------------------------------+
+# +---------------------------------------------------------------------------+
+# | File contributors :                                                       |
+# |       - Georges Bossert <georges.bossert (a) supelec.fr>                  |
+# |       - Frédéric Guihéry <frederic.guihery (a) amossys.fr>                |
+# +---------------------------------------------------------------------------+
+
+# +---------------------------------------------------------------------------+
+# | Standard library imports                                                  |
+# +---------------------------------------------------------------------------+
+
+# +---------------------------------------------------------------------------+
+# | Related third party imports                                               |
+# +---------------------------------------------------------------------------+
+
+# +---------------------------------------------------------------------------+
+# | Local application imports                                                 |
+# +---------------------------------------------------------------------------+
+from netzob.Common.Utils.Decorators import NetzobLogger
+from netzob.Model.Vocabulary.Domain.Variables.Scope import Scope
+from netzob.Model.Vocabulary.Domain.Variables.Leafs.Data import Data
+from netzob.Model.Vocabulary.Domain.Variables.Leafs.AbstractRelationVariableLeaf import AbstractRelationVariableLeaf
+from netzob.Model.Vocabulary.Domain.Variables.Leafs.Size import Size
+from netzob.Model.Vocabulary.Types.AbstractType import Sign
+from netzob.Model.Vocabulary.Types.Integer import Integer
+from netzob.Model.Vocabulary.Types.Raw import Raw
+
+
+@NetzobLogger
+class ParsingPlan(object):
+    """A parsing plan is the pre-compiled form of a list of leaf fields,
+    computed once and reused for every message parsed against those
+    fields.
+
+    For each field, the plan stores the bounds (in bits) of the data it
+    can consume, and whether the field is a *plain* field, i.e. a
+    :class:`Data <netzob.Model.Vocabulary.Domain.Variables.Leafs.Data.Data>`
+    with a fixed size and either a ``Scope.NONE`` (the slice is checked
+    against the type) or a ``Scope.CONSTANT`` (the slice is compared to
+    the constant value). Plain fields only accept one candidate length
+    and are independent from relationships, so they can be checked with
+    a single slice.
+
+    When all the fields are plain, the plan has a *fixed layout*: each
+    field is at a known offset and the message is parsed by slicing it
+    and checking each slice against its type, without any backtracking.
+    Otherwise, the plan is used to quickly reject messages whose size
+    cannot be consumed by the fields, or whose leading plain fields do
+    not match, before running the generic parser.
+
+    >>> from netzob.all import *
+    >>> from netzob.Model.Vocabulary.Domain.Parser.ParsingPlan import ParsingPlan
+    >>> f1 = Field(Integer(interval=(0, 10), unitSize=UnitSize.SIZE_8), name="f1")
+    >>> f2 = Field(String("hello"), name="f2")
+    >>> plan = ParsingPlan([f1, f2])
+    >>> plan.isFixedLayout
+    True
+    >>> plan.minBitSize, plan.maxBitSize
+    (48, 48)
+
+    >>> f3 = Field(String(nbChars=(1, 4)), name="f3")
+    >>> plan = ParsingPlan([f1, f2, f3])
+    >>> plan.isFixedLayout
+    False
+    >>> plan.minBitSize, plan.maxBitSize
+    (56, 80)
+    >>> plan.acceptsBitSize(64)
+    True
+    >>> plan.acceptsBitSize(88)
+    False
+    >>> plan.acceptsBitSize(88, must_consume_everything=False)
+    True
+
+    A constant value stored in the memory takes priority over the one
+    of the field definition, so the plan cannot be used in such case:
+
+    >>> memory = Memory()
+    >>> plan.isApplicable(memory)
+    True
+    >>> memory.memorize(f2.domain, String("hi").value)
+    >>> plan.isApplicable(memory)
+    False
+
+    The static value of a field is used as a hint to parse the
+    preceding field, as only the sizes followed by this value are
+    valid:
+
+    >>> f4 = Field(String(";"), name="f4")
+    >>> plan = ParsingPlan([f3, f4])
+    >>> plan.followingValues[f3.domain]
+    bitarray('00111011')
+
+    The constant values located at a fixed offset are also listed, as
+    they quickly discriminate the messages. Here, the offset of the
+    last field is known as the size field is 8 bits long:
+
+    >>> f5 = Field(Raw(nbBytes=(0, 10)), name="f5")
+    >>> f6 = Field(Size(f5), name="f6")
+    >>> plan = ParsingPlan([f6, f4, f5])
+    >>> plan.constantSlices
+    [(8, 16, bitarray('00111011'))]
+
+    .. warning:: A plan reflects the fields definition at compilation
+                 time. It must be compiled again if the fields (or their
+                 domains) are modified.
+
+    """
+
+    def __init__(self, fields):
+        if fields is None:
+            raise Exception("Specified fields is None")
+        if len(fields) == 0:
+            raise Exception("No field specified")
+
+        self.fields = list(fields)
+
+        # Relation variables at the root of the fields, with their
+        # targets normalized once for all the messages to parse
+        self.relationVariables = []
+        for field in self.fields:
+            if field.domain is not None and isinstance(field.domain, AbstractRelationVariableLeaf):
+                field.domain.normalize_targets()
+                self.relationVariables.append(field.domain)
+
+        # Constant variables, whose value may be overridden by the memory
+        self.constantVariables = [field.domain for field in self.fields
+                                  if isinstance(field.domain, Data) and field.domain.scope == Scope.CONSTANT]
+
+        # Bounds (in bits) of each field, and their offsets when known
+        self.bitSizeBounds = [self._computeBitSizeBounds(field) for field in self.fields]
+        self.plainFields = [self._isPlainField(field, bounds)
+                            for (field, bounds) in zip(self.fields, self.bitSizeBounds)]
+
+        self.minBitSize = sum(minSize for (minSize, _) in self.bitSizeBounds)
+        if any(maxSize is None for (_, maxSize) in self.bitSizeBounds):
+            self.maxBitSize = None
+        else:
+            self.maxBitSize = sum(maxSize for (_, maxSize) in self.bitSizeBounds)
+
+        # Offsets of the leading plain fields (all of them for a fixed layout)
+        self.fixedSlices = []
+        offset = 0
+        for (field, isPlain, (size, _)) in zip(self.fields, self.plainFields, self.bitSizeBounds):
+            if not isPlain:
+                break
+            self.fixedSlices.append((field, offset, offset + size))
+            offset += size
+
+        # How each leading plain field is checked: by comparing it to the
+        # constant value, by its type, or not at all if the type accepts
+        # any value of this size
+        self.__sliceChecks = []
+        for (field, start, end) in self.fixedSlices:
+            dataType = field.domain.dataType
+            if field.domain.scope == Scope.CONSTANT:
+                self.__sliceChecks.append((start, end, dataType.value, None))
+            # end == start : deals with 'optional' data
+            elif end == start or self._acceptsAnyValue(dataType, end - start):
+                self.__sliceChecks.append((start, end, None, None))
+            else:
+                self.__sliceChecks.append((start, end, None, dataType))
+
+        self.isFixedLayout = len(self.fixedSlices) == len(self.fields)
+
+        # Constant values at a fixed offset, i.e. only preceded by fields
+        # of fixed size (including relation fields such as a length)
+        self.constantSlices = []
+        offset = 0
+        for (field, (minSize, maxSize)) in zip(self.fields, self.bitSizeBounds):
+            if minSize != maxSize:
+                break
+            if field.domain in self.constantVariables and minSize > 0:
+                self.constantSlices.append((offset, offset + minSize, field.domain.dataType.value))
+            offset += minSize
+
+        # Static value of the next field, for each Data variable followed by
+        # a constant field (e.g. a delimiter): it prunes the sizes to try
+        self.followingValues = {}
+        for (field, nextField, isNextPlain) in zip(self.fields, self.fields[1:], self.plainFields[1:]):
+            if not isinstance(field.domain, Data) or not isNextPlain or nextField.domain.scope != Scope.CONSTANT:
+                continue
+            if len(nextField.domain.dataType.value) == 0:
+                continue
+            if field.domain in self.followingValues:
+                # The same variable is used in different fields
+                self.followingValues[field.domain] = None
+            else:
+                self.followingValues[field.domain] = nextField.domain.dataType.value
+
+    def __len__(self):
+        return len(self.fields)
+
+    def __str__(self):
+        return "ParsingPlan ({} fields, fixedLayout={})".format(len(self.fields), self.isFixedLayout)
+
+    @staticmethod
+    def _computeBitSizeBounds(field):
+        """Returns the (min, max) number of bits the field can consume
+        during parsing. The max value is None if it cannot be bounded."""
+
+        domain = field.domain
+
+        # Same size computation as AbstractRelationVariableLeaf.domainCMP(),
+        # the computed size value being encoded on this number of bits
+        if isinstance(domain, Size):
+            if isinstance(domain.dataType, Integer):
+                return (domain.dataType.unitSize.value, domain.dataType.unitSize.value)
+            (minSize, maxSize) = domain.dataType.size
+            if minSize is not None and minSize == maxSize:
+                return (minSize, maxSize)
+            return (0, None)
+
+        if not isinstance(domain, Data):
+            return (0, None)
+
+        # Same size computation as Data.valueCMP()
+        if domain.scope == Scope.CONSTANT:
+            if domain.dataType.value is None:
+                return (0, None)
+            return (len(domain.dataType.value), len(domain.dataType.value))
+
+        if domain.scope not in (Scope.NONE, Scope.MESSAGE):
+            return (0, None)
+
+        # Same size computation as Data.domainCMP() and Data.learn()
+        try:
+            minSize = maxSize = domain.getFixedBitSize()
+        except ValueError:
+            (minSize, maxSize) = domain.dataType.size
+            if minSize is None:
+                minSize = 0
+        return (minSize, maxSize)
+
+    @staticmethod
+    def _isPlainField(field, bounds):
+        (minSize, maxSize) = bounds
+        domain = field.domain
+        return isinstance(domain, Data) and domain.scope in (Scope.NONE, Scope.CONSTANT) and minSize == maxSize
+
+    @staticmethod
+    def _acceptsAnyValue(dataType, bitSize):
+        """Returns True if any data of the specified size can be parsed
+        with the data type, so that checking it can be skipped."""
+
+        if dataType.value is not None:
+            return False
+
+        # Same checks as Integer.canParse()
+        if isinstance(dataType, Integer):
+            if bitSize != dataType.unitSize.value:
+                return False
+            (minValue, maxValue) = dataType.size
+            if dataType.sign == Sign.UNSIGNED:
+                return minValue <= 0 and (1 << bitSize) - 1 <= maxValue
+            return minValue <= -(1 << (bitSize - 1)) and (1 << (bitSize - 1)) - 1 <= maxValue
+
+        # Same checks as Raw.canParse()
+        if isinstance(dataType, Raw):
+            if bitSize % 8 != 0 or dataType.alphabet is not None:
+                return False
+            (minBits, maxBits) = dataType.size
+            return (minBits is None or minBits <= bitSize) and (maxBits is None or bitSize <= maxBits)
+
+        return False
+
+    def isApplicable(self, memory):
+        """Returns False if the plan cannot be used with the specified
+        memory, because it overrides the value of a constant field."""
+
+        # An empty memory cannot override any value
+        if memory is None or len(memory) == 0:
+            return True
+        for variable in self.constantVariables:
+            if memory.hasValue(variable):
+                return False
+        return True
+
+    def acceptsBitSize(self, bitSize, must_consume_everything=True):
+        """Returns True if the fields can consume a message of
+        the specified size (in bits)."""
+
+        if bitSize < self.minBitSize:
+            return False
+        if must_consume_everything and self.maxBitSize is not None and bitSize > self.maxBitSize:
+            return False
+        return True
+
+    def checkFixedSlices(self, bitArrayToParse):
+        """Checks the data at the offsets of the leading plain fields.
+
+        It returns the list of the values of those fields, or None if
+        one of them cannot be parsed. The bitArrayToParse must be large
+        enough to contain all the leading plain fields (see
+        :meth:`acceptsBitSize`).
+
+        """
+
+        result = []
+        for (start, end, constantValue, dataType) in self.__sliceChecks:
+            value = bitArrayToParse[start:end]
+            if constantValue is not None:
+                if value != constantValue:
+                    return None
+            elif dataType is not None and not dataType.canParse(value):
+                return None
+            result.append(value)
+        return result
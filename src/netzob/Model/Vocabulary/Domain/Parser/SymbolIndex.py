@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+
+# +---------------------------------------------------------------------------+
+# |          01001110 01100101 01110100 01111010 01101111 01100010            |
+# |                                                                           |
+# |               Netzob : Inferring communication protocols                  |
+# +---------------------------------------------------------------------------+
+# | Copyright (C) 2011-2017 Georges Bossert and Frédéric Guihéry              |
+# | This program is free software: you can redistribute it and/or modify      |
+# | it under the terms of the GNU General Public License as published by      |
+# | the Free Software Foundation, either version 3 of the License, or         |
+# | (at your option) any later version.                                       |
+# |                                                                           |
+# | This program is distributed in the hope that it will be useful,           |
+# | but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+# | MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+# | GNU General Public License for more details.                              |
+# |                                                                           |
+# | You should have received a copy of the GNU General Public License         |
+# | along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+# +---------------------------------------------------------------------------+
+# | @url      : http://www.netzob.org                                         |
+# | @contact  : contact@netzob.org                                            |
+# | @sponsors : Amossys, http://www.amossys.fr                                |
+# |             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+# |             ANSSI,   https://www.ssi.gouv.fr                              |
+# +---------------------------------------------------------------------------+
+# +---------------------------------------------------------------------------+
+# | File contributors :                                                       |
+# |       - Georges Bossert <georges.bossert (a) supelec.fr>                  |
+# |       - Frédéric Guihéry <frederic.guihery (a) amossys.fr>                |
+# +---------------------------------------------------------------------------+
+
+# +---------------------------------------------------------------------------+
+# | Standard library imports                                                  |
+# +---------------------------------------------------------------------------+
+
+# +---------------------------------------------------------------------------+
+# | Related third party imports                                               |
+# +---------------------------------------------------------------------------+
+
+# +---------------------------------------------------------------------------+
+# | Local application imports                                                 |
+# +---------------------------------------------------------------------------+
+from netzob.Common.Utils.Decorators import NetzobLogger
+from netzob.Model.Vocabulary.Domain.Parser.ParsingPlan import ParsingPlan
+
+
+@NetzobLogger
+class SymbolIndex(object):
+    """A symbol index quickly selects, among a list of symbols, the ones
+    that may abstract a given message, so that the (costly) parsing is
+    only tried on a handful of symbols.
+
+    The index is a decision tree built over the constant values located
+    at a fixed offset in the symbols (see the ``constantSlices``
+    attribute of a :class:`ParsingPlan
+    <netzob.Model.Vocabulary.Domain.Parser.ParsingPlan.ParsingPlan>`).
+    Each node of the tree reads the bits of the message at an offset
+    shared by most of the remaining symbols, and follows the branch of
+    the symbols expecting those bits. The candidates are then filtered
+    according to the message size.
+
+    The candidates are returned in the order of the indexed symbols,
+    so the first symbol that successfully parses a message is the same
+    with or without the index.
+
+    >>> from netzob.all import *
+    >>> from netzob.Model.Vocabulary.Domain.Parser.SymbolIndex import SymbolIndex
+    >>> from netzob.Model.Vocabulary.Types.TypeConverter import TypeConverter
+    >>> s1 = Symbol([Field(b"\\x01"), Field(Raw(nbBytes=(1, 4)))], name="s1")
+    >>> s2 = Symbol([Field(b"\\x02"), Field(Raw(nbBytes=(1, 4)))], name="s2")
+    >>> s3 = Symbol([Field(Raw(nbBytes=1)), Field(b"\\x02")], name="s3")
+    >>> s4 = Symbol([Field(Raw(nbBytes=(1, 10)))], name="s4")
+    >>> index = SymbolIndex([s1, s2, s3, s4])
+    >>> index.candidates(TypeConverter.convert(b"\\x01\\x02", Raw, BitArray))
+    [s1, s3, s4]
+    >>> index.candidates(TypeConverter.convert(b"\\x02\\x03", Raw, BitArray))
+    [s2, s4]
+    >>> index.candidates(TypeConverter.convert(b"\\x03" * 8, Raw, BitArray))
+    [s4]
+
+    The size of the message is also checked, unless the message only
+    has to start with a symbol:
+
+    >>> index.candidates(TypeConverter.convert(b"\\x01" * 8, Raw, BitArray))
+    [s4]
+    >>> index.candidates(TypeConverter.convert(b"\\x01" * 8, Raw, BitArray), must_consume_everything=False)
+    [s1, s4]
+
+    A constant value stored in the memory takes priority over the one
+    of the symbol definition, so the related symbol is always a
+    candidate in such case:
+
+    >>> memory = Memory()
+    >>> memory.memorize(s2.fields[0].domain, TypeConverter.convert(b"\\x03", Raw, BitArray))
+    >>> index.candidates(TypeConverter.convert(b"\\x03\\x03", Raw, BitArray), memory)
+    [s2, s4]
+
+    The users of the index rebuild it when their list of symbols
+    changes:
+
+    >>> index.isUpToDate([s1, s2, s3, s4])
+    True
+    >>> index.isUpToDate([s1, s2, s3])
+    False
+
+    .. warning:: Like a parsing plan, the index reflects the symbols
+                 definition at build time. The :meth:`isUpToDate` method
+                 only detects changes in the list of symbols.
+
+    """
+
+    def __init__(self, symbols):
+        self.symbols = tuple(symbols)
+
+        # Parsing plan of each symbol (None if the symbol cannot be compiled)
+        self.plans = []
+        for symbol in self.symbols:
+            try:
+                self.plans.append(ParsingPlan(symbol.getLeafFields()))
+            except Exception as e:
+                self._logger.debug("Symbol '{}' cannot be indexed: {}".format(symbol.name, e))
+                self.plans.append(None)
+
+        # Symbols that must always be tried
+        self.__unindexed = [i for (i, plan) in enumerate(self.plans) if plan is None]
+
+        # Constant variables, whose value may be overridden by the memory
+        self.__constantVariables = {}
+        for (i, plan) in enumerate(self.plans):
+            if plan is not None:
+                for variable in plan.constantVariables:
+                    self.__constantVariables.setdefault(variable, []).append(i)
+
+        self.__plansBySymbol = dict((id(symbol), plan) for (symbol, plan) in zip(self.symbols, self.plans))
+
+        entries = [(i, list(plan.constantSlices)) for (i, plan) in enumerate(self.plans) if plan is not None]
+        self.__tree = self.__buildNode(entries)
+
+    def __str__(self):
+        return "SymbolIndex ({} symbols)".format(len(self.symbols))
+
+    def isUpToDate(self, symbols):
+        """Returns True if the index was built for the specified list of
+        symbols (same symbols, in the same order)."""
+
+        if len(symbols) != len(self.symbols):
+            return False
+        for (symbol, indexedSymbol) in zip(symbols, self.symbols):
+            if symbol is not indexedSymbol:
+                return False
+        return True
+
+    def getPlan(self, symbol):
+        """Returns the parsing plan of an indexed symbol (None if it
+        cannot be compiled)."""
+
+        return self.__plansBySymbol[id(symbol)]
+
+    def candidates(self, bitArrayToParse, memory=None, must_consume_everything=True):
+        """Returns the symbols that may abstract the specified data, in
+        the order of the indexed symbols.
+
+        :param bitArrayToParse: The data to abstract.
+        :param memory: The memory used to parse the data.
+        :param must_consume_everything: False if the data only has to
+                                        start with a symbol.
+        :type bitArrayToParse: :class:`bitarray <bitarray.bitarray>`, required
+        :type memory: :class:`Memory <netzob.Model.Vocabulary.Domain.Variables.Memory.Memory>`, optional
+        :type must_consume_everything: :class:`bool`, optional
+        :rtype: a :class:`list` of :class:`Symbol <netzob.Model.Vocabulary.Symbol.Symbol>`
+        """
+
+        # Walk down the tree
+        node = self.__tree
+        while not isinstance(node, frozenset):
+            (start, end, branches, default) = node
+            if len(bitArrayToParse) >= end:
+                node = branches.get(bitArrayToParse[start:end].tobytes(), default)
+            else:
+                node = default
+
+        bitSize = len(bitArrayToParse)
+        selected = set(i for i in node if self.plans[i].acceptsBitSize(bitSize, must_consume_everything))
+        selected.update(self.__unindexed)
+
+        # Symbols whose constant values are overridden by the memory
+        if memory is not None:
+            for (variable, indexes) in self.__constantVariables.items():
+                if memory.hasValue(variable):
+                    selected.update(indexes)
+
+        return [self.symbols[i] for i in sorted(selected)]
+
+    @staticmethod
+    def __buildNode(entries):
+        """Builds the node of the tree for the specified entries. An entry
+        is a symbol position along with its remaining constant slices.
+
+        A leaf is the set of the symbols positions. Other nodes are
+        tuples (start, end, branches, default), where branches maps the
+        value of the bits [start:end] to a node, and default is the node
+        of the symbols that do not constrain these bits.
+        """
+
+        # The most shared bit range, preferring the longest ones
+        coverage = {}
+        for (_, slices) in entries:
+            for (start, end, _) in slices:
+                coverage[(start, end)] = 0
+        if len(coverage) == 0:
+            return frozenset(i for (i, _) in entries)
+        for (start, end) in coverage:
+            for (_, slices) in entries:
+                if SymbolIndex.__findSlice(slices, start, end) is not None:
+                    coverage[(start, end)] += 1
+        (start, end) = max(coverage, key=lambda bounds: (coverage[bounds], bounds[1] - bounds[0], -bounds[0]))
+
+        matched = {}
+        unconstrained = []
+        for (i, slices) in entries:
+            found = SymbolIndex.__findSlice(slices, start, end)
+            if found is None:
+                unconstrained.append((i, slices))
+                continue
+            (sliceStart, sliceEnd, value) = found
+            key = value[start - sliceStart:end - sliceStart].tobytes()
+
+            # Keep the bits of the slice that are not read by this node
+            remaining = [s for s in slices if s is not found]
+            if sliceStart < start:
+                remaining.append((sliceStart, start, value[:start - sliceStart]))
+            if end < sliceEnd:
+                remaining.append((end, sliceEnd, value[end - sliceStart:]))
+            matched.setdefault(key, []).append((i, remaining))
+
+        # Each branch also contains the unconstrained symbols, in order
+        branches = {}
+        for (key, matchedEntries) in matched.items():
+            branchEntries = sorted(matchedEntries + unconstrained, key=lambda entry: entry[0])
+            branches[key] = SymbolIndex.__buildNode(branchEntries)
+
+        return (start, end, branches, SymbolIndex.__buildNode(unconstrained))
+
+    @staticmethod
+    def __findSlice(slices, start, end):
+        for constantSlice in slices:
+            if constantSlice[0] <= start and end <= constantSlice[1]:
+                return constantSlice
+        return None
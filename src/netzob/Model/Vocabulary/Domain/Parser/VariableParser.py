@@ -34,6 +34,7 @@
 #+---------------------------------------------------------------------------+
 #| Standard library imports                                                  |
 #+---------------------------------------------------------------------------+
+import logging
 
 #+---------------------------------------------------------------------------+
 #| Related third party imports                                               |
@@ -64,12 +65,13 @@ class VariableParser(object):
         if self.variable is None:
             raise Exception("Variable cannot be None")
 
-        dataToParse = parsingPath.getData(self.variable)
-        self._logger.debug("Parse '{}' with variable '{}' specifications".
-                           format(dataToParse.tobytes(), self.variable))
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("Parse '{}' with variable '{}' specifications",
+                               parsingPath.getData(self.variable).tobytes(),
+                               self.variable)
 
         try:
-            self._logger.debug("Parsing variable '{}' from field '{}'".format(self.variable.name, self.variable.field.name))
+            self._logger.debug("Parsing variable '{}' from field '{}'", self.variable.name, self.variable.field.name)
             paths = self.variable.parse(parsingPath, carnivorous=carnivorous)
         except ParsingException:
             return iter(())
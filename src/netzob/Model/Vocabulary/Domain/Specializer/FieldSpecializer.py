@@ -109,7 +109,7 @@ class FieldSpecializer(object):
     """
 
     def __init__(self, field, preset=None, memory=None):
-        self._logger.debug("Creating a new FieldSpecializer for field '{}'".format(field))
+        self._logger.debug("Creating a new FieldSpecializer for field '{}'", field)
 
         self.field = field
         self.preset = preset
@@ -121,7 +121,7 @@ class FieldSpecializer(object):
         if specializingPath is None:
             specializingPath = SpecializingPath(memory=self.memory)
 
-        self._logger.debug("Specialize field {0}".format(self.field.name))
+        self._logger.debug("Specialize field {0}", self.field.name)
 
         # We look at where to retrieve the data used for specializing the current field
         specializingPaths = []
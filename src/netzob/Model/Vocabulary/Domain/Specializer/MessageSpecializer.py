@@ -123,7 +123,7 @@ class MessageSpecializer(object):
         if symbol is None:
             raise Exception("Specified symbol is None")
 
-        self._logger.debug("Specifies symbol '{0}'.".format(symbol.name))
+        self._logger.debug("Specifies symbol '{0}'.", symbol.name)
 
         # This variable host all the specialization paths
         specializingPaths = [SpecializingPath(memory=self.memory)]
@@ -131,7 +131,7 @@ class MessageSpecializer(object):
         # First, we normalize the targets of relantionship variables
         for field in symbol.getLeafFields(includePseudoFields=True):
             if field.domain is not None and isinstance(field.domain, AbstractRelationVariableLeaf):
-                self._logger.debug("Normalize field targets for field '{}'".format(field.name))
+                self._logger.debug("Normalize field targets for field '{}'", field.name)
                 field.domain.normalize_targets()
 
         # Convert list into generator
@@ -143,7 +143,7 @@ class MessageSpecializer(object):
 
     def _inner_specialize(self, paths, fields, i_current_field, symbol):
 
-        self._logger.debug("Specializing field: '{}'".format(fields[i_current_field]))
+        self._logger.debug("Specializing field: '{}'", fields[i_current_field])
 
         field = fields[i_current_field]
 
@@ -60,24 +60,16 @@ class SpecializingPath(GenericPath):
             self.__ok = ok
 
     def copy(self):
-        dVariable = {}
-        for key, value in list(self._dataAssignedToVariable.items()):
-            dVariable[key] = value.copy()
-
-        fCall = [x for x in self._variablesCallbacks]
-
         if self.memory is not None:
             memory = self.memory
         else:
             memory = None
-            
+
         result = SpecializingPath(
             memory=memory,
-            dataAssignedToVariable=dVariable,
-            variablesCallbacks=fCall,
             ok=self.ok)
 
-        return result
+        return self._shareWith(result)
 
     @property
     def ok(self):
@@ -35,6 +35,7 @@
 #+---------------------------------------------------------------------------+
 #| Standard library imports                                                  |
 #+---------------------------------------------------------------------------+
+import logging
 import random
 import abc
 
@@ -192,11 +193,11 @@ class AbstractRelationVariableLeaf(AbstractVariableLeaf):
                 )
             expectedSize = maxValue
 
-        content = parsingPath.getData(self)
-        if content is None:
+        (data, offset) = parsingPath.getDataToParse(self)
+        if data is None:
             raise Exception("No data assigned.")
 
-        possibleValue = content[:expectedSize]
+        possibleValue = data[offset:offset + expectedSize]
         self._logger.debug("Possible value of relation field: {0}".
                            format(possibleValue))
 
@@ -239,8 +240,7 @@ class AbstractRelationVariableLeaf(AbstractVariableLeaf):
 
         results = []
         self._logger.debug(
-            "domainCMP executed on {0} by a relation domain".format(
-                parsingPath))
+            "domainCMP executed on {0} by a relation domain", parsingPath)
 
         if isinstance(self.dataType, Integer):
             expectedSize = self.dataType.unitSize.value
@@ -252,17 +252,20 @@ class AbstractRelationVariableLeaf(AbstractVariableLeaf):
                 )
             expectedSize = maxValue
 
-        content = parsingPath.getData(self)
-        if content is None:
+        (data, offset) = parsingPath.getDataToParse(self)
+        if data is None:
             raise Exception("No data assigned.")
 
-        possibleValue = content[:expectedSize]
+        possibleValue = data[offset:offset + expectedSize]
 
         expectedValue = None
         try:
             expectedValue = self.computeExpectedValue(parsingPath)
+            # Only the bits that may be compared with the expected value are sliced
+            content = data[offset:offset + max(expectedSize, len(expectedValue))]
             if self.compareValues(content, expectedSize, expectedValue):
-                self._logger.debug("The target variables contain the expected value '{}'".format(expectedValue.tobytes()))
+                if self._logger.isEnabledFor(logging.DEBUG):
+                    self._logger.debug("The target variables contain the expected value '{}'", expectedValue.tobytes())
                 parsingPath.ok &= True
                 parsingPath.addResult(self, content[:len(expectedValue)])
                 results.append(parsingPath)
@@ -274,12 +277,12 @@ class AbstractRelationVariableLeaf(AbstractVariableLeaf):
             else:
                 parsingPath.ok = False
         except Exception as e:
-            self._logger.debug("The expected value cannot be computed. Reason: '{}'".format(e))
+            self._logger.debug("The expected value cannot be computed. Reason: '{}'", e)
             if acceptCallBack:
                 # we add a callback
                 self._addCallBacksOnUndefinedVariables(parsingPath)
                 # register the remaining data
-                parsingPath.addResult(self, possibleValue.copy(), notify=False)
+                parsingPath.addResult(self, possibleValue, notify=False)
                 results.append(parsingPath)
 
         return results
@@ -293,7 +296,7 @@ class AbstractRelationVariableLeaf(AbstractVariableLeaf):
 
     @typeCheck(GenericPath)
     def computeExpectedValue(self, parsingPath, preset=None):
-        self._logger.debug("Compute expected value for relation variable '{}' from field '{}'".format(self, self.field))
+        self._logger.debug("Compute expected value for relation variable '{}' from field '{}'", self, self.field)
 
         # first checks the pointed variables all have a value
         hasValue = True
@@ -347,7 +350,8 @@ class AbstractRelationVariableLeaf(AbstractVariableLeaf):
         # Compute the relation result
         result = self.relationOperation(concatValues)
 
-        self._logger.debug("Computed value for relation variable: '{}'".format(result.tobytes()))
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("Computed value for relation variable: '{}'", result.tobytes())
         return result
 
     @typeCheck(SpecializingPath)
@@ -358,7 +362,7 @@ class AbstractRelationVariableLeaf(AbstractVariableLeaf):
         generated value that follows the definition of the Data
 
         """
-        self._logger.debug("Regenerate relation domain '{}' for field '{}'".format(self, self.field))
+        self._logger.debug("Regenerate relation domain '{}' for field '{}'", self, self.field)
         if variableSpecializerPath is None:
             raise Exception("VariableSpecializerPath cannot be None")
 
@@ -376,7 +380,7 @@ class AbstractRelationVariableLeaf(AbstractVariableLeaf):
                 raise Exception("Target value is not defined currently")
         except RelationDependencyException as e:
             self._logger.debug(
-                "Value not available in the relation dependencies: {}".format(e.current_target))
+                "Value not available in the relation dependencies: {}", e.current_target)
 
             if moreCallBackAccepted:
                 self._logger.debug("A callback function is created to be computed later")
@@ -388,8 +392,8 @@ class AbstractRelationVariableLeaf(AbstractVariableLeaf):
                 #         ancestor_node = parent
                 #     parent = parent.parent
 
-                self._logger.debug("Callback registered on ancestor node: '{}'".format(ancestor_node))
-                self._logger.debug("Callback registered due to absence of content in target: '{}'".format(e.current_target))
+                self._logger.debug("Callback registered on ancestor node: '{}'", ancestor_node)
+                self._logger.debug("Callback registered due to absence of content in target: '{}'", e.current_target)
                 variableSpecializerPath.registerVariablesCallBack(
                     [e.current_target], ancestor_node, parsingCB=False)
             else:
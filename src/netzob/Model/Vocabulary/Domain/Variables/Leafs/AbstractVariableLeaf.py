@@ -100,8 +100,8 @@ class AbstractVariableLeaf(AbstractVariable):
             else:
                 if self.scope == Scope.CONSTANT:
                     self._logger.debug(
-                        "Cannot parse '{0}' as scope is CONSTANT and no value is available.".
-                        format(self))
+                        "Cannot parse '{0}' as scope is CONSTANT and no value is available.",
+                        self)
                     return []
                 elif self.scope == Scope.MESSAGE or self.scope == Scope.SESSION:
                     return self.learn(
@@ -191,8 +191,8 @@ class AbstractVariableLeaf(AbstractVariable):
         else:
             if self.scope == Scope.CONSTANT:
                 self._logger.debug(
-                    "Cannot specialize '{0}' as scope is CONSTANT and no value is available.".
-                    format(self))
+                    "Cannot specialize '{0}' as scope is CONSTANT and no value is available.",
+                    self)
                 newParsingPaths = iter(())
             elif self.scope == Scope.MESSAGE or self.scope == Scope.SESSION:
                 newParsingPaths = self.regenerateAndMemorize(parsingPath, acceptCallBack, preset=preset, triggered=triggered)
@@ -34,6 +34,7 @@
 # +---------------------------------------------------------------------------+
 # | Standard library imports                                                  |
 # +---------------------------------------------------------------------------+
+import logging
 
 # +---------------------------------------------------------------------------+
 # | Related third party imports                                               |
@@ -149,11 +150,37 @@ class Data(AbstractVariableLeaf):
         if parsingPath is None:
             raise Exception("ParsingPath cannot be None")
 
-        content = parsingPath.getData(self)
-        actualSize = len(content)
+        (content, actualSize, minSize, maxSize) = self._getContent(parsingPath)
 
-        self._logger.debug("Learn '{}' with {} ({})".format(content.tobytes(),
-                                                            self.dataType, self.name))
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("Learn '{}' with {} ({})", content.tobytes(),
+                               self.dataType, self.name)
+
+        if actualSize < minSize:
+            self._logger.debug(
+                "Length of the content is too short ({0}), expect data of at least {1} bits",
+                actualSize, minSize)
+        else:
+            for size in self._candidateSizes(parsingPath, content, minSize, maxSize):
+                self._logger.debug("Try to parse {}/{} bits for variable '{}'", size, min(maxSize, actualSize), self.field)
+                value = content[:size]
+                # we create a new parsing path and returns it
+                newParsingPath = parsingPath.copy()
+                (addresult_succeed, addresult_parsingPaths) = newParsingPath.addResult(self, value)
+                if addresult_succeed:
+                    for addresult_parsingPath in addresult_parsingPaths:
+                        yield addresult_parsingPath
+                else:
+                    self._logger.debug("Parsed data does not respect a relation")
+
+    def _getContent(self, parsingPath):
+        """Returns the part of the data to parse that the variable may
+        consume (with the static value of the next field that may follow
+        it), the size of the data to parse, and the minimum and maximum
+        sizes of the variable. The rest of the data is not sliced."""
+
+        (data, offset) = parsingPath.getDataToParse(self)
+        actualSize = len(data) - offset
 
         try:
             minSize = maxSize = self.getFixedBitSize()
@@ -164,29 +191,35 @@ class Data(AbstractVariableLeaf):
             if maxSize is None:
                 maxSize = actualSize
 
-        if actualSize < minSize:
-            self._logger.debug(
-                "Length of the content is too short ({0}), expect data of at least {1} bits".
-                format(len(content), minSize))
+        end = offset + min(maxSize, actualSize)
+        followingValue = parsingPath.followingValues.get(self)
+        if followingValue is not None:
+            end += len(followingValue)
+        return (data[offset:end], actualSize, minSize, maxSize)
+
+    def _candidateSizes(self, parsingPath, content, minSize, maxSize):
+        """Returns the sizes (in bits) of the prefixes of content that can
+        be parsed with the data type, from the longest to the shortest.
+
+        The static value of the next field, when provided by the parsing
+        plan, is used to discard the sizes it cannot follow.
+        """
+
+        followingValue = parsingPath.followingValues.get(self)
+        sizes = self.dataType.candidateLengths(content, minSize, maxSize, followingValue)
+
+        # Handle specific case where the parsing can be made at the bit level
+        if isinstance(self.dataType, BitArray):
+            step = 1
         else:
-            # Handle specific case where the parsing can be made at the bit level
-            if isinstance(self.dataType, BitArray):
-                step = -1
-            else:
-                step = -8
-
-            for size in range(min(maxSize, len(content)), minSize - 1, step):
-                self._logger.debug("Try to parse {}/{} bits for variable '{}'".format(size, min(maxSize, len(content)), self.field))
-                # size == 0 : deals with 'optional' data
-                if size == 0 or self.dataType.canParse(content[:size]):
-                    # we create a new parsing path and returns it
-                    newParsingPath = parsingPath.copy()
-                    (addresult_succeed, addresult_parsingPaths) = newParsingPath.addResult(self, content[:size].copy())
-                    if addresult_succeed:
-                        for addresult_parsingPath in addresult_parsingPaths:
-                            yield addresult_parsingPath
-                    else:
-                        self._logger.debug("Parsed data does not respect a relation")
+            step = 8
+
+        # size == 0 : deals with 'optional' data
+        start = min(maxSize, len(content))
+        if minSize <= 0 and start % step == 0 and \
+           (followingValue is None or content[:len(followingValue)] == followingValue):
+            sizes.append(0)
+        return sizes
 
     def valueCMP(self, parsingPath, acceptCallBack=True, carnivorous=False, triggered=False):
         if parsingPath is None:
@@ -203,20 +236,23 @@ class Data(AbstractVariableLeaf):
                 "Data '{0}' has no value defined in its definition domain".
                 format(self))
 
-        content = parsingPath.getData(self)
-        if content is None:
+        (data, offset) = parsingPath.getDataToParse(self)
+        if data is None:
             raise Exception("No data assigned to the variable")
+        content = data[offset:offset + len(expectedValue)]
 
-        self._logger.debug("ValueCMP {} with {} ({})".format(content.tobytes(), self.dataType, self.name))
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("ValueCMP {} with {} ({})", content.tobytes(), self.dataType, self.name)
 
         results = []
         if len(content) >= len(expectedValue) and content[:len(
                 expectedValue)].tobytes() == expectedValue.tobytes():
-            (addresult_succeed, addresult_parsingPaths) = parsingPath.addResult(self, content[:len(expectedValue)].copy())
+            (addresult_succeed, addresult_parsingPaths) = parsingPath.addResult(self, content[:len(expectedValue)])
             results.extend(addresult_parsingPaths)
-            self._logger.debug("Data '{}' can be parsed with variable {}, providing '{}'".format(content.tobytes(), self, content[:len(expectedValue)].tobytes()))
-        else:
-            self._logger.debug("Data '{}' cannot be parsed with variable {}".format(content.tobytes(), self))
+            if self._logger.isEnabledFor(logging.DEBUG):
+                self._logger.debug("Data '{}' can be parsed with variable {}, providing '{}'", content.tobytes(), self, content[:len(expectedValue)].tobytes())
+        elif self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("Data '{}' cannot be parsed with variable {}", content.tobytes(), self)
         return results
 
     def learn(self, parsingPath, acceptCallBack=True, carnivorous=False, triggered=False):
@@ -224,46 +260,30 @@ class Data(AbstractVariableLeaf):
         if parsingPath is None:
             raise Exception("ParsingPath cannot be None")
 
-        content = parsingPath.getData(self)
-        actualSize = len(content)
-
-        self._logger.debug("Learn '{}' with {} ({})".format(content.tobytes(),
-                                                            self.dataType, self.name))
+        (content, actualSize, minSize, maxSize) = self._getContent(parsingPath)
 
-        try:
-            minSize = maxSize = self.getFixedBitSize()
-        except ValueError:
-            (minSize, maxSize) = self.dataType.size
-            if minSize is None:
-                minSize = 0
-            if maxSize is None:
-                maxSize = actualSize
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("Learn '{}' with {} ({})", content.tobytes(),
+                               self.dataType, self.name)
 
         if actualSize < minSize:
             self._logger.debug(
-                "Length of the content is too short ({0}), expect data of at least {1} bits".
-                format(len(content), minSize))
+                "Length of the content is too short ({0}), expect data of at least {1} bits",
+                actualSize, minSize)
         else:
-            # Handle specific case where the parsing can be made at the bit level
-            if isinstance(self.dataType, BitArray):
-                step = -1
-            else:
-                step = -8
-
-            for size in range(min(maxSize, len(content)), minSize - 1, step):
-                self._logger.debug("Try to parse {}/{} bits for variable '{}'".format(size, min(maxSize, len(content)), self.field))
-                # size == 0 : deals with 'optional' data
-                if size == 0 or self.dataType.canParse(content[:size]):
-                    # we create a new parsing path and returns it
-                    newParsingPath = parsingPath.copy()
-                    (addresult_succeed, addresult_parsingPaths) = newParsingPath.addResult(self, content[:size].copy())
-                    if addresult_succeed:
-                        for addresult_parsingPath in addresult_parsingPaths:
-                            if addresult_parsingPath.memory is not None:
-                                addresult_parsingPath.memory.memorize(self, content[:size].copy())
-                            yield addresult_parsingPath
-                    else:
-                        self._logger.debug("Parsed data does not respect a relation")
+            for size in self._candidateSizes(parsingPath, content, minSize, maxSize):
+                self._logger.debug("Try to parse {}/{} bits for variable '{}'", size, min(maxSize, actualSize), self.field)
+                value = content[:size]
+                # we create a new parsing path and returns it
+                newParsingPath = parsingPath.copy()
+                (addresult_succeed, addresult_parsingPaths) = newParsingPath.addResult(self, value)
+                if addresult_succeed:
+                    for addresult_parsingPath in addresult_parsingPaths:
+                        if addresult_parsingPath.memory is not None:
+                            addresult_parsingPath.memory.memorize(self, value.copy())
+                        yield addresult_parsingPath
+                else:
+                    self._logger.debug("Parsed data does not respect a relation")
 
     def use(self, variableSpecializerPath, acceptCallBack=True, preset=None, triggered=False):
         """This method participates in the specialization proces.
@@ -274,7 +294,7 @@ class Data(AbstractVariableLeaf):
         """
 
         while True:
-            self._logger.debug("Use variable {} ({})".format(self.dataType, self.name))
+            self._logger.debug("Use variable {} ({})", self.dataType, self.name)
 
             if variableSpecializerPath is None:
                 raise Exception("VariableSpecializerPath cannot be None")
@@ -297,14 +317,14 @@ class Data(AbstractVariableLeaf):
         """
 
         while True:
-            self._logger.debug("Regenerate variable {} ({})".format(self.dataType, self.name))
+            self._logger.debug("Regenerate variable {} ({})", self.dataType, self.name)
 
             if variableSpecializerPath is None:
                 raise Exception("VariableSpecializerPath cannot be None")
 
             newValue = self.dataType.generate()
 
-            self._logger.debug("Generated value for {}: {}".format(self, newValue))
+            self._logger.debug("Generated value for {}: {}", self, newValue)
 
             variableSpecializerPath.addResult(self, newValue)
 
@@ -319,7 +339,7 @@ class Data(AbstractVariableLeaf):
         """
 
         while True:
-            self._logger.debug("Regenerate and memorize variable '{}' ({}) for field '{}'".format(self.dataType, self.name, self.field))
+            self._logger.debug("Regenerate and memorize variable '{}' ({}) for field '{}'", self.dataType, self.name, self.field)
 
             if variableSpecializerPath is None:
                 raise Exception("VariableSpecializerPath cannot be None")
@@ -333,7 +353,8 @@ class Data(AbstractVariableLeaf):
                 if variableSpecializerPath.memory is not None:
                     variableSpecializerPath.memory.memorize(self, newValue)
 
-            self._logger.debug("Generated value for {}: {}".format(self, newValue.tobytes()))
+            if self._logger.isEnabledFor(logging.DEBUG):
+                self._logger.debug("Generated value for {}: {}", self, newValue.tobytes())
 
             variableSpecializerPath.addResult(self, newValue.copy())
 
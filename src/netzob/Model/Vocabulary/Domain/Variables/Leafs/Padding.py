@@ -35,6 +35,7 @@
 #+---------------------------------------------------------------------------+
 #| Standard library imports                                                  |
 #+---------------------------------------------------------------------------+
+import logging
 
 #+---------------------------------------------------------------------------+
 #| Related third party imports                                               |
@@ -397,7 +398,8 @@ class Padding(AbstractRelationVariableLeaf):
             while len(padding_value) < length_to_pad:
                 padding_value.extend(self.dataType.generate())
 
-        self._logger.debug("Computed padding for {}: '{}'".format(self, padding_value.tobytes()))
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("Computed padding for {}: '{}'", self, padding_value.tobytes())
 
         # Save current value of length to pad for further usage in self.compareValue()
         self._current_length_to_pad = int(length_to_pad)
@@ -35,6 +35,7 @@
 #+---------------------------------------------------------------------------+
 #| Standard library imports                                                  |
 #+---------------------------------------------------------------------------+
+import logging
 
 #+---------------------------------------------------------------------------+
 #| Related third party imports                                               |
@@ -339,7 +340,7 @@ class Size(AbstractRelationVariableLeaf):
 
     @typeCheck(GenericPath)
     def computeExpectedValue(self, parsingPath, preset=None):
-        self._logger.debug("Compute expected value for Size variable '{}' from field '{}'".format(self, self.field))
+        self._logger.debug("Compute expected value for Size variable '{}' from field '{}'", self, self.field)
 
         # first checks the pointed fields all have a value
         remainingVariables = []
@@ -376,7 +377,8 @@ class Size(AbstractRelationVariableLeaf):
         while len(b) > self.dataType.size[1]:
             b.remove(0)
 
-        self._logger.debug("Computed value for {}: '{}'".format(self, b.tobytes()))
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("Computed value for {}: '{}'", self, b.tobytes())
         return b
 
     def __str__(self):
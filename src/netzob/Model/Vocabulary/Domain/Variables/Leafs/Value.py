@@ -34,6 +34,7 @@
 #+---------------------------------------------------------------------------+
 #| Standard library imports                                                  |
 #+---------------------------------------------------------------------------+
+import logging
 
 #+---------------------------------------------------------------------------+
 #| Related third party imports                                               |
@@ -299,9 +300,10 @@ class Value(AbstractRelationVariableLeaf):
         if parsingPath is None:
             raise Exception("ParsingPath cannot be None")
 
-        content = parsingPath.getData(self)
-        if content is None:
+        (data, offset) = parsingPath.getDataToParse(self)
+        if data is None:
             raise Exception("No data assigned.")
+        actualSize = len(data) - offset
 
         # we verify we have access to the expected value
         try:
@@ -321,11 +323,11 @@ class Value(AbstractRelationVariableLeaf):
                 target_type_aligned_octets = False  # Tells if we are sure that the target type is aligned on octets
                 if self.targets[0].isnode():
                     minSizeDep = 0
-                    maxSizeDep = len(content)
+                    maxSizeDep = actualSize
                 else:
                     (minSizeDep, maxSizeDep) = self.targets[0].dataType.size
 
-                    if minSizeDep > len(content):
+                    if minSizeDep > actualSize:
                         self._logger.debug("Size of the content to parse is smaller than the min expected size of the dependency field")
                         return results
 
@@ -337,19 +339,22 @@ class Value(AbstractRelationVariableLeaf):
                 else:
                     step = -1  # In order to support a target that manipulates bitarays
 
-                for size in range(min(maxSizeDep, len(content)), minSizeDep - 1, step):
+                for size in range(min(maxSizeDep, actualSize), minSizeDep - 1, step):
                     # we create a new parsing path and returns it
                     newParsingPath = parsingPath.copy()
-                    newParsingPath.addResult(self, content[:size].copy())
+                    newParsingPath.addResult(self, data[offset:offset + size])
                     self._addCallBacksOnUndefinedVariables(newParsingPath)
                     results.append(newParsingPath)
 
         # If the expectedValue contains data
         else:
-            self._logger.debug("Expected value to parse: {0}".format(expectedValue.tobytes()))
-            if content[:len(expectedValue)] == expectedValue:
-                self._logger.debug("add result: {0}".format(expectedValue.copy().tobytes()))
-                parsingPath.addResult(self, content[:len(expectedValue)].copy())
+            if self._logger.isEnabledFor(logging.DEBUG):
+                self._logger.debug("Expected value to parse: {0}", expectedValue.tobytes())
+            content = data[offset:offset + len(expectedValue)]
+            if content == expectedValue:
+                if self._logger.isEnabledFor(logging.DEBUG):
+                    self._logger.debug("add result: {0}", expectedValue.copy().tobytes())
+                parsingPath.addResult(self, content)
                 results.append(parsingPath)
 
         return results
@@ -366,7 +371,7 @@ class Value(AbstractRelationVariableLeaf):
         return self.valueCMP(parsingPath, acceptCallBack)
 
     def computeExpectedValue(self, parsingPath, preset=None):
-        self._logger.debug("Compute expected value for Value field '{}'".format(self.field))
+        self._logger.debug("Compute expected value for Value field '{}'", self.field)
 
         # Check target variable consistency
         target_data = None
@@ -398,12 +403,14 @@ class Value(AbstractRelationVariableLeaf):
 
         # Check if a callback operation is defined
         if self.__operation is None:
-            self._logger.debug("Computed value for {}: '{}'".format(self, target_data.tobytes()))
+            if self._logger.isEnabledFor(logging.DEBUG):
+                self._logger.debug("Computed value for {}: '{}'", self, target_data.tobytes())
             return target_data
         else:
             self._logger.debug("Use callback to compute expected value")
             target_data = self.__operation(target_data, parsingPath, self)
-            self._logger.debug("Computed value for {}: '{}'".format(self, target_data.tobytes()))
+            if self._logger.isEnabledFor(logging.DEBUG):
+                self._logger.debug("Computed value for {}: '{}'", self, target_data.tobytes())
             return target_data
 
     def __str__(self):
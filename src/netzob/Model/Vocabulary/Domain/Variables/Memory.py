@@ -117,14 +117,47 @@ class Memory(object):
        >>> next(s3.specialize(memory=memory))
        b'master>John'
 
+
+    Copies and snapshots of a memory share its content until one of them
+    is modified: :meth:`copy`, :meth:`save` and :meth:`restore` do not
+    depend on the number of memorized variables. The values of a copy
+    are only duplicated when they are first accessed.
+
     """
 
     @public_api
     def __init__(self):
         """Constructor of Memory"""
-        self.memory = dict()
+        self.__memory = dict()
+        # The dict is shared with copies or snapshots and must be copied before a write
+        self.__sharedMemory = False
+        # The values are shared with copies, except the owned ones
+        self.__sharedValues = False
+        self.__ownedValues = set()
+        # The values duplicated on read, kept apart from the dict so that
+        # reading a shared memory does not copy it
+        self.__overlay = dict()
+        self.__sharedOverlay = False
+        # Index of the variables by name, built on demand
+        self.__names = None
         self.__memoryAccessCB = None
 
+    def __write(self):
+        """Returns the dict of the memory, copied if it is shared, in order
+        to modify it."""
+        if self.__sharedMemory:
+            self.__memory = self.__memory.copy()
+            self.__sharedMemory = False
+        return self.__memory
+
+    def __writeOverlay(self):
+        """Returns the overlay of the values duplicated on read, copied if
+        it is shared, in order to modify it."""
+        if self.__sharedOverlay:
+            self.__overlay = self.__overlay.copy()
+            self.__sharedOverlay = False
+        return self.__overlay
+
     @public_api
     @typeCheck(AbstractVariable)
     def memorize(self, variable, value):
@@ -147,14 +180,23 @@ class Memory(object):
 
         """
         if isinstance(value, bitarray):
-            self.memory[variable] = value
+            pass
         elif isinstance(value, bytes):
             b_value = bitarray()
             b_value.frombytes(value)
-            self.memory[variable] = b_value
+            value = b_value
         else:
             raise TypeError("value parameter of memorize() method should a bitarray or a bytes, not a '{}'".format(type(value)))
 
+        memory = self.__write()
+        if self.__names is not None and variable not in memory:
+            self.__names.setdefault(variable.name, variable)
+        memory[variable] = value
+        if variable in self.__overlay:
+            self.__writeOverlay().pop(variable)
+        if self.__sharedValues:
+            self.__ownedValues.add(variable)
+
     @public_api
     @typeCheck(AbstractVariable)
     def hasValue(self, variable):
@@ -176,7 +218,7 @@ class Memory(object):
         False
 
         """
-        return variable in list(self.memory.keys())
+        return variable in self.__memory
 
     @public_api
     @typeCheck(AbstractVariable)
@@ -196,7 +238,16 @@ class Memory(object):
         b'hello'
 
         """
-        return self.memory[variable]
+        value = self.__overlay.get(variable)
+        if value is None:
+            value = self.__memory[variable]
+        if self.__sharedValues and variable not in self.__ownedValues:
+            # The value is shared with a copy of the memory, only this
+            # entry is duplicated
+            value = value.copy()
+            self.__writeOverlay()[variable] = value
+            self.__ownedValues.add(variable)
+        return value
 
     @public_api
     @typeCheck(str)
@@ -217,9 +268,18 @@ class Memory(object):
 
         """
 
-        for variable in self.memory.keys():
-            if variable.name == name:
+        if self.__names is not None:
+            variable = self.__names.get(name)
+            if variable is not None and variable.name == name:
                 return variable
+
+        # The variables may have been renamed, the index is rebuilt
+        self.__names = dict()
+        for variable in self.__memory:
+            self.__names.setdefault(variable.name, variable)
+        variable = self.__names.get(name)
+        if variable is not None and variable.name == name:
+            return variable
         return None
 
     @public_api
@@ -240,8 +300,13 @@ class Memory(object):
         >>> memory.hasValue(variable)
         False
         """
-        if variable in list(self.memory.keys()):
-            self.memory.pop(variable, None)
+        if variable in self.__memory:
+            self.__write().pop(variable, None)
+            if variable in self.__overlay:
+                self.__writeOverlay().pop(variable)
+            self.__ownedValues.discard(variable)
+            if self.__names is not None and self.__names.get(variable.name) is variable:
+                self.__names = None
 
     @public_api
     def copy(self):
@@ -266,40 +331,84 @@ class Memory(object):
         bitarray('00100110')
         >>> m2.getValue(d1)
         bitarray('01100100')
+        >>> m2.memorize(d2, String("world").value)
+        >>> m.getValue(d2).tobytes()
+        b'hello'
 
         """
         clonedMemory = Memory()
-        for k in list(self.memory.keys()):
-            clonedMemory.memory[k] = self.memory[k].copy()
+        clonedMemory.__memory = self.__memory
+        clonedMemory.__overlay = self.__overlay
+        clonedMemory.__sharedMemory = True
+        clonedMemory.__sharedOverlay = True
+        clonedMemory.__sharedValues = True
+        self.__sharedMemory = True
+        self.__sharedOverlay = True
+        self.__sharedValues = True
+        self.__ownedValues = set()
         return clonedMemory
 
     @public_api
     def clear(self):
         """Clear the current memory.
         """
-        self.memory.clear()
+        self.__memory = dict()
+        self.__sharedMemory = False
+        self.__sharedValues = False
+        self.__ownedValues = set()
+        self.__overlay = dict()
+        self.__sharedOverlay = False
+        self.__names = None
 
     @public_api
     def save(self):
-        """Clear the current memory.
+        """Returns a snapshot of the current memory, which can be restored
+        with :meth:`restore`. The snapshot must not be modified.
+
+        >>> from netzob.all import *
+        >>> variable = Data(String(), name="var1")
+        >>> memory = Memory()
+        >>> memory.memorize(variable, b"hello")
+        >>> snapshot = memory.save()
+        >>> memory.memorize(variable, b"world")
+        >>> memory.getValue(variable).tobytes()
+        b'world'
+        >>> memory.restore(snapshot)
+        >>> memory.getValue(variable).tobytes()
+        b'hello'
+
+        :rtype: :class:`tuple`
         """
-        return self.memory.copy()
+        self.__sharedMemory = True
+        self.__sharedOverlay = True
+        self.__sharedValues = True
+        self.__ownedValues = set()
+        return (self.__memory, self.__overlay)
 
     @public_api
     def restore(self, memory):
-        """Clear the current memory.
+        """Restores a snapshot returned by :meth:`save`, or the content of a
+        memory given as a :class:`dict`.
         """
-        self.memory = memory
+        if isinstance(memory, dict):
+            memory = (memory, dict())
+        (self.__memory, self.__overlay) = memory
+        self.__sharedMemory = True
+        self.__sharedOverlay = True
+        self.__sharedValues = True
+        self.__ownedValues = set()
+        self.__names = None
 
     def __str__(self):
         result = []
-        for var, value in list(self.memory.items()):
+        for var, value in list(self.__memory.items()):
+            value = self.__overlay.get(var, value)
             result.append("{} from field '{}': {}".format(
                 var, var.field, TypeConverter.convert(value, BitArray, Raw)))
         return '\n'.join(result)
 
     def __len__(self):
-        return len(self.memory)
+        return len(self.__memory)
 
     @property
     def memory(self):
@@ -307,10 +416,21 @@ class Memory(object):
 
         :type: :class:`dict`
         """
-        return self.__memory
+        # The dict may be modified by the caller
+        memory = self.__write()
+        if len(self.__overlay) > 0:
+            memory.update(self.__overlay)
+            self.__overlay = dict()
+            self.__sharedOverlay = False
+        return memory
 
     @memory.setter  # type: ignore
     def memory(self, memory):
         self.__memory = dict()
         for k, v in list(memory.items()):
             self.__memory[k] = v
+        self.__sharedMemory = False
+        self.__ownedValues = set()
+        self.__overlay = dict()
+        self.__sharedOverlay = False
+        self.__names = None
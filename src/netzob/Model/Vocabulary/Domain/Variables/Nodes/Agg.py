@@ -34,6 +34,7 @@
 # +---------------------------------------------------------------------------+
 # | Standard library imports                                                  |
 # +---------------------------------------------------------------------------+
+import logging
 import random
 from bitarray import bitarray
 
@@ -418,8 +419,10 @@ class Agg(AbstractVariableNode):
     def parse(self, parsingPath, acceptCallBack=True, carnivorous=False, triggered=False):
         """Parse the content with the definition domain of the aggregate.
         """
-        dataToParse = parsingPath.getData(self).copy()
-        self._logger.debug("Parse '{}' as {} with parser path '{}'".format(dataToParse.tobytes(), self, parsingPath))
+        (dataToParse, offset) = parsingPath.getDataToParse(self)
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("Parse '{}' as {} with parser path '{}'",
+                               dataToParse[offset:].tobytes(), self, parsingPath)
 
         # Clean parsed data associated to children (needed if we are in a iteration of a Repeat)
         for child in self.children:
@@ -427,21 +430,21 @@ class Agg(AbstractVariableNode):
                 parsingPath.removeData(child)
 
         # initialy, there is a unique path to test (the provided one)
-        parsingPath.assignData(dataToParse.copy(), self.children[0])
+        parsingPath.assignDataToParse(dataToParse, offset, self.children[0])
 
         try:
             for path in self._inner_parse(parsingPath, 0, False, carnivorous):
                 parsedData = None
                 for child in self.children:
                     if path.hasData(child):
-                        child_data = path.getData(child).copy()
+                        # the children data are shared with other paths: we aggregate them in a new bitarray
                         if parsedData is None:
-                            parsedData = child_data
-                        else:
-                            parsedData += child_data
+                            parsedData = bitarray()
+                        parsedData += path.getData(child)
 
                 if parsedData is not None:
-                    self._logger.debug("Agg data successfuly parsed with {}: '{}'".format(self, parsedData.tobytes()))
+                    if self._logger.isEnabledFor(logging.DEBUG):
+                        self._logger.debug("Agg data successfuly parsed with {}: '{}'", self, parsedData.tobytes())
                     path.addResult(self, parsedData)
                     yield path
         except Exception as e:
@@ -460,25 +463,26 @@ class Agg(AbstractVariableNode):
         else:
             next_child = None
 
-        self._logger.debug("Parse {} (child {}/{}) with {}".format(current_child, i_child + 1, len(self.children), parsingPath))
-        value_before_parsing = parsingPath.getData(current_child).copy()
+        self._logger.debug("Parse {} (child {}/{}) with {}", current_child, i_child + 1, len(self.children), parsingPath)
+        (dataToParse, offset) = parsingPath.getDataToParse(current_child)
 
         childParsingPaths = current_child.parse(parsingPath, carnivorous=carnivorous)
 
         for childParsingPath in childParsingPaths:
-            value_after_parsing = childParsingPath.getData(current_child).copy()
-            remainingValue = value_before_parsing[len(value_after_parsing):].copy()
+            value_after_parsing = childParsingPath.getData(current_child)
+            # The remaining data is located after the parsed value
+            next_offset = offset + len(value_after_parsing)
 
-            self._logger.debug("Children {} succesfuly applied with the parsingPath {}".format(current_child, childParsingPath))
+            self._logger.debug("Children {} succesfuly applied with the parsingPath {}", current_child, childParsingPath)
 
             if next_child is not None:
 
                 # Handle optional field
-                if len(remainingValue) == 0 and i_child == len(self.children) - 2 and self._last_optional:
+                if next_offset == len(dataToParse) and i_child == len(self.children) - 2 and self._last_optional:
                     all_parsed = True
                 # Else send the remaining data to the last field
                 else:
-                    childParsingPath.assignData(remainingValue, next_child)
+                    childParsingPath.assignDataToParse(dataToParse, next_offset, next_child)
 
                 # Recursive call to parse next child
                 try:
@@ -537,7 +541,7 @@ class Agg(AbstractVariableNode):
 
         # Select the child to specialize
         child = self.children[idx]
-        self._logger.debug("Specialize {0} child with {1}".format(child, specializingPath))
+        self._logger.debug("Specialize {0} child with {1}", child, specializingPath)
 
         specialize_last_child = True
         if len(self.children) - 1 == idx and self._last_optional:
@@ -577,11 +581,12 @@ class Agg(AbstractVariableNode):
                     if inner_path.hasData(self):
                         current_value = inner_path.getData(self)
                         newResult = newResult + current_value
-                        self._logger.debug("Cumulative generated value for {}: {}".format(self, newResult.tobytes()))
+                        if self._logger.isEnabledFor(logging.DEBUG):
+                            self._logger.debug("Cumulative generated value for {}: {}", self, newResult.tobytes())
 
             if idx == len(self.children) - 1:
                 self._produce_data(path, specialize_last_child)
-                self._logger.debug("End of specialization for AGG '{}'".format(self))
+                self._logger.debug("End of specialization for AGG '{}'", self)
                 yield path
             else:
                 yield from self._inner_specialize(path, idx + 1, preset)
@@ -597,14 +602,15 @@ class Agg(AbstractVariableNode):
                 if path.hasData(child):
                     data += path.getData(child)
                 else:
-                    self._logger.debug("At least one AGG child ('{}') has no content, therefore we don't produce content for the AGG".format(child))
-                    self._logger.debug("Callback registered on ancestor node: '{}'".format(self))
-                    self._logger.debug("Callback registered due to absence of content in target: '{}'".format(child))
+                    self._logger.debug("At least one AGG child ('{}') has no content, therefore we don't produce content for the AGG", child)
+                    self._logger.debug("Callback registered on ancestor node: '{}'", self)
+                    self._logger.debug("Callback registered due to absence of content in target: '{}'", child)
                     path.registerVariablesCallBack(
                         [child], self, parsingCB=False)
                     return
 
-        self._logger.debug("Generated value for {}: {}".format(self, data.tobytes()))
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("Generated value for {}: {}", self, data.tobytes())
         path.addResult(self, data)
 
 
@@ -34,6 +34,7 @@
 #+---------------------------------------------------------------------------+
 #| Standard library imports                                                  |
 #+---------------------------------------------------------------------------+
+import logging
 import random
 from typing import Callable, List
 from bitarray import bitarray
@@ -240,23 +241,25 @@ class Alt(AbstractVariableNode):
         if len(self.children) == 0:
             raise Exception("Cannot parse data if ALT has no children")
 
-        dataToParse = parsingPath.getData(self)
-        self._logger.debug("Parse '{}' with '{}'".format(dataToParse.tobytes(), self))
+        (dataToParse, offset) = parsingPath.getDataToParse(self)
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("Parse '{}' with '{}'",
+                               dataToParse[offset:].tobytes(), self)
 
         parserPaths = [parsingPath]
-        parsingPath.assignData(dataToParse.copy(), self.children[0])
+        parsingPath.assignDataToParse(dataToParse, offset, self.children[0])
 
         # create a path for each child
         if len(self.children) > 1:
             for child in self.children[1:]:
                 newParsingPath = parsingPath.copy()
-                newParsingPath.assignData(dataToParse.copy(), child)
+                newParsingPath.assignDataToParse(dataToParse, offset, child)
                 parserPaths.append(newParsingPath)
 
         # parse each child according to its definition
         for i_child, child in enumerate(self.children):
             parsingPath = parserPaths[i_child]
-            self._logger.debug("Start Alt parsing of {0}/{1} with {2}".format(i_child + 1, len(self.children), parsingPath))
+            self._logger.debug("Start Alt parsing of {0}/{1} with {2}", i_child + 1, len(self.children), parsingPath)
 
             try:
                 childParsingPaths = child.parse(parsingPath)
@@ -265,7 +268,7 @@ class Alt(AbstractVariableNode):
             else:
                 for childParsingPath in childParsingPaths:
                     data_parsed = childParsingPath.getData(child)
-                    self._logger.debug("End of Alt parsing of {}/{} with {}. Data parsed: '{}'".format(i_child + 1, len(self.children), parsingPath, data_parsed))
+                    self._logger.debug("End of Alt parsing of {}/{} with {}. Data parsed: '{}'", i_child + 1, len(self.children), parsingPath, data_parsed)
                     childParsingPath.addResult(self, data_parsed)
                     yield childParsingPath
         self._logger.debug("End of parsing of Alt variable")
@@ -329,7 +332,7 @@ class Alt(AbstractVariableNode):
 
         newSpecializingPath = specializingPath#.copy()
 
-        self._logger.debug("Specialize {0} child with {1}".format(child, newSpecializingPath))
+        self._logger.debug("Specialize {0} child with {1}", child, newSpecializingPath)
 
         if not newSpecializingPath.hasData(child):
             childSpecializingPaths = child.specialize(newSpecializingPath, preset=preset)
@@ -340,14 +343,14 @@ class Alt(AbstractVariableNode):
         for childSpecializingPath in childSpecializingPaths:
             if childSpecializingPath.hasData(child):
                 value = childSpecializingPath.getData(child)
-                self._logger.debug("Generated value for {}: {} ({})".format(self, value, id(self)))
+                self._logger.debug("Generated value for {}: {} ({})", self, value, id(self))
                 childSpecializingPath.addResult(self, value)
 
                 yield childSpecializingPath
             else:
-                self._logger.debug("The ALT child ('{}') has no content, therefore we don't produce content for the ALT".format(child))
-                self._logger.debug("Callback registered on ancestor node: '{}'".format(self))
-                self._logger.debug("Callback registered due to absence of content in target: '{}'".format(child))
+                self._logger.debug("The ALT child ('{}') has no content, therefore we don't produce content for the ALT", child)
+                self._logger.debug("Callback registered on ancestor node: '{}'", self)
+                self._logger.debug("Callback registered due to absence of content in target: '{}'", child)
                 childSpecializingPath.registerVariablesCallBack(
                     [child], self, parsingCB=False)
                 yield childSpecializingPath
@@ -34,6 +34,7 @@
 # +---------------------------------------------------------------------------+
 # | Standard library imports                                                  |
 # +---------------------------------------------------------------------------+
+import logging
 import random
 from typing import Callable, Optional, Tuple, Union
 
@@ -419,10 +420,11 @@ class Repeat(AbstractVariableNode):
             raise Exception("Parsing path cannot be None")
 
         # retrieve the data to parse
-        dataToParse = parsingPath.getData(self)
+        (dataToParse, offset) = parsingPath.getDataToParse(self)
 
-        self._logger.debug("Parse '{}' as {} with parser path '{}'".format(
-            dataToParse.tobytes(), self, parsingPath))
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("Parse '{}' as {} with parser path '{}'",
+                               dataToParse[offset:].tobytes(), self, parsingPath)
 
         # remove any data assigned to this variable
         parsingPath.removeData(self)
@@ -452,7 +454,7 @@ class Repeat(AbstractVariableNode):
             gen = self._parse_without_callback
 
         # result generator
-        results = gen(parsingPath, dataToParse, **kwargs)
+        results = gen(parsingPath, dataToParse, offset, **kwargs)
 
         # filter on results having a data for this variable
         valid_results = [result for result in results if result.hasData(self) and result.ok]
@@ -466,13 +468,15 @@ class Repeat(AbstractVariableNode):
 
         return valid_results
 
-    def _parse_without_callback(self, parsingPath, dataToParse, min_nb_repeat=0, max_nb_repeat=0, carnivorous=False, acceptCallBack=True):
+    def _parse_without_callback(self, parsingPath, dataToParse, offset, min_nb_repeat=0, max_nb_repeat=0, carnivorous=False, acceptCallBack=True):
+        """Parses the repetitions of the child in the data to parse, which
+        starts at the specified offset (in bits) of dataToParse."""
 
         for nb_repeat in range(max_nb_repeat, min_nb_repeat, -1):
 
             # initiate a new parsing path based on the current one
             newParsingPath = parsingPath.copy()
-            newParsingPath.assignData(dataToParse, self.children[0])
+            newParsingPath.assignDataToParse(dataToParse, offset, self.children[0])
             newParsingPaths = [newParsingPath]
 
             # check we can apply nb_repeat times the child
@@ -496,29 +500,29 @@ class Repeat(AbstractVariableNode):
                             newResult += childParsingPath.getData(self)
                         newResult += childParsingPath.getData(self.children[0])
 
-                        remainingDataToParse = dataToParse[len(newResult):]
+                        # The remaining data is located after the repetitions
+                        next_offset = offset + len(newResult)
 
                         childParsingPath.ok = True
                         (addresult_succeed, addresult_parsingPaths) = childParsingPath.addResult(self, newResult)
                         if not addresult_succeed:
                             childParsingPath.ok = False
 
-                        childParsingPath.assignData(remainingDataToParse, self.children[0])
+                        childParsingPath.assignDataToParse(dataToParse, next_offset, self.children[0])
 
                         # apply delimiter if necessary
                         if self.delimiter is not None and i_repeat < nb_repeat - 1:
                             # check the delimiter is available
-                            toParse = childParsingPath.getData(self.children[0])
-                            if toParse[:len(self.delimiter)] == self.delimiter:
+                            if dataToParse[next_offset:next_offset + len(self.delimiter)] == self.delimiter:
                                 newResult = childParsingPath.getData(self) + self.delimiter
                                 childParsingPath.addResult(self, newResult)
-                                childParsingPath.assignData(dataToParse[len(newResult):],
-                                                            self.children[0])
+                                childParsingPath.assignDataToParse(dataToParse, offset + len(newResult),
+                                                                   self.children[0])
                                 tmp_results.append(childParsingPath)
                         else:
                             tmp_results.append(childParsingPath)
 
-                        if len(dataToParse) <= len(newResult):
+                        if len(dataToParse) - offset <= len(newResult):
                             break_repeat = RepeatResult.STOP_AFTER
 
                 if break_repeat is RepeatResult.STOP_BEFORE:
@@ -533,10 +537,14 @@ class Repeat(AbstractVariableNode):
 
             yield from newParsingPaths
 
-    def _parse_callback(self, parsingPath, dataToParse, carnivorous=False):
+    def _parse_callback(self, parsingPath, dataToParse, offset, carnivorous=False):
+        """Parses the repetitions of the child in the data to parse, which
+        starts at the specified offset (in bits) of dataToParse, as long as
+        the nbRepeat callback requests it."""
+
         # initiate a new parsing path based on the current one
         newParsingPath = parsingPath.copy()
-        newParsingPath.assignData(dataToParse, self.children[0])
+        newParsingPath.assignDataToParse(dataToParse, offset, self.children[0])
         newParsingPaths = [newParsingPath]
 
         break_repeat = RepeatResult.CONTINUE
@@ -565,35 +573,36 @@ class Repeat(AbstractVariableNode):
                     if childParsingPath.hasData(self.children[0]):
                         newResult += childParsingPath.getData(self.children[0])
 
-                    remainingDataToParse = dataToParse[len(newResult):]
+                    # The remaining data is located after the repetitions (the
+                    # callback receives a copy of it)
+                    next_offset = offset + len(newResult)
 
                     break_repeat = self.nbRepeat(i_repeat + 1,
                                                  newResult,
                                                  childParsingPath,
                                                  self.children[0],
-                                                 remainingDataToParse)
+                                                 dataToParse[next_offset:])
 
                     childParsingPath.ok = True
                     (addresult_succeed, addresult_parsingPaths) = childParsingPath.addResult(self, newResult)
                     if not addresult_succeed:
                         childParsingPath.ok = False
 
-                    childParsingPath.assignData(remainingDataToParse, self.children[0])
+                    childParsingPath.assignDataToParse(dataToParse, next_offset, self.children[0])
 
                     # apply delimiter if necessary
                     if self.delimiter is not None:
                         raise NotImplementedError("may be buggy")
                         # check the delimiter is available
-                        toParse = childParsingPath.getData(self.children[0])
-                        if toParse[:len(self.delimiter)] == self.delimiter:
+                        if dataToParse[next_offset:next_offset + len(self.delimiter)] == self.delimiter:
                             newResult = childParsingPath.getData(self) + self.delimiter
                             childParsingPath.addResult(self, newResult)
-                            childParsingPath.assignData(dataToParse[len(newResult):], self.children[0])
+                            childParsingPath.assignDataToParse(dataToParse, offset + len(newResult), self.children[0])
                             tmp_results.append(childParsingPath)
                     else:
                         tmp_results.append(childParsingPath)
 
-                    if len(dataToParse) <= len(newResult):
+                    if len(dataToParse) - offset <= len(newResult):
                         break_repeat = RepeatResult.STOP_AFTER
                         break
 
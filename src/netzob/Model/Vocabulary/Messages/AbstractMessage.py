@@ -52,7 +52,25 @@ from netzob.Model.Vocabulary.Functions.VisualizationFunction import Visualizatio
 
 @NetzobLogger
 class AbstractMessage(SortableObject):
-    """Every message must inherits from this class"""
+    """Every message must inherits from this class.
+
+    Messages are created in large numbers when captures are imported:
+    their attributes are stored in slots, their identifier is only
+    generated when it is first accessed, and their visualization
+    functions, metadata and semantic tags are only allocated when they
+    are first accessed.
+
+    >>> from netzob.all import *
+    >>> msg = RawMessage(b"hello", date=1.0)
+    >>> hasattr(msg, "__dict__")
+    False
+    >>> msg.id == msg.id
+    True
+    """
+
+    __slots__ = ("__weakref__", "__data", "__session", "__id", "__date",
+                 "__messageType", "__source", "__destination",
+                 "__visualizationFunctions", "__metadata", "__semanticTags")
 
     def __init__(self,
                  data,
@@ -80,20 +98,25 @@ class AbstractMessage(SortableObject):
         """
         if data is None:
             data = ''
-        self.data = data
-        self.session = session
-        if _id is None:
-            _id = uuid.uuid4()
-        self.id = _id
+        self.__data = data
+        self.__session = session
+        self.__id = None
+        if _id is not None:
+            self.id = _id
         if date is None:
             date = time.mktime(time.gmtime())
         self.__messageType = messageType
         self.__date = date
         self.__source = source
         self.__destination = destination
-        self.__visualizationFunctions = TypedList(VisualizationFunction)
-        self.__metadata = OrderedDict()
-        self.__semanticTags = OrderedDict()
+        self.__visualizationFunctions = None
+        self.__metadata = None
+        self.__semanticTags = None
+
+    def __reduce_ex__(self, protocol):
+        # Copies of a message share its identifier
+        self.id
+        return super().__reduce_ex__(protocol)
 
     @typeCheck(AbstractField)
     def isValidForField(self, field):
@@ -143,7 +166,7 @@ class AbstractMessage(SortableObject):
 
         if not self.isValueForMetadataValid(name, value):
             raise ValueError("The value of metadata {0} is not valid.")
-        self.__metadata[name] = value
+        self.metadata[name] = value
 
     def isValueForMetadataValid(self, name, value):
         """Computes if the specified value is compatible for the provided name of metadata
@@ -162,6 +185,8 @@ class AbstractMessage(SortableObject):
     def clearVisualizationFunctions(self):
         """Remove all the visualization functions attached to the current element"""
 
+        if self.__visualizationFunctions is None:
+            return
         while (len(self.__visualizationFunctions) > 0):
             self.__visualizationFunctions.pop()
 
@@ -229,6 +254,8 @@ class AbstractMessage(SortableObject):
 
         :type: UUID
         """
+        if self.__id is None:
+            self.__id = uuid.uuid4()
         return self.__id
 
     @id.setter  # type: ignore
@@ -302,6 +329,8 @@ class AbstractMessage(SortableObject):
 
         :type: a dict<str, Object>
         """
+        if self.__metadata is None:
+            self.__metadata = OrderedDict()
         return self.__metadata
 
     @metadata.setter  # type: ignore
@@ -322,6 +351,8 @@ class AbstractMessage(SortableObject):
         .. warning:: Setting this value with a list copies its members and not the list itself.
         """
 
+        if self.__visualizationFunctions is None:
+            self.__visualizationFunctions = TypedList(VisualizationFunction)
         return self.__visualizationFunctions
 
     @visualizationFunctions.setter  # type: ignore
@@ -388,6 +419,8 @@ class AbstractMessage(SortableObject):
 
         :type: :class:`dict` with keys is int (position) and values is a list of str
         """
+        if self.__semanticTags is None:
+            self.__semanticTags = OrderedDict()
         return self.__semanticTags
 
     @semanticTags.setter  # type: ignore
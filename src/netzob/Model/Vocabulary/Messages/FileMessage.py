@@ -55,6 +55,8 @@ class FileMessage(AbstractMessage):
 
     """
 
+    __slots__ = ("__file_path", "__file_message_number")
+
     def __init__(self, data=None, file_path=None, file_message_number=0):
         """
         :param data: the content of the message
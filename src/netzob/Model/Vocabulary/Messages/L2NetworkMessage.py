@@ -30,6 +30,7 @@
 #| Standard library imports
 #+---------------------------------------------------------------------------+
 import binascii
+import sys
 
 #+---------------------------------------------------------------------------+
 #| Local application imports
@@ -55,6 +56,8 @@ class L2NetworkMessage(RawMessage):
 
     """
 
+    __slots__ = ("__l2Protocol", "__l2SourceAddress", "__l2DestinationAddress")
+
     def __init__(self,
                  data,
                  date=None,
@@ -67,9 +70,10 @@ class L2NetworkMessage(RawMessage):
             source=l2SourceAddress,
             destination=l2DestinationAddress,
             messageType="Network")
-        self.l2Protocol = str(l2Protocol)
-        self.l2SourceAddress = str(l2SourceAddress)
-        self.l2DestinationAddress = str(l2DestinationAddress)
+        # Protocols and addresses are shared by many messages
+        self.__l2Protocol = sys.intern(str(l2Protocol))
+        self.__l2SourceAddress = sys.intern(str(l2SourceAddress))
+        self.__l2DestinationAddress = sys.intern(str(l2DestinationAddress))
 
     @property
     def l2Protocol(self):
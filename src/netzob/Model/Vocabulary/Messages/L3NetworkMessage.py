@@ -29,6 +29,7 @@
 #| Standard library imports
 #+---------------------------------------------------------------------------+
 import binascii
+import sys
 
 #+---------------------------------------------------------------------------+
 #| Local application imports
@@ -54,6 +55,8 @@ class L3NetworkMessage(L2NetworkMessage):
 
     """
 
+    __slots__ = ("__l3Protocol", "__l3SourceAddress", "__l3DestinationAddress")
+
     def __init__(self,
                  data,
                  date=None,
@@ -65,9 +68,10 @@ class L3NetworkMessage(L2NetworkMessage):
                  l3DestinationAddress=None):
         super(L3NetworkMessage, self).__init__(
             data, date, l2Protocol, l2SourceAddress, l2DestinationAddress)
-        self.l3Protocol = str(l3Protocol)
-        self.l3SourceAddress = str(l3SourceAddress)
-        self.l3DestinationAddress = str(l3DestinationAddress)
+        # Protocols and addresses are shared by many messages
+        self.__l3Protocol = sys.intern(str(l3Protocol))
+        self.__l3SourceAddress = sys.intern(str(l3SourceAddress))
+        self.__l3DestinationAddress = sys.intern(str(l3DestinationAddress))
 
     @property
     def l3Protocol(self):
@@ -28,6 +28,7 @@
 #+---------------------------------------------------------------------------+
 #| Standard library imports
 #+---------------------------------------------------------------------------+
+import sys
 
 #+---------------------------------------------------------------------------+
 #| Related third party imports
@@ -54,6 +55,8 @@ class L4NetworkMessage(L3NetworkMessage):
 
     """
 
+    __slots__ = ("__l4Protocol", "__l4SourceAddress", "__l4DestinationAddress")
+
     def __init__(self,
                  data,
                  date=None,
@@ -69,7 +72,7 @@ class L4NetworkMessage(L3NetworkMessage):
         super(L4NetworkMessage, self).__init__(
             data, date, l2Protocol, l2SourceAddress, l2DestinationAddress,
             l3Protocol, l3SourceAddress, l3DestinationAddress)
-        self.l4Protocol = str(l4Protocol)
+        self.__l4Protocol = sys.intern(str(l4Protocol))
         self.l4SourceAddress = l4SourceAddress
         self.l4DestinationAddress = l4DestinationAddress
 
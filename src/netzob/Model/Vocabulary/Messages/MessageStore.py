@@ -0,0 +1,570 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011-2017 Georges Bossert and Frédéric Guihéry              |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import heapq
+import time
+import weakref
+from collections.abc import Sequence
+
+#+---------------------------------------------------------------------------+
+#| Related third party imports
+#+---------------------------------------------------------------------------+
+import numpy
+
+#+---------------------------------------------------------------------------+
+#| Local application imports
+#+---------------------------------------------------------------------------+
+from netzob.Common.Utils.Decorators import NetzobLogger
+from netzob.Model.Vocabulary.Messages.RawMessage import RawMessage
+from netzob.Model.Vocabulary.Messages.L2NetworkMessage import L2NetworkMessage
+from netzob.Model.Vocabulary.Messages.L3NetworkMessage import L3NetworkMessage
+from netzob.Model.Vocabulary.Messages.L4NetworkMessage import L4NetworkMessage
+
+
+@NetzobLogger
+class MessageStore(Sequence):
+    """A columnar container of messages dedicated to large captures.
+
+    Instead of one object per message, the payloads are kept in a
+    single contiguous byte buffer delimited by an array of offsets,
+    and the dates, protocols, addresses and ports are kept in NumPy
+    columns (protocols and addresses are dictionary-encoded). Message
+    objects (:class:`RawMessage`, :class:`L2NetworkMessage`,
+    :class:`L3NetworkMessage` or :class:`L4NetworkMessage`) are only
+    created when an element of the store is accessed, and are kept as
+    long as they are referenced elsewhere.
+
+    A MessageStore is a sequence: it can be given to
+    :class:`Symbol(messages=...) <netzob.Model.Vocabulary.Symbol.Symbol>`,
+    to the clustering methods of :class:`Format
+    <netzob.Inference.Vocabulary.Format.Format>` and is returned by
+    :class:`PCAPImporter <netzob.Import.PCAPImporter.PCAPImporter.PCAPImporter>`
+    when ``asMessageStore=True``.
+
+    >>> from netzob.all import *
+    >>> store = MessageStore()
+    >>> store.add(RawMessage(b"hello", date=1.0, source="A", destination="B"))
+    >>> store.addPacket(L4NetworkMessage, b"world!", 2.0, "Ethernet",
+    ...                 "00:01", "00:02", "IP", "10.0.0.1", "10.0.0.2",
+    ...                 "UDP", 2049, 53)
+    >>> len(store)
+    2
+    >>> store.getData(1)
+    b'world!'
+    >>> print(store.getSource(1), store.getDestination(1))
+    10.0.0.1:2049 10.0.0.2:53
+    >>> store.dates
+    array([1., 2.])
+    >>> store.payloadSizes
+    array([5, 6])
+    >>> store.getColumn("l4DestinationAddress")
+    array([-1, 53], dtype=int32)
+
+    Messages are created on demand, and the same object is returned
+    while it is alive:
+
+    >>> msg = store[1]
+    >>> print(type(msg).__name__, msg.source, msg.l4DestinationAddress)
+    L4NetworkMessage 10.0.0.1:2049 53
+    >>> store[1] is msg
+    True
+    >>> print([m.data for m in store])
+    [b'hello', b'world!']
+
+    A store can be attached to a symbol without being copied:
+
+    >>> symbol = Symbol(messages=store)
+    >>> symbol.messages is store
+    True
+
+    """
+
+    # Classes of the messages a store can hold, in the order of their
+    # kind identifiers
+    MESSAGE_CLASSES = (RawMessage, L2NetworkMessage, L3NetworkMessage,
+                       L4NetworkMessage)
+
+    # Dictionary-encoded columns, followed by the port columns
+    CODE_COLUMNS = ("l2Protocol", "l2SourceAddress", "l2DestinationAddress",
+                    "l3Protocol", "l3SourceAddress", "l3DestinationAddress",
+                    "l4Protocol")
+    PORT_COLUMNS = ("l4SourceAddress", "l4DestinationAddress")
+
+    def __init__(self, messages=None, capacity=1024):
+        """
+        :parameter messages: messages to add to the store
+        :type messages: an iterable of :class:`AbstractMessage <netzob.Model.Vocabulary.Messages.AbstractMessage.AbstractMessage>`
+        :parameter capacity: the number of messages to reserve room for
+        :type capacity: :class:`int`
+        """
+        capacity = max(1, capacity)
+        self.__size = 0
+        self.__payloads = bytearray()
+        self.__offsets = numpy.zeros(capacity + 1, dtype=numpy.int64)
+        self.__dates = numpy.zeros(capacity, dtype=numpy.float64)
+        self.__kinds = numpy.zeros(capacity, dtype=numpy.uint8)
+        self.__codes = numpy.zeros((capacity, len(self.CODE_COLUMNS)), dtype=numpy.int32)
+        self.__ports = numpy.full((capacity, len(self.PORT_COLUMNS)), -1, dtype=numpy.int32)
+
+        # Values of the dictionary-encoded columns, code 0 stands for None
+        self.__values = [None]
+        self.__valueCodes = {None: 0}
+
+        # Messages already created, by index
+        self.__messages = weakref.WeakValueDictionary()
+
+        if messages is not None:
+            self.addAll(messages)
+
+    def add(self, message):
+        """Append a message at the end of the store. Only the payload,
+        the date and the addresses of the message are kept.
+
+        :parameter message: the message to add
+        :type message: :class:`RawMessage`, :class:`L2NetworkMessage`, :class:`L3NetworkMessage` or :class:`L4NetworkMessage`
+        :raise: a TypeError if the message cannot be stored
+        """
+        messageClass = type(message)
+        if messageClass is RawMessage:
+            addresses = (message.source, message.destination)
+        elif messageClass is L2NetworkMessage:
+            addresses = (message.l2Protocol, message.l2SourceAddress,
+                         message.l2DestinationAddress)
+        elif messageClass is L3NetworkMessage:
+            addresses = (message.l2Protocol, message.l2SourceAddress,
+                         message.l2DestinationAddress, message.l3Protocol,
+                         message.l3SourceAddress, message.l3DestinationAddress)
+        elif messageClass is L4NetworkMessage:
+            addresses = (message.l2Protocol, message.l2SourceAddress,
+                         message.l2DestinationAddress, message.l3Protocol,
+                         message.l3SourceAddress, message.l3DestinationAddress,
+                         message.l4Protocol, message.l4SourceAddress,
+                         message.l4DestinationAddress)
+        else:
+            raise TypeError(
+                "Messages of type {0} cannot be stored in a MessageStore".
+                format(messageClass.__name__))
+
+        self.addPacket(messageClass, message.data, message.date, *addresses)
+        self.__messages[self.__size - 1] = message
+
+    append = add
+
+    def addAll(self, messages):
+        """Append all the specified messages at the end of the store. The
+        columns of another store are copied without creating its messages.
+
+        :parameter messages: the messages to add
+        :type messages: an iterable of :class:`AbstractMessage <netzob.Model.Vocabulary.Messages.AbstractMessage.AbstractMessage>`
+                        or a :class:`MessageStore`
+        """
+        if isinstance(messages, MessageStore):
+            self.__addStore(messages)
+            return
+        for message in messages:
+            self.add(message)
+
+    def __addStore(self, store):
+        size = store.__size
+        row = self.__size
+        if row + size > len(self.__dates):
+            self.__grow(max(2 * len(self.__dates), row + size))
+
+        base = len(self.__payloads)
+        self.__payloads += store.__payloads[:store.__offsets[size]]
+        self.__offsets[row + 1:row + size + 1] = store.__offsets[1:size + 1] + base
+        self.__dates[row:row + size] = store.__dates[:size]
+        self.__kinds[row:row + size] = store.__kinds[:size]
+        self.__ports[row:row + size] = store.__ports[:size]
+        # Codes are translated to the values of the current store
+        codes = numpy.array(
+            [self.__encode(value) for value in store.__values],
+            dtype=numpy.int32)
+        self.__codes[row:row + size] = codes[store.__codes[:size]]
+        self.__size += size
+
+    def addPacket(self, messageClass, data, date, *addresses):
+        """Append a message without creating it. The addresses are the
+        arguments that follow the date in the constructor of
+        `messageClass`, i.e. the source and the destination for a
+        :class:`RawMessage` and the protocols and addresses of each
+        layer for the network messages.
+
+        :parameter messageClass: the class of the message to append
+        :type messageClass: one of :attr:`MESSAGE_CLASSES`
+        :parameter data: the payload of the message
+        :type data: :class:`bytes`
+        :parameter date: the timestamp of the message, the current time if None
+        :type date: :class:`float`
+        :raise: a TypeError if the message cannot be stored
+        """
+        if messageClass not in self.MESSAGE_CLASSES:
+            raise TypeError(
+                "Messages of type {0} cannot be stored in a MessageStore".
+                format(messageClass.__name__))
+        if not isinstance(data, (bytes, bytearray)):
+            raise TypeError("Only bytes payloads can be stored in a MessageStore")
+        kind = self.MESSAGE_CLASSES.index(messageClass)
+        if kind == 0:
+            # The source and the destination of raw messages are
+            # kept in the columns of the layer 2 addresses
+            addresses = (None, ) + tuple(addresses[:2])
+        elif len(addresses) > 3 * kind:
+            raise TypeError("Too many addresses for a {0}".format(
+                messageClass.__name__))
+
+        row = self.__size
+        if row == len(self.__dates):
+            self.__grow(2 * row)
+
+        self.__payloads += data
+        self.__offsets[row + 1] = len(self.__payloads)
+        if date is None:
+            date = time.mktime(time.gmtime())
+        self.__dates[row] = date
+        self.__kinds[row] = kind
+
+        nbCodes = len(self.CODE_COLUMNS)
+        codes = self.__codes[row]
+        for i, value in enumerate(addresses[:nbCodes]):
+            codes[i] = self.__encode(value)
+        ports = self.__ports[row]
+        for i, port in enumerate(addresses[nbCodes:]):
+            if port is not None:
+                ports[i] = port
+
+        self.__size += 1
+
+    def __encode(self, value):
+        code = self.__valueCodes.get(value)
+        if code is None:
+            code = len(self.__values)
+            self.__values.append(value)
+            self.__valueCodes[value] = code
+        return code
+
+    def __grow(self, capacity):
+        """Reallocate the columns to hold `capacity` messages."""
+        def resized(column, length, fill=0):
+            newColumn = numpy.full((length, ) + column.shape[1:], fill,
+                                   dtype=column.dtype)
+            newColumn[:len(column)] = column
+            return newColumn
+
+        self.__offsets = resized(self.__offsets, capacity + 1)
+        self.__dates = resized(self.__dates, capacity)
+        self.__kinds = resized(self.__kinds, capacity)
+        self.__codes = resized(self.__codes, capacity)
+        self.__ports = resized(self.__ports, capacity, -1)
+
+    def __len__(self):
+        return self.__size
+
+    def __checkIndex(self, index):
+        if index < 0:
+            index += self.__size
+        if not 0 <= index < self.__size:
+            raise IndexError("MessageStore index out of range")
+        return index
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.__size))]
+        index = self.__checkIndex(index)
+        message = self.__messages.get(index)
+        if message is None:
+            message = self.__createMessage(index)
+            self.__messages[index] = message
+        return message
+
+    def __iter__(self):
+        for index in range(self.__size):
+            yield self[index]
+
+    def __createMessage(self, index):
+        kind = int(self.__kinds[index])
+        messageClass = self.MESSAGE_CLASSES[kind]
+        data = self.getData(index)
+        date = float(self.__dates[index])
+        addresses = self.__addresses(index)
+        if kind == 0:
+            return RawMessage(
+                data, date, source=addresses[1], destination=addresses[2])
+        return messageClass(data, date, *addresses[:3 * kind])
+
+    def __addresses(self, index):
+        addresses = [self.__values[code] for code in self.__codes[index].tolist()]
+        addresses.extend(
+            port if port >= 0 else None
+            for port in self.__ports[index].tolist())
+        return addresses
+
+    def values(self):
+        """Return all the messages of the store
+
+        :type: a :class:`list` of :class:`AbstractMessage <netzob.Model.Vocabulary.Messages.AbstractMessage.AbstractMessage>`
+        """
+        return list(self)
+
+    def getData(self, index):
+        """Return the payload of a message without creating it
+
+        :type: :class:`bytes`
+        """
+        index = self.__checkIndex(index)
+        return bytes(self.__payloads[self.__offsets[index]:self.__offsets[index + 1]])
+
+    def iterData(self):
+        """Iterate over the payloads of the messages without creating them
+
+        :type: a generator of :class:`bytes`
+        """
+        payloads = memoryview(self.__payloads)
+        offsets = self.__offsets[:self.__size + 1].tolist()
+        for start, end in zip(offsets, offsets[1:]):
+            yield bytes(payloads[start:end])
+
+    def getSource(self, index):
+        """Return the source of a message without creating it. It is
+        the value the :attr:`source` of the message would have.
+
+        :type: :class:`str`
+        """
+        return self.__endpoint(self.__checkIndex(index), 1)
+
+    def getDestination(self, index):
+        """Return the destination of a message without creating it. It
+        is the value the :attr:`destination` of the message would have.
+
+        :type: :class:`str`
+        """
+        return self.__endpoint(self.__checkIndex(index), 2)
+
+    def __endpoint(self, index, column):
+        kind = self.__kinds[index]
+        if kind < 2:
+            return self.__values[self.__codes[index, column]]
+        address = str(self.__values[self.__codes[index, column + 3]])
+        if kind == 2:
+            return address
+        port = self.__ports[index, column - 1]
+        return "{0}:{1}".format(address, port if port >= 0 else None)
+
+    def __readOnly(self, column):
+        view = column[:self.__size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def dates(self):
+        """The dates of the messages (read-only view)
+
+        :type: :class:`numpy.ndarray`
+        """
+        return self.__readOnly(self.__dates)
+
+    @property
+    def payloadSizes(self):
+        """The size in bytes of the payload of each message
+
+        :type: :class:`numpy.ndarray`
+        """
+        return numpy.diff(self.__offsets[:self.__size + 1])
+
+    def getColumn(self, name):
+        """Return the values of an address column. Port columns are
+        returned as integers where -1 stands for no port, other columns
+        as objects.
+
+        :parameter name: a name among :attr:`CODE_COLUMNS` and :attr:`PORT_COLUMNS`
+        :type name: :class:`str`
+        :type: :class:`numpy.ndarray`
+        :raise: a ValueError if the column does not exist
+        """
+        if name in self.PORT_COLUMNS:
+            return self.__readOnly(
+                self.__ports[:, self.PORT_COLUMNS.index(name)])
+        if name in self.CODE_COLUMNS:
+            values = numpy.empty(len(self.__values), dtype=object)
+            values[:] = self.__values
+            return values[self.__codes[:self.__size, self.CODE_COLUMNS.index(name)]]
+        raise ValueError("Unknown column: {0}".format(name))
+
+    def select(self, indexes):
+        """Return a new store made of the specified messages, in the
+        specified order.
+
+        >>> from netzob.all import *
+        >>> store = MessageStore([RawMessage(b"a", 3.0), RawMessage(b"b", 1.0), RawMessage(b"c", 2.0)])
+        >>> print(list(store.select([2, 0]).iterData()))
+        [b'c', b'a']
+
+        :parameter indexes: the indexes of the messages to keep
+        :type indexes: a sequence of :class:`int`
+        :type: :class:`MessageStore`
+        """
+        indexes = numpy.asarray(indexes, dtype=numpy.int64)
+        if len(indexes) > 0 and (indexes.min() < 0 or indexes.max() >= self.__size):
+            raise IndexError("MessageStore index out of range")
+
+        store = MessageStore(capacity=len(indexes))
+        payloads = memoryview(self.__payloads)
+        offsets = self.__offsets
+        store.__payloads = bytearray(b"".join(
+            payloads[offsets[i]:offsets[i + 1]] for i in indexes.tolist()))
+        sizes = offsets[indexes + 1] - offsets[indexes]
+        numpy.cumsum(sizes, out=store.__offsets[1:len(indexes) + 1])
+        store.__dates[:len(indexes)] = self.__dates[indexes]
+        store.__kinds[:len(indexes)] = self.__kinds[indexes]
+        store.__codes[:len(indexes)] = self.__codes[indexes]
+        store.__ports[:len(indexes)] = self.__ports[indexes]
+        store.__values = list(self.__values)
+        store.__valueCodes = dict(self.__valueCodes)
+        store.__size = len(indexes)
+        return store
+
+    def sort(self):
+        """Sort the messages by date, the same way a
+        :class:`SortedTypedList <netzob.Common.Utils.SortedTypedList.SortedTypedList>`
+        orders messages (by millisecond, then by insertion).
+
+        >>> from netzob.all import *
+        >>> store = MessageStore([RawMessage(b"a", 3.0), RawMessage(b"b", 1.0), RawMessage(b"c", 2.0)])
+        >>> store.sort()
+        >>> print(list(store.iterData()))
+        [b'b', b'c', b'a']
+
+        """
+        priorities = (self.__dates[:self.__size] * 1000).astype(numpy.int64)
+        if numpy.all(priorities[1:] >= priorities[:-1]):
+            return
+        order = numpy.argsort(priorities, kind="stable")
+        sortedStore = self.select(order)
+        messages = self.__messages
+        self.__payloads = sortedStore.__payloads
+        self.__offsets = sortedStore.__offsets
+        self.__dates = sortedStore.__dates
+        self.__kinds = sortedStore.__kinds
+        self.__codes = sortedStore.__codes
+        self.__ports = sortedStore.__ports
+        self.__messages = weakref.WeakValueDictionary()
+        for newIndex, oldIndex in enumerate(order.tolist()):
+            message = messages.get(oldIndex)
+            if message is not None:
+                self.__messages[newIndex] = message
+
+    @staticmethod
+    def merge(stores):
+        """Merge stores, each sorted by date, into a single store sorted by
+        date with a k-way merge. Messages with the same date keep the order
+        of the stores, so the result is the one of sorting the concatenation
+        of the stores.
+
+        >>> from netzob.all import *
+        >>> store1 = MessageStore([RawMessage(b"a", 1.0), RawMessage(b"c", 3.0)])
+        >>> store2 = MessageStore([RawMessage(b"b", 1.0), RawMessage(b"d", 2.0)])
+        >>> print(list(MessageStore.merge([store1, store2]).iterData()))
+        [b'a', b'b', b'd', b'c']
+
+        :parameter stores: the stores to merge
+        :type stores: a :class:`list` of :class:`MessageStore`
+        :type: :class:`MessageStore`
+        """
+        merged = MessageStore(capacity=sum(len(store) for store in stores))
+        runs = []
+        for store in stores:
+            priorities = (store.__dates[:store.__size] * 1000).astype(numpy.int64)
+            runs.append(zip(priorities.tolist(),
+                            range(merged.__size, merged.__size + store.__size)))
+            merged.addAll(store)
+
+        order = [index for (priority, index) in heapq.merge(*runs)]
+        if order == list(range(len(order))):
+            return merged
+        return merged.select(order)
+
+    def __reduce__(self):
+        # Created messages are not pickled with the columns
+        return (MessageStore, (), self.__getColumns())
+
+    def __getColumns(self):
+        size = self.__size
+        return (bytes(self.__payloads[:self.__offsets[size]]),
+                self.__offsets[:size + 1], self.__dates[:size],
+                self.__kinds[:size], self.__codes[:size], self.__ports[:size],
+                self.__values)
+
+    def __setstate__(self, columns):
+        (payloads, offsets, dates, kinds, codes, ports, values) = columns
+        if len(dates) > len(self.__dates):
+            self.__grow(len(dates))
+        self.__size = len(dates)
+        self.__payloads = bytearray(payloads)
+        self.__offsets[:self.__size + 1] = offsets
+        self.__dates[:self.__size] = dates
+        self.__kinds[:self.__size] = kinds
+        self.__codes[:self.__size] = codes
+        self.__ports[:self.__size] = ports
+        self.__values = list(values)
+        self.__valueCodes = dict((value, code) for (code, value) in enumerate(self.__values))
+
+    def mergeConsecutive(self):
+        """Return a new store where consecutive messages sharing the
+        same source and destination are merged into a single message.
+
+        >>> from netzob.all import *
+        >>> store = MessageStore([RawMessage(b"a", 1.0, "A", "B"), RawMessage(b"b", 2.0, "A", "B"), RawMessage(b"c", 3.0, "B", "A")])
+        >>> print(list(store.mergeConsecutive().iterData()))
+        [b'ab', b'c']
+
+        :type: :class:`MessageStore`
+        """
+        merged = MessageStore(capacity=self.__size)
+        previousEndpoints = None
+        for index in range(self.__size):
+            endpoints = (self.__endpoint(index, 1), self.__endpoint(index, 2))
+            if merged.__size > 0 and endpoints == previousEndpoints:
+                merged.__payloads += self.getData(index)
+                merged.__offsets[merged.__size] = len(merged.__payloads)
+            else:
+                merged.__appendRow(self, index)
+                previousEndpoints = endpoints
+        return merged
+
+    def __appendRow(self, store, index):
+        kind = int(store.__kinds[index])
+        addresses = store.__addresses(index)
+        if kind == 0:
+            addresses = addresses[1:3]
+        else:
+            addresses = addresses[:3 * kind]
+        self.addPacket(self.MESSAGE_CLASSES[kind],
+                       store.getData(index), float(store.__dates[index]),
+                       *addresses)
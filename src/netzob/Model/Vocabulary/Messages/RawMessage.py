@@ -60,6 +60,8 @@ class RawMessage(AbstractMessage):
 
     """
 
+    __slots__ = ()
+
     def __init__(self, data=None, date=None, source=None, destination=None, messageType="Raw"):
         """
         :parameter data: the content of the message
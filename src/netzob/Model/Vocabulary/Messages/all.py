@@ -33,3 +33,4 @@ from netzob.Model.Vocabulary.Messages.FileMessage import FileMessage
 from netzob.Model.Vocabulary.Messages.L2NetworkMessage import L2NetworkMessage
 from netzob.Model.Vocabulary.Messages.L3NetworkMessage import L3NetworkMessage
 from netzob.Model.Vocabulary.Messages.L4NetworkMessage import L4NetworkMessage
+from netzob.Model.Vocabulary.Messages.MessageStore import MessageStore
@@ -51,6 +51,7 @@ from netzob.Common.Utils.Decorators import typeCheck, public_api, NetzobLogger
 from netzob.Model.Vocabulary.AbstractField import AbstractField, GenerationException
 from netzob.Common.Utils.TypedList import TypedList
 from netzob.Model.Vocabulary.Messages.AbstractMessage import AbstractMessage
+from netzob.Model.Vocabulary.Messages.MessageStore import MessageStore
 from netzob.Model.Vocabulary.Field import Field
 from netzob.Model.Vocabulary.Domain.Variables.Memory import Memory
 
@@ -73,11 +74,14 @@ class Symbol(AbstractField):
                      symbol. May be ``None`` (thus, an empty :class:`list`
                      would be defined), especially when
                      modeling a protocol from scratch (i.e. the
-                     fields are already known).
+                     fields are already known). A :class:`MessageStore
+                     <netzob.Model.Vocabulary.Messages.MessageStore.MessageStore>`
+                     is attached without being copied.
     :param name: The name of the symbol. If not specified, the
                  default name will be "Symbol".
     :type fields: a :class:`list` of :class:`Field <netzob.Model.Vocabulary.Field.Field>`, optional
-    :type messages: a :class:`list` of :class:`AbstractMessage <netzob.Model.Vocabulary.Messages.AbstractMessage.AbstractMessage>`, optional
+    :type messages: a :class:`list` of :class:`AbstractMessage <netzob.Model.Vocabulary.Messages.AbstractMessage.AbstractMessage>`
+                    or a :class:`MessageStore <netzob.Model.Vocabulary.Messages.MessageStore.MessageStore>`, optional
     :type name: :class:`str`, optional
 
 
@@ -384,6 +388,9 @@ class Symbol(AbstractField):
 
     def clearMessages(self):
         """Delete all the messages attached to the current symbol"""
+        if isinstance(self.__messages, MessageStore):
+            # The store may be shared with other symbols
+            self.__messages = TypedList(AbstractMessage)
         while (len(self.__messages) > 0):
             self.__messages.pop()
 
@@ -394,6 +401,7 @@ class Symbol(AbstractField):
         """A list containing all the messages that this symbol represent.
 
         :type : a :class:`list` of :class:`AbstractMessage <netzob.Model.Vocabulary.Messages.AbstractMessage.AbstractMessage>`
+                or a :class:`MessageStore <netzob.Model.Vocabulary.Messages.MessageStore.MessageStore>`
         """
         return self.__messages
 
@@ -402,6 +410,11 @@ class Symbol(AbstractField):
         if messages is None:
             messages = []
 
+        # A message store is attached as is, to avoid creating its messages
+        if isinstance(messages, MessageStore):
+            self.__messages = messages
+            return
+
         # First it checks the specified messages are all AbstractMessages
         for msg in messages:
             if not isinstance(msg, AbstractMessage):
@@ -586,6 +586,64 @@ class AbstractType(object, metaclass=abc.ABCMeta):
         raise NotImplementedError(
             "Internal Error: 'canParse' method not implemented")
 
+    def candidateLengths(self, data, minSize=0, maxSize=None, followingValue=None):
+        """This method returns the lengths (in bits) of the prefixes of
+        the specified data that can be parsed with the current type, from
+        the longest to the shortest.
+
+        The tested lengths are the ones tried by the parser: they start
+        at ``min(maxSize, len(data))`` and decrease by steps of 8 bits (1
+        bit for a :class:`BitArray`) down to ``minSize``. A length of 0
+        is never returned.
+
+        If ``followingValue`` is provided, only the prefixes that are
+        immediately followed by this value in the data are returned.
+
+        Sub-classes override this method to compute the lengths in a
+        single pass over the data, instead of calling :meth:`canParse`
+        on each prefix.
+
+        :param data: The data to parse.
+        :param minSize: The minimum length of the prefixes.
+        :param maxSize: The maximum length of the prefixes (None for no limit).
+        :param followingValue: The value that must follow the prefixes.
+        :type data: :class:`bitarray <bitarray.bitarray>`, required
+        :type minSize: :class:`int`, optional
+        :type maxSize: :class:`int`, optional
+        :type followingValue: :class:`bitarray <bitarray.bitarray>`, optional
+        :return: the lengths of the prefixes that can be parsed
+        :rtype: a :class:`list` of :class:`int`
+
+        >>> from netzob.all import *
+        >>> data = IPv4("10.0.0.1").value + String(";").value
+        >>> IPv4().candidateLengths(data)
+        [32]
+        >>> IPv4().candidateLengths(data, followingValue=String(",").value)
+        []
+        >>> data = String("hello;").value
+        >>> String(nbChars=(2, 5)).candidateLengths(data)
+        [40, 32, 24, 16]
+        >>> String(nbChars=(2, 5)).candidateLengths(data, followingValue=String(";").value)
+        [40]
+
+        """
+
+        start = self._candidateLengthsStart(data, maxSize)
+        return [size for size in range(start, max(minSize, 1) - 1, -8)
+                if self._isFollowedBy(data, size, followingValue) and self.canParse(data[:size])]
+
+    @staticmethod
+    def _candidateLengthsStart(data, maxSize):
+        if maxSize is None:
+            return len(data)
+        return min(maxSize, len(data))
+
+    @staticmethod
+    def _isFollowedBy(data, size, followingValue):
+        if followingValue is None:
+            return True
+        return data[size:size + len(followingValue)] == followingValue
+
     @property
     def value(self):
         """The current value of the instance. This value is represented
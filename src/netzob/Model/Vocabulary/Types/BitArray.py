@@ -411,6 +411,37 @@ class BitArray(AbstractType):
 
         return True
 
+    def candidateLengths(self, data, minSize=0, maxSize=None, followingValue=None):
+        """This method returns the lengths (in bits) of the prefixes of
+        the specified data that can be parsed as the current BitArray,
+        from the longest to the shortest (see
+        :meth:`AbstractType.candidateLengths`). BitArrays are parsed at
+        the bit level, so all the lengths within the size constraints
+        are valid.
+
+        >>> from netzob.all import *
+        >>> data = bitarray('110011')
+        >>> BitArray(nbBits=(2, 4)).candidateLengths(data)
+        [4, 3, 2]
+        >>> BitArray(nbBits=(2, 4)).candidateLengths(data, followingValue=bitarray('11'))
+        [4]
+
+        """
+
+        start = self._candidateLengthsStart(data, maxSize)
+        minSize = max(minSize, 1)
+
+        # Same constraints as canParse()
+        (nbMinBits, nbMaxBits) = self.size
+        lower = minSize if nbMinBits is None else max(minSize, nbMinBits)
+        upper = start if nbMaxBits is None else min(start, nbMaxBits)
+        sizes = set(range(lower, upper + 1))
+        if self.value is not None and minSize <= len(self.value) <= start and self.value == data[:len(self.value)]:
+            sizes.add(len(self.value))
+
+        return [size for size in sorted(sizes, reverse=True)
+                if self._isFollowedBy(data, size, followingValue)]
+
     def generate(self, generationStrategy=None):
         """Generates a random bitarray that respects the constraints.
         """
@@ -349,6 +349,35 @@ class HexaString(AbstractType):
 
         return True
 
+    def candidateLengths(self, data, minSize=0, maxSize=None, followingValue=None):
+        """This method returns the lengths (in bits) of the prefixes of
+        the specified data that can be parsed as the current HexaString,
+        from the longest to the shortest (see
+        :meth:`AbstractType.candidateLengths`). Any byte has an
+        hexadecimal representation, so only the size constraints apply.
+
+        >>> from netzob.all import *
+        >>> data = HexaString(b"aabbccdd").value
+        >>> HexaString(nbBytes=(1, 3)).candidateLengths(data)
+        [24, 16, 8]
+
+        """
+
+        # A constant value only leads to a single candidate
+        if self.value is not None:
+            return super(HexaString, self).candidateLengths(data, minSize, maxSize, followingValue)
+
+        start = self._candidateLengthsStart(data, maxSize)
+
+        (minBits, maxBits) = self.size
+        minSize = max(minSize, minBits if minBits is not None else 0, 1)
+        if maxBits is not None and start > maxBits:
+            # Keep the sizes on the parser steps of 8 bits
+            start -= (start - maxBits + 7) // 8 * 8
+
+        return [size for size in range(start, minSize - 1, -8)
+                if self._isFollowedBy(data, size, followingValue)]
+
     def generate(self, generationStrategy=None):
         """Generates a random HexaString that respects the requested size or the
         predefined value.
@@ -583,6 +583,34 @@ class Integer(AbstractType):
         raise Exception("Cannot parse this data '{}' because no domain is "
                         "expected.".format(data))
 
+    def candidateLengths(self, data, minSize=0, maxSize=None, followingValue=None):
+        """This method returns the lengths (in bits) of the prefixes of
+        the specified data that can be parsed as the current Integer (see
+        :meth:`AbstractType.candidateLengths`). Only the prefix of
+        ``unitSize`` bits is tested.
+
+        >>> from netzob.all import *
+        >>> data = Integer(10, unitSize=UnitSize.SIZE_16).value
+        >>> Integer(interval=(0, 20), unitSize=UnitSize.SIZE_16).candidateLengths(data)
+        [16]
+        >>> Integer(interval=(0, 20), unitSize=UnitSize.SIZE_8).candidateLengths(data)
+        [8]
+        >>> Integer(interval=(1, 20), unitSize=UnitSize.SIZE_8).candidateLengths(data)
+        []
+
+        """
+
+        # A constant value only leads to a single candidate
+        if self.value is not None:
+            return super(Integer, self).candidateLengths(data, minSize, maxSize, followingValue)
+
+        start = self._candidateLengthsStart(data, maxSize)
+        size = self.unitSize.value
+        if max(minSize, 1) <= size <= start and (start - size) % 8 == 0 \
+           and self._isFollowedBy(data, size, followingValue) and self.canParse(data[:size]):
+            return [size]
+        return []
+
     @staticmethod
     def decode(data,
                unitSize=AbstractType.defaultUnitSize(),
@@ -441,6 +441,51 @@ class Raw(AbstractType):
 
         return True
 
+    def candidateLengths(self, data, minSize=0, maxSize=None, followingValue=None):
+        """This method returns the lengths (in bits) of the prefixes of
+        the specified data that can be parsed as the current Raw, from
+        the longest to the shortest (see
+        :meth:`AbstractType.candidateLengths`). The alphabet is checked
+        in one pass over the data.
+
+        >>> from netzob.all import *
+        >>> data = b"\\x01\\x02\\x03\\x04"
+        >>> b = bitarray(endian='big')
+        >>> b.frombytes(data)
+        >>> Raw(nbBytes=(1, 3)).candidateLengths(b)
+        [24, 16, 8]
+        >>> Raw(alphabet=[b"\\x01", b"\\x02"]).candidateLengths(b)
+        [16, 8]
+
+        """
+
+        # A constant value only leads to a single candidate
+        if self.value is not None:
+            return super(Raw, self).candidateLengths(data, minSize, maxSize, followingValue)
+
+        start = self._candidateLengthsStart(data, maxSize)
+
+        # The prefixes to test are either all byte-aligned or none of them is
+        if start % 8 != 0:
+            return []
+
+        (minBits, maxBits) = self.size
+        minSize = max(minSize, minBits if minBits is not None else 0, 1)
+        if maxBits is not None and start > maxBits:
+            # Keep the sizes on the parser steps of 8 bits
+            start -= (start - maxBits + 7) // 8 * 8
+
+        # The first byte outside the alphabet bounds the valid prefixes
+        if self.alphabet is not None:
+            rawData = data[:start].tobytes()
+            for (position, element) in enumerate(rawData):
+                if bytes([element]) not in self.alphabet:
+                    start = position * 8
+                    break
+
+        return [size for size in range(start, minSize - 1, -8)
+                if self._isFollowedBy(data, size, followingValue)]
+
     @property
     def alphabet(self):
         return self.__alphabet
@@ -659,6 +659,104 @@ class String(AbstractType):
 
         return True
 
+    def candidateLengths(self, data, minSize=0, maxSize=None, followingValue=None):
+        """This method returns the lengths (in bits) of the prefixes of
+        the specified data that can be parsed as the current String,
+        from the longest to the shortest (see
+        :meth:`AbstractType.candidateLengths`).
+
+        The encoding validity of all the prefixes is computed in one
+        pass over the data, and the prefixes that do not end with one
+        of the terminal characters (``eos``) are skipped.
+
+        >>> from netzob.all import *
+        >>> data = "hé ;".encode("utf-8")
+        >>> b = bitarray(endian='big')
+        >>> b.frombytes(data)
+        >>> String().candidateLengths(b)
+        [40, 32, 24, 8]
+        >>> String(encoding='ascii').candidateLengths(b)
+        [8]
+        >>> String(eos=[" "]).candidateLengths(b)
+        [32]
+        >>> String().candidateLengths(b, followingValue=String(";").value)
+        [32]
+
+        """
+
+        # A constant value only leads to a single candidate
+        if self.value is not None:
+            return super(String, self).candidateLengths(data, minSize, maxSize, followingValue)
+
+        start = self._candidateLengthsStart(data, maxSize)
+
+        # Strings are made of bytes: the prefixes to test are either all
+        # byte-aligned or none of them is
+        if start % 8 != 0:
+            return []
+
+        rawData = data[:start].tobytes()
+
+        (minChar, maxChar) = self.size
+        minBytes = max(minSize, minChar if minChar is not None else 0, 1)
+        minBytes = (minBytes + 7) // 8
+        maxBytes = len(rawData)
+        if maxChar is not None:
+            maxBytes = min(maxBytes, maxChar // 8)
+
+        results = []
+        for nbBytes in self._decodablePrefixLengths(rawData, minBytes, maxBytes):
+
+            # Verify the terminal character
+            if len(self.eos) > 0:
+                for permitted_element in self.eos:
+                    if nbBytes >= len(permitted_element) > 0 and \
+                       rawData[nbBytes - len(permitted_element):nbBytes] == permitted_element:
+                        break
+                else:
+                    continue
+
+            if self._isFollowedBy(data, nbBytes * 8, followingValue):
+                results.append(nbBytes * 8)
+
+        return results
+
+    def _decodablePrefixLengths(self, rawData, minBytes, maxBytes):
+        """Yields, from the longest to the shortest, the lengths (in bytes)
+        between minBytes and maxBytes of the prefixes of rawData that
+        can be decoded with the current encoding."""
+
+        if maxBytes < minBytes:
+            return
+
+        codecName = codecs.lookup(self.encoding).name
+
+        if codecName in ('utf-8', 'ascii', 'iso8859-1'):
+            # The first decoding error bounds the valid prefixes
+            try:
+                rawData[:maxBytes].decode(self.encoding)
+                errorPosition = maxBytes
+            except UnicodeDecodeError as e:
+                errorPosition = e.start
+
+            for nbBytes in range(errorPosition, minBytes - 1, -1):
+                # In UTF-8, a prefix cannot end in the middle of a character
+                if codecName == 'utf-8' and nbBytes < errorPosition and rawData[nbBytes] & 0xC0 == 0x80:
+                    continue
+                yield nbBytes
+        else:
+            # Generic case: incremental decoding of the data
+            decoder = codecs.getincrementaldecoder(self.encoding)()
+            validLengths = []
+            for nbBytes in range(1, maxBytes + 1):
+                try:
+                    decoder.decode(rawData[nbBytes - 1:nbBytes])
+                except UnicodeDecodeError:
+                    break
+                if nbBytes >= minBytes and len(decoder.getstate()[0]) == 0:
+                    validLengths.append(nbBytes)
+            yield from reversed(validLengths)
+
     @staticmethod
     def decode(data,
                unitSize=AbstractType.defaultUnitSize(),
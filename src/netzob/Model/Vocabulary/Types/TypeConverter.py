@@ -28,27 +28,241 @@
 # +---------------------------------------------------------------------------+
 # | Standard library imports                                                  |
 # +---------------------------------------------------------------------------+
+import binascii
+import struct
 
 # +---------------------------------------------------------------------------+
 # | Related third party imports                                               |
 # +---------------------------------------------------------------------------+
+from bitarray import bitarray
 
 # +---------------------------------------------------------------------------+
 # | Local application imports                                                 |
 # +---------------------------------------------------------------------------+
-from netzob.Model.Vocabulary.Types.AbstractType import AbstractType, Endianness, UnitSize
+from netzob.Model.Vocabulary.Types.AbstractType import AbstractType, Endianness, Sign, UnitSize
+from netzob.Model.Vocabulary.Types.BitArray import BitArray
+from netzob.Model.Vocabulary.Types.HexaString import HexaString
+from netzob.Model.Vocabulary.Types.Integer import Integer
 from netzob.Model.Vocabulary.Types.Raw import Raw
 
 
 class TypeConverter(object):
     """The TypeConverter class provides a conversion function between types.
+
+    The conversion functions are built once for each combination of
+    types, unit sizes, endiannesses and signs, and then reused by the
+    following conversions. Conversions between :class:`Raw`,
+    :class:`BitArray`, :class:`HexaString` and :class:`Integer` do not go
+    through the generic decoding and encoding methods of the types.
     """
 
+    # Cache of the conversion functions
+    __converters = {}
+
+    __defaultUnitSize = AbstractType.defaultUnitSize()
+    __defaultEndianness = AbstractType.defaultEndianness()
+    __defaultSign = AbstractType.defaultSign()
+
+    @staticmethod
+    def getConverter(sourceType,
+                     destinationType,
+                     src_unitSize=AbstractType.defaultUnitSize(),
+                     src_endianness=AbstractType.defaultEndianness(),
+                     src_sign=AbstractType.defaultSign(),
+                     dst_unitSize=AbstractType.defaultUnitSize(),
+                     dst_endianness=AbstractType.defaultEndianness(),
+                     dst_sign=AbstractType.defaultSign()):
+        r"""This function returns the function that converts data from a
+        sourceType to a destinationType. It takes the same parameters as
+        :meth:`convert`, except the data, and is useful to convert many
+        values the same way.
+
+        >>> from netzob.all import *
+        >>> toInteger = TypeConverter.getConverter(Raw, Integer,
+        ...                                        dst_unitSize=UnitSize.SIZE_16,
+        ...                                        dst_sign=Sign.UNSIGNED)
+        >>> toInteger(b"\x01\x02")
+        258
+        >>> toInteger is TypeConverter.getConverter(Raw, Integer,
+        ...                                         dst_unitSize=UnitSize.SIZE_16,
+        ...                                         dst_sign=Sign.UNSIGNED)
+        True
+        >>> TypeConverter.getConverter(Raw, HexaString)(b"\xca\xfe")
+        b'cafe'
+
+        :raise: TypeError if parameters are not valid
+        """
+        key = TypeConverter.__key(sourceType, destinationType, src_unitSize,
+                                  src_endianness, src_sign, dst_unitSize,
+                                  dst_endianness, dst_sign)
+        try:
+            return TypeConverter.__converters[key]
+        except KeyError:
+            pass
+
+        # are the two formats supported ?
+        if not issubclass(sourceType, AbstractType):
+            raise TypeError(
+                "The source type ({0}) is not supported".format(sourceType))
+        if not issubclass(destinationType, AbstractType):
+            raise TypeError("The destination type ({0}) is not supported".
+                            format(destinationType))
+
+        decode = TypeConverter.__decoder(sourceType, src_unitSize,
+                                         src_endianness, src_sign)
+        encode = TypeConverter.__encoder(destinationType, dst_unitSize,
+                                         dst_endianness, dst_sign)
+        if decode is None and encode is None:
+            converter = TypeConverter.__identity
+        elif decode is None:
+            converter = encode
+        elif encode is None:
+            converter = decode
+        else:
+            def converter(data):
+                return encode(decode(data))
+
+        TypeConverter.__converters[key] = converter
+        return converter
+
+    @staticmethod
+    def __key(sourceType, destinationType, src_unitSize, src_endianness,
+              src_sign, dst_unitSize, dst_endianness, dst_sign):
+        """Returns the key of a conversion function in the cache."""
+
+        # Hashing enums is slow, most conversions use the default ones
+        if (src_unitSize is TypeConverter.__defaultUnitSize
+                and dst_unitSize is TypeConverter.__defaultUnitSize
+                and src_endianness is TypeConverter.__defaultEndianness
+                and dst_endianness is TypeConverter.__defaultEndianness
+                and src_sign is TypeConverter.__defaultSign
+                and dst_sign is TypeConverter.__defaultSign):
+            return (sourceType, destinationType)
+        return (sourceType, destinationType, src_unitSize, src_endianness,
+                src_sign, dst_unitSize, dst_endianness, dst_sign)
+
+    @staticmethod
+    def __identity(data):
+        return data
+
+    @staticmethod
+    def __decoder(sourceType, unitSize, endianness, sign):
+        """Returns the function that converts data from the sourceType to
+        raw, or None if the sourceType is raw."""
+
+        if sourceType.decode is Raw.decode:
+            return None
+        if sourceType.decode is BitArray.decode:
+            return TypeConverter.__bitArrayToRaw
+        if sourceType.decode is HexaString.decode:
+            return HexaString.decode
+        if sourceType.decode is Integer.decode:
+            pack = TypeConverter.__integerPacker(unitSize, endianness, sign)
+            if pack is not None:
+                return pack
+
+        decode = sourceType.decode
+
+        def decoder(data):
+            return decode(data, unitSize=unitSize, endianness=endianness,
+                          sign=sign)
+        return decoder
+
+    @staticmethod
+    def __encoder(destinationType, unitSize, endianness, sign):
+        """Returns the function that converts raw data to the
+        destinationType, or None if the destinationType is raw."""
+
+        if destinationType.encode is Raw.encode:
+            return None
+        if destinationType.encode is BitArray.encode:
+            return TypeConverter.__rawToBitArray
+        if destinationType.encode is HexaString.encode:
+            return binascii.hexlify
+        if destinationType.encode is Integer.encode:
+            unpack = TypeConverter.__integerUnpacker(unitSize, endianness, sign)
+            if unpack is not None:
+                return unpack
+
+        encode = destinationType.encode
+
+        def encoder(data):
+            return encode(data, unitSize=unitSize, endianness=endianness,
+                          sign=sign)
+        return encoder
+
+    @staticmethod
+    def __bitArrayToRaw(data):
+        return data.tobytes()
+
+    @staticmethod
+    def __rawToBitArray(data):
+        if data.__class__ is not bytes:
+            return BitArray.encode(data)
+        b = bitarray()
+        b.frombytes(data)
+        return b
+
+    @staticmethod
+    def __integerPacker(unitSize, endianness, sign):
+        """Returns a function equivalent to :meth:`Integer.decode`, or None
+        if the parameters are not supported by the fast path."""
+
+        if unitSize not in (UnitSize.SIZE_8, UnitSize.SIZE_16, UnitSize.SIZE_24,
+                            UnitSize.SIZE_32, UnitSize.SIZE_64):
+            return None
+        if endianness not in (Endianness.BIG, Endianness.LITTLE):
+            return None
+        pack = struct.Struct(Integer.computeFormat(unitSize, endianness,
+                                                   sign)).pack
+
+        if unitSize != UnitSize.SIZE_24:
+            def packer(data):
+                return pack(int(data))
+        elif endianness == Endianness.BIG:
+            def packer(data):
+                return pack(int(data))[1:]
+        else:
+            def packer(data):
+                return pack(int(data))[:-1]
+        return packer
+
     @staticmethod
-    def __directEncoding():
-        return {
-            # (String, bitarray):TypeConverter.__encodeStringToBitarray,
-        }
+    def __integerUnpacker(unitSize, endianness, sign):
+        """Returns a function equivalent to :meth:`Integer.encode`, or None
+        if the parameters are not supported by the fast path.
+
+        The data is converted with :meth:`int.from_bytes` when it holds a
+        single word, or only unsigned bytes whose words are combined in
+        little endian order. Other data is converted by
+        :meth:`Integer.encode`."""
+
+        if unitSize not in (UnitSize.SIZE_8, UnitSize.SIZE_16, UnitSize.SIZE_24,
+                            UnitSize.SIZE_32, UnitSize.SIZE_64):
+            return None
+        if endianness == Endianness.BIG:
+            byteorder = "big"
+        elif endianness == Endianness.LITTLE:
+            byteorder = "little"
+        else:
+            return None
+        if sign not in (Sign.SIGNED, Sign.UNSIGNED):
+            return None
+        signed = sign == Sign.SIGNED
+        wordSize = unitSize.value // 8
+        bytesOnly = unitSize == UnitSize.SIZE_8 and not signed
+        from_bytes = int.from_bytes
+        encode = Integer.encode
+
+        def unpacker(data):
+            if data.__class__ is bytes:
+                if len(data) == wordSize:
+                    return from_bytes(data, byteorder, signed=signed)
+                if bytesOnly:
+                    return from_bytes(data, "little")
+            return encode(data, unitSize=unitSize, endianness=endianness,
+                          sign=sign)
+        return unpacker
 
     @staticmethod
     def convert(data,
@@ -119,43 +333,14 @@ class TypeConverter(object):
         IPAddress('10.0.168.192')
 
         """
-        # are the two formats supported ?
-        if not issubclass(sourceType, AbstractType):
-            raise TypeError(
-                "The source type ({0}) is not supported".format(sourceType))
-        if not issubclass(destinationType, AbstractType):
-            raise TypeError("The destination type ({0}) is not supported".
-                            format(destinationType))
+        key = TypeConverter.__key(sourceType, destinationType, src_unitSize,
+                                  src_endianness, src_sign, dst_unitSize,
+                                  dst_endianness, dst_sign)
+        converter = TypeConverter.__converters.get(key)
+        if converter is None:
+            converter = TypeConverter.getConverter(
+                sourceType, destinationType, src_unitSize, src_endianness,
+                src_sign, dst_unitSize, dst_endianness, dst_sign)
         if data is None:
             raise TypeError("Data cannot be None")
-
-        # Do we have a specific source to destination encoding function
-        if (sourceType, destinationType
-            ) in list(TypeConverter.__directEncoding().keys()):
-            func = TypeConverter.__directEncoding()[(sourceType,
-                                                     destinationType)]
-            return func(data, src_unitSize, src_endianness, src_sign,
-                        dst_unitSize, dst_endianness, dst_sign)
-        else:
-
-            # Convert from source to raw
-            if sourceType is not Raw:
-                binData = sourceType.decode(
-                    data,
-                    unitSize=src_unitSize,
-                    endianness=src_endianness,
-                    sign=src_sign)
-            else:
-                binData = data
-
-            # Convert from raw to Destination
-            if destinationType is not Raw:
-                outputData = destinationType.encode(
-                    binData,
-                    unitSize=dst_unitSize,
-                    endianness=dst_endianness,
-                    sign=dst_sign)
-            else:
-                outputData = binData
-
-            return outputData
+        return converter(data)
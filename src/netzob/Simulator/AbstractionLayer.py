@@ -56,6 +56,10 @@ from netzob.Model.Vocabulary.Domain.Variables.Memory import Memory
 from netzob.Model.Vocabulary.Domain.Specializer.MessageSpecializer import MessageSpecializer
 from netzob.Model.Vocabulary.Domain.Parser.MessageParser import MessageParser
 from netzob.Model.Vocabulary.Domain.Parser.FlowParser import FlowParser
+from netzob.Model.Vocabulary.Domain.Parser.SymbolIndex import SymbolIndex
+from netzob.Model.Vocabulary.Types.TypeConverter import TypeConverter
+from netzob.Model.Vocabulary.Types.BitArray import BitArray
+from netzob.Model.Vocabulary.Types.Raw import Raw
 from netzob.Model.Vocabulary.Messages.RawMessage import RawMessage
 from netzob.Model.Vocabulary.UnknownSymbol import UnknownSymbol
 from netzob.Common.Utils.DataAlignment.DataAlignment import DataAlignment
@@ -204,6 +208,7 @@ class AbstractionLayer(object):
         self.__specializer = None
         self.__parser = None
         self.__flow_parser = None
+        self.__symbol_index = None
         if self.actor is None:
             self.memory = Memory()  # self.memory expects specializer, parser and flow_parser to be initialized
         self.__specializer = MessageSpecializer(memory=self.memory)
@@ -293,14 +298,16 @@ class AbstractionLayer(object):
                 if t_delta > 1:
                     t_delta = 0
                     if rate is None:
-                        self._logger.debug("Current rate: {} ko/s, sent data: {} ko, nb seconds elapsed: {}".format(round((data_len / t_elapsed) / 1024, 2),
-                                                                                                                    round(data_len / 1024, 2),
-                                                                                                                    round(t_elapsed, 2)))
+                        self._logger.debug("Current rate: {} ko/s, sent data: {} ko, nb seconds elapsed: {}",
+                                           round((data_len / t_elapsed) / 1024, 2),
+                                           round(data_len / 1024, 2),
+                                           round(t_elapsed, 2))
                     else:
-                        self._logger.debug("Rate rule: {} ko/s, current rate: {} ko/s, sent data: {} ko, nb seconds elapsed: {}".format(round(rate / 1024, 2),
-                                                                                                                                        round((data_len / t_elapsed) / 1024, 2),
-                                                                                                                                        round(data_len / 1024, 2),
-                                                                                                                                        round(t_elapsed, 2)))
+                        self._logger.debug("Rate rule: {} ko/s, current rate: {} ko/s, sent data: {} ko, nb seconds elapsed: {}",
+                                           round(rate / 1024, 2),
+                                           round((data_len / t_elapsed) / 1024, 2),
+                                           round(data_len / 1024, 2),
+                                           round(t_elapsed, 2))
         return (data, data_len, data_structure)
 
     def _writeSymbol(self, symbol, preset=None, cbk_action=None):
@@ -309,10 +316,10 @@ class AbstractionLayer(object):
 
         data_len = 0
         if isinstance(symbol, EmptySymbol):
-            self._logger.debug("Symbol to write is an EmptySymbol. So nothing to do.".format(symbol.name))
+            self._logger.debug("Symbol to write is an EmptySymbol. So nothing to do.")
             return (b'', data_len, OrderedDict())
 
-        self._logger.debug("Specializing symbol '{0}' (id={1}).".format(symbol.name, id(symbol)))
+        self._logger.debug("Specializing symbol '{0}' (id={1}).", symbol.name, id(symbol))
 
         self.__specializer.preset = preset
         path = next(self.__specializer.specializeSymbol(symbol))
@@ -333,8 +340,8 @@ class AbstractionLayer(object):
         self.memory = self.__specializer.memory
         self.__parser.memory = self.memory
 
-        self._logger.debug("Writing the following data to the commnunication channel: '{}'".format(data))
-        self._logger.debug("Writing the following symbol to the commnunication channel: '{}'".format(symbol.name))
+        self._logger.debug("Writing the following data to the commnunication channel: '{}'", data)
+        self._logger.debug("Writing the following symbol to the commnunication channel: '{}'", symbol.name)
 
         try:
             data_len = self.channel.write(data)
@@ -342,7 +349,7 @@ class AbstractionLayer(object):
             self._logger.debug("Timeout on channel.write(...)")
             raise
         except Exception as e:
-            self._logger.debug("Exception on channel.write(...): '{}'".format(e))
+            self._logger.debug("Exception on channel.write(...): '{}'", e)
             raise
 
         self.last_sent_symbol = symbol
@@ -350,7 +357,7 @@ class AbstractionLayer(object):
         self.last_sent_structure = data_structure
 
         for cbk in cbk_action:
-            self._logger.debug("[actor='{}'] A callback function is defined for the write symbol event".format(self.actor))
+            self._logger.debug("[actor='{}'] A callback function is defined for the write symbol event", self.actor)
             cbk(symbol, data, data_structure, Operation.SPECIALIZE, self.actor.current_state, self.actor.memory)
 
         return (data, data_len, data_structure)
@@ -376,7 +383,7 @@ class AbstractionLayer(object):
 
         self._logger.debug("Reading data from communication channel...")
         data = self.channel.read()
-        self._logger.debug("Received : {}".format(repr(data)))
+        self._logger.debug("Received : {!r}", data)
 
         symbols = []
 
@@ -443,19 +450,25 @@ class AbstractionLayer(object):
             self._logger.debug("Timeout on channel.read()")
             raise
         except Exception as e:
-            self._logger.debug("Exception on channel.read(): '{}'".format(e))
+            self._logger.debug("Exception on channel.read(): '{}'", e)
             raise
 
-        self._logger.debug("Received: {}".format(repr(data)))
+        self._logger.debug("Received: {!r}", data)
 
         symbol = None
         data_structure = {}
 
         # if we read some bytes, we try to abstract them in a symbol
         if len(data) > 0:
-            for potentialSymbol in self.symbols:
+            # Only try the symbols that may abstract the data, with their
+            # compiled parsing plans
+            symbolIndex = self._getSymbolIndex()
+            potentialSymbols = symbolIndex.candidates(
+                TypeConverter.convert(data, Raw, BitArray), self.__parser.memory)
+            for potentialSymbol in potentialSymbols:
                 try:
-                    aligned_data = DataAlignment.align([data], potentialSymbol, encoded=False, messageParser=self.__parser)
+                    aligned_data = DataAlignment.align([data], potentialSymbol, encoded=False, messageParser=self.__parser,
+                                                       parsingPlan=symbolIndex.getPlan(potentialSymbol))
 
                     symbol = potentialSymbol
                     self.memory = self.__parser.memory
@@ -481,11 +494,19 @@ class AbstractionLayer(object):
         self.last_received_message = data
         self.last_received_structure = data_structure
 
-        self._logger.debug("Receiving the following data from the commnunication channel: '{}'".format(data))
-        self._logger.debug("Receiving the following symbol from the commnunication channel: '{}'".format(symbol.name))
+        self._logger.debug("Receiving the following data from the commnunication channel: '{}'", data)
+        self._logger.debug("Receiving the following symbol from the commnunication channel: '{}'", symbol.name)
 
         return (symbol, data, data_structure)
 
+    def _getSymbolIndex(self):
+        """Returns the index of the permitted symbols, which is rebuilt
+        when the list of symbols changes."""
+
+        if self.__symbol_index is None or not self.__symbol_index.isUpToDate(self.symbols):
+            self.__symbol_index = SymbolIndex(self.symbols)
+        return self.__symbol_index
+
     def check_received(self):
         r"""Check is a message has been received on the underlying
         communicaton channel and which concerns the current actor.
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011-2017 Georges Bossert and Frédéric Guihéry              |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+"""Measures the import of a capture of UDP and TCP packets, with the fast
+decoding of the packets and with their decoding by impacket.
+
+Usage: PYTHONPATH=src:test/src python test/benchmarks/bench_pcapImport.py [nbPackets]
+"""
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import os
+import sys
+import tempfile
+import time
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.all import *
+from test_netzob.test_Import.test_PCAPImporter import writeCapture
+
+
+def measure(filePath, fastDecoding, importLayer=5):
+    """Returns the duration of the import of the capture, in seconds."""
+    importer = PCAPImporter(fastDecoding=fastDecoding)
+    start = time.perf_counter()
+    importer.readMessages([filePath], importLayer=importLayer,
+                          asMessageStore=True)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    nbPackets = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    (fd, filePath) = tempfile.mkstemp(suffix=".pcap")
+    os.close(fd)
+    try:
+        writeCapture(filePath, nbPackets)
+        for importLayer in [2, 3, 4, 5]:
+            fastDuration = measure(filePath, True, importLayer)
+            duration = measure(filePath, False, importLayer)
+            print("Layer {0}: {1:.2f} s for {2} packets, {3:.2f} s with impacket (x{4:.1f})".
+                  format(importLayer, fastDuration, nbPackets, duration,
+                         duration / fastDuration))
+    finally:
+        os.remove(filePath)
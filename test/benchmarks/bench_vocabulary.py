@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011-2017 Georges Bossert and Frédéric Guihéry              |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+"""Measures the duration of abstract() and specialize() on a small symbol,
+with and without the type checking of the arguments, and with lazy or
+eager formatting of the log messages.
+
+Usage: PYTHONPATH=src python test/benchmarks/bench_vocabulary.py
+"""
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import time
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.all import *
+from netzob.Common.Utils.Decorators import setTypeCheck, LazyLogger
+
+NB_MESSAGES = 200
+
+
+def buildSymbol():
+    f1 = Field(String("hello"), name="f1")
+    f2 = Field(uint16(), name="f2")
+    f3 = Field(Raw(nbBytes=(2, 8)), name="f3")
+    return Symbol([f1, f2, f3], name="symbol")
+
+
+def measure(function, repeat=5):
+    """Returns the best duration of the function, in microseconds per message."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return min(durations) / NB_MESSAGES * 1e6
+
+
+def benchmarkVocabulary(symbol):
+    """Returns the durations of abstract() and specialize() of the symbol."""
+    messages = [next(symbol.specialize()) for _ in range(NB_MESSAGES)]
+
+    def abstractMessages():
+        for message in messages:
+            symbol.abstract(message)
+
+    def specializeMessages():
+        for _ in range(NB_MESSAGES):
+            next(symbol.specialize())
+
+    return (measure(abstractMessages), measure(specializeMessages))
+
+
+def benchmarkTypeCheck(symbol):
+    setTypeCheck(True)
+    (abstractChecked, specializeChecked) = benchmarkVocabulary(symbol)
+    setTypeCheck(False)
+    (abstractUnchecked, specializeUnchecked) = benchmarkVocabulary(symbol)
+    setTypeCheck(True)
+
+    print("abstract(): {0:.1f} us per message, {1:.1f} us without type checking".
+          format(abstractChecked, abstractUnchecked))
+    print("specialize(): {0:.1f} us per message, {1:.1f} us without type checking".
+          format(specializeChecked, specializeUnchecked))
+
+
+def benchmarkLogging(symbol):
+    (abstractLazy, specializeLazy) = benchmarkVocabulary(symbol)
+
+    # Format the messages before checking their level, as str.format() did
+    lazyLog = LazyLogger.log
+
+    def eagerLog(self, level, msg, *args, **kwargs):
+        if len(args) > 0:
+            msg = msg.format(*args)
+        lazyLog(self, level, msg, **kwargs)
+
+    LazyLogger.log = eagerLog
+    try:
+        (abstractEager, specializeEager) = benchmarkVocabulary(symbol)
+    finally:
+        LazyLogger.log = lazyLog
+
+    print("abstract(): {0:.1f} us per message, {1:.1f} us with eager log formatting".
+          format(abstractLazy, abstractEager))
+    print("specialize(): {0:.1f} us per message, {1:.1f} us with eager log formatting".
+          format(specializeLazy, specializeEager))
+
+
+if __name__ == "__main__":
+    symbol = buildSymbol()
+    benchmarkTypeCheck(symbol)
+    benchmarkLogging(symbol)
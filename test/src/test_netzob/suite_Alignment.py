@@ -30,7 +30,7 @@
 #| Standard library imports
 #+---------------------------------------------------------------------------+
 import unittest
-from test_netzob.test_Alignment import test_Needleman
+from test_netzob.test_Alignment import test_Needleman, test_ClusterByAlignment
 
 #+---------------------------------------------------------------------------+
 #| Local application imports
@@ -40,7 +40,7 @@ from test_netzob.test_Alignment import test_Needleman
 def getSuite():
     alignmentSuite = unittest.TestSuite()
 
-    modulesOfTests = [test_Needleman]
+    modulesOfTests = [test_Needleman, test_ClusterByAlignment]
     modulesOfSuites = []
 
     # Add individual tests
@@ -30,7 +30,7 @@
 #| Standard library imports
 #+---------------------------------------------------------------------------+
 import unittest
-from test_netzob.test_Common import suite_Type, suite_Functions, test_Field
+from test_netzob.test_Common import suite_Type, suite_Functions, test_Field, test_TypeCheck, test_Logging
 
 #+---------------------------------------------------------------------------+
 #| Local application imports
@@ -40,7 +40,7 @@ from test_netzob.test_Common import suite_Type, suite_Functions, test_Field
 def getSuite():
     commonSuite = unittest.TestSuite()
 
-    modulesOfTests = [test_Field]
+    modulesOfTests = [test_Field, test_TypeCheck, test_Logging]
     modulesOfSuites = [suite_Type, suite_Functions]
 
     # Add individual tests
@@ -40,6 +40,7 @@ from netzob.all import *
 from netzob.Common.Utils.DataAlignment import ParallelDataAlignment
 from netzob.Common.Utils.DataAlignment import DataAlignment
 from netzob.Model.Vocabulary import AbstractField
+from netzob.Model.Symbols import Symbols
 from netzob.Model.Vocabulary.Domain.Variables import AbstractVariable
 from netzob.Model.Vocabulary.Messages import AbstractMessage
 
@@ -53,6 +54,7 @@ from netzob.Inference.Vocabulary.FormatOperations import ClusterBySize
 from netzob.Inference.Vocabulary.FormatOperations import FindKeyFields
 from netzob.Common.Utils import SortedTypedList
 from netzob.Common.Utils import MessageCells
+from netzob.Common.Utils import Decorators
 
 from netzob.Inference.Vocabulary.Search import SearchTask
 from netzob.Inference.Vocabulary.Search import SearchResult
@@ -66,6 +68,11 @@ from netzob.Model.Vocabulary.Domain.Specializer.VariableSpecializer import Varia
 from netzob.Model.Vocabulary.Domain.Variables.Scope import Scope
 
 from netzob.Model.Vocabulary.Domain.Parser.MessageParser import MessageParser
+from netzob.Model.Vocabulary.Domain.Parser.ParsingPlan import ParsingPlan
+from netzob.Model.Vocabulary.Domain.Parser.SymbolIndex import SymbolIndex
+from netzob.Import.PCAPImporter.TCPReassembler import TCPReassembler
+from netzob.Import.PCAPImporter.CaptureFile import CaptureFile
+from netzob.Import.PCAPImporter.CaptureCache import CaptureCache
 from netzob.Model.Vocabulary.Domain.Specializer.MessageSpecializer import MessageSpecializer
 from netzob.Model.Vocabulary.Domain.Parser.FlowParser import FlowParser
 
@@ -123,6 +130,7 @@ def getSuite():
         # Modules related to the vocabulary
         # ---------------------------------
         Protocol.__module__,
+        Symbols.__module__,
         Field.__module__,
         DataAlignment, 
         ParallelDataAlignment,        
@@ -152,6 +160,7 @@ def getSuite():
         L3NetworkMessage.__module__,
         L4NetworkMessage.__module__,
         FileMessage.__module__,
+        MessageStore.__module__,
         FieldOperations,
         CorrelationFinder.__module__,
         RelationFinder.__module__,
@@ -159,6 +168,7 @@ def getSuite():
         Session.__module__,
         SortedTypedList,
         MessageCells,
+        Decorators,
         ApplicativeData.__module__,
         DomainEncodingFunction.__module__,
         TypeEncodingFunction.__module__,
@@ -206,6 +216,8 @@ def getSuite():
         InternetChecksum.__module__,
         
         MessageParser.__module__,
+        ParsingPlan.__module__,
+        SymbolIndex.__module__,
         MessageSpecializer.__module__,
 
         FlowParser.__module__,
@@ -269,6 +281,9 @@ def getSuite():
         # Modules related to the import
         # -----------------------------
         PCAPImporter.__module__,
+        TCPReassembler.__module__,
+        CaptureFile.__module__,
+        CaptureCache.__module__,
         FileImporter.__module__
 
         # Other
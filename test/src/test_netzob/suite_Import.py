@@ -30,7 +30,7 @@
 #| Standard library imports
 #+---------------------------------------------------------------------------+
 import unittest
-from test_netzob.test_Import import suite_Type, test_ExecutionContext  # to be modified by maxime
+from test_netzob.test_Import import test_PCAPImporter
 
 #+---------------------------------------------------------------------------+
 #| Local application imports
@@ -40,8 +40,8 @@ from test_netzob.test_Import import suite_Type, test_ExecutionContext  # to be m
 def getSuite():
     importSuite = unittest.TestSuite()
 
-    modulesOfTests = [test_ExecutionContext]
-    modulesOfSuites = [suite_Type]
+    modulesOfTests = [test_PCAPImporter]
+    modulesOfSuites = []
 
     # Add individual tests
     for module in modulesOfTests:
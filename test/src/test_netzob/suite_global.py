@@ -40,7 +40,7 @@ from test_netzob import suite_Tutorials
 from test_netzob import suite_DocTests
 import test_netzob.test_public_api as test_public_api
 
-#from test_netzob import suite_Import
+from test_netzob import suite_Import
 from common.xmlrunner import XMLTestRunner
 
 
@@ -50,6 +50,7 @@ def getSuite():
     modulesOfTests = []
     modulesOfSuites = [
         suite_DocTests,  # tests extracted from docstrings (doctests)
+        suite_Import,
         # suite_Common,
         # suite_Tutorials
     ]
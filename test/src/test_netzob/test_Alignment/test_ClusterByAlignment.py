@@ -0,0 +1,112 @@
+
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011-2017 Georges Bossert and Frédéric Guihéry              |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import unittest
+
+import numpy
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.all import *
+from netzob.Inference.Vocabulary.FormatOperations.ClusterByAlignment import ClusterByAlignment
+
+
+def computeTree(scores, nbSymbols, minEquivalence):
+    """Reference UPGMA: the scores of all the pairs of clusters are
+    compared at each step, and the pair of the oldest clusters is merged
+    first among the pairs with the highest score. Returns the indexes of
+    the symbols of each cluster, in their order of creation."""
+    clusters = {k: [k] for k in range(nbSymbols)}
+    ranks = {k: k for k in range(nbSymbols)}
+    pairScores = {}
+    for i in range(nbSymbols):
+        for j in range(i + 1, nbSymbols):
+            pairScores[(i, j)] = scores[ClusterByAlignment._condensedIndex(
+                i, j, nbSymbols)]
+    nextRank = nbSymbols
+    while len(clusters) > 1:
+        (i, j) = min(pairScores, key=lambda pair: (
+            -pairScores[pair], sorted([ranks[pair[0]], ranks[pair[1]]])))
+        if pairScores[(i, j)] < minEquivalence:
+            break
+        (size_i, size_j) = (len(clusters[i]), len(clusters[j]))
+        for k in clusters:
+            if k in (i, j):
+                continue
+            (pair_i, pair_j) = ((min(i, k), max(i, k)), (min(j, k), max(j, k)))
+            pairScores[pair_i] = numpy.float32(
+                (size_i * numpy.float64(pairScores[pair_i]) +
+                 size_j * numpy.float64(pairScores[pair_j])) /
+                (size_i + size_j))
+        pairScores = {pair: score for (pair, score) in pairScores.items()
+                      if j not in pair}
+        # The messages of the newest cluster are first
+        if ranks[i] < ranks[j]:
+            clusters[i] = clusters[j] + clusters[i]
+        else:
+            clusters[i] = clusters[i] + clusters[j]
+        del clusters[j]
+        ranks[i] = nextRank
+        nextRank += 1
+    return [clusters[k] for k in sorted(clusters, key=lambda k: ranks[k])]
+
+
+class test_ClusterByAlignment(unittest.TestCase):
+
+    def test_tiedScores(self):
+        randomState = numpy.random.RandomState(0)
+        for nbSymbols in [2, 3, 10, 40]:
+            messages = [RawMessage(bytes([k])) for k in range(nbSymbols)]
+            # Few distinct scores, so that most of the pairs are tied
+            for nbScores in [1, 2, 4]:
+                scores = (randomState.randint(0, nbScores, nbSymbols *
+                                         (nbSymbols - 1) // 2) * 30 + 10)
+                scores = scores.astype(numpy.float32)
+                expected = computeTree(scores, nbSymbols, 50)
+
+                clustering = ClusterByAlignment(minEquivalence=50)
+                clustering.scores = scores.copy()
+                (symbols, guideTrees) = clustering._computePhylogenicTree(
+                    [Symbol(messages=[message]) for message in messages],
+                    None)
+                self.assertEqual(
+                    [[messages.index(m) for m in symbol.messages]
+                     for symbol in symbols], expected)
+
+    def test_duplicatedMessages(self):
+        messages = [RawMessage(b"hello world") for _ in range(300)]
+        messages += [RawMessage(b"\x01\x02\x03\x04") for _ in range(100)]
+        symbols = ClusterByAlignment(minEquivalence=80).cluster(messages)
+        self.assertEqual(sorted(len(symbol.messages) for symbol in symbols),
+                         [100, 300])
+        for symbol in symbols:
+            self.assertEqual(len(set(m.data for m in symbol.messages)), 1)
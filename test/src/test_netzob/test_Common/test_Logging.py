@@ -0,0 +1,84 @@
+
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011-2017 Georges Bossert and Frédéric Guihéry              |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import logging
+import unittest
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.all import *
+from netzob.Common.Utils.Decorators import NetzobLogger, LazyLogger
+
+
+class RecordHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append((record.funcName, record.getMessage()))
+
+
+class Unprintable(object):
+
+    def __str__(self):
+        raise AssertionError("The message should not be formatted")
+
+
+@NetzobLogger
+class LoggingExample(object):
+
+    def run(self, value):
+        self._logger.debug("Value: {0}", value)
+
+
+class test_Logging(unittest.TestCase):
+
+    def setUp(self):
+        self.handler = RecordHandler()
+        self.logger = LoggingExample._logger
+        self.logger.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        self.logger.logger.removeHandler(self.handler)
+        self.logger.setLevel(logging.NOTSET)
+
+    def test_lazyFormatting(self):
+        self.assertIsInstance(self.logger, LazyLogger)
+
+        self.logger.setLevel(logging.WARNING)
+        LoggingExample().run(Unprintable())
+        self.assertEqual(self.handler.records, [])
+
+        self.logger.setLevel(logging.DEBUG)
+        LoggingExample().run(42)
+        self.assertEqual(self.handler.records, [("run", "Value: 42")])
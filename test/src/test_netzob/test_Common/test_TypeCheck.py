@@ -0,0 +1,73 @@
+
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011-2017 Georges Bossert and Frédéric Guihéry              |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import unittest
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.all import *
+from netzob.Common.Utils.Decorators import setTypeCheck, isTypeCheckEnabled
+
+
+class test_TypeCheck(unittest.TestCase):
+
+    def tearDown(self):
+        setTypeCheck(True)
+
+    def test_runtimeToggle(self):
+        module = "netzob.Model.Vocabulary"
+        setTypeCheck(False, module)
+        self.assertFalse(isTypeCheckEnabled("netzob.Model.Vocabulary.Field"))
+        self.assertTrue(isTypeCheckEnabled("netzob.Model.VocabularyOther"))
+        self.assertTrue(isTypeCheckEnabled("netzob.Import.PCAPImporter"))
+        Field().name = 42
+
+        setTypeCheck(True, module)
+        with self.assertRaises(TypeError):
+            Field().name = 42
+
+    def test_globalToggle(self):
+        setTypeCheck(False)
+        self.assertFalse(isTypeCheckEnabled("netzob.Model.Vocabulary.Field"))
+        Field().name = 42
+
+        setTypeCheck(True)
+        self.assertTrue(isTypeCheckEnabled("netzob.Model.Vocabulary.Field"))
+        with self.assertRaises(TypeError):
+            Field().name = 42
+
+    def test_checkedSymbol(self):
+        symbol = Symbol([Field(String("hello"), name="f1"),
+                         Field(uint16(), name="f2")])
+        message = next(symbol.specialize())
+        self.assertEqual(symbol.abstract(message)["f1"], b"hello")
+        with self.assertRaises(TypeError):
+            symbol.name = 42
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+
+#+---------------------------------------------------------------------------+
+#|          01001110 01100101 01110100 01111010 01101111 01100010            |
+#|                                                                           |
+#|               Netzob : Inferring communication protocols                  |
+#+---------------------------------------------------------------------------+
+#| Copyright (C) 2011-2017 Georges Bossert and Frédéric Guihéry              |
+#| This program is free software: you can redistribute it and/or modify      |
+#| it under the terms of the GNU General Public License as published by      |
+#| the Free Software Foundation, either version 3 of the License, or         |
+#| (at your option) any later version.                                       |
+#|                                                                           |
+#| This program is distributed in the hope that it will be useful,           |
+#| but WITHOUT ANY WARRANTY; without even the implied warranty of            |
+#| MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the              |
+#| GNU General Public License for more details.                              |
+#|                                                                           |
+#| You should have received a copy of the GNU General Public License         |
+#| along with this program. If not, see <http://www.gnu.org/licenses/>.      |
+#+---------------------------------------------------------------------------+
+#| @url      : http://www.netzob.org                                         |
+#| @contact  : contact@netzob.org                                            |
+#| @sponsors : Amossys, http://www.amossys.fr                                |
+#|             Supélec, http://www.rennes.supelec.fr/ren/rd/cidre/           |
+#+---------------------------------------------------------------------------+
+
+#+---------------------------------------------------------------------------+
+#| Standard library imports
+#+---------------------------------------------------------------------------+
+import os
+import struct
+import tempfile
+import unittest
+import warnings
+
+#+---------------------------------------------------------------------------+
+#| Local Imports
+#+---------------------------------------------------------------------------+
+from netzob.all import *
+from netzob.Import.PCAPImporter.TCPReassembler import TCPReassembler
+from netzob.Import.PCAPImporter.CaptureCache import CaptureCache
+
+
+def buildFrame(protocol, sourcePort, destinationPort, data, identifier=0,
+               destination=2, sequenceNumber=0, flags=0x18, vlan=False):
+    """Build an Ethernet frame of a UDP or TCP packet sent by 10.0.0.1 to
+    10.0.0.<destination>."""
+    if protocol == 17:
+        l4Header = struct.pack("!HHHH", sourcePort, destinationPort,
+                               8 + len(data), 0)
+    else:
+        l4Header = struct.pack("!HHIIBBHHH", sourcePort, destinationPort,
+                               sequenceNumber, 0, 0x80, flags, 1024, 0, 0)
+        l4Header += b"\x01\x01\x08\x0a" + b"\x00" * 8
+    l3Header = struct.pack("!BBHHHBBH4s4s", 0x45, 0,
+                           20 + len(l4Header) + len(data), identifier & 0xffff,
+                           0, 64, protocol, 0, bytes([10, 0, 0, 1]),
+                           bytes([10, 0, 0, destination]))
+    l2Header = bytes.fromhex("0001020304050a0b0c0d0e0f")
+    if vlan:
+        l2Header += b"\x81\x00\x00\x2a"
+    return l2Header + b"\x08\x00" + l3Header + l4Header + data
+
+
+def writeFrames(filePath, frames):
+    """Write an Ethernet capture of the specified (date, frame) pairs."""
+    with open(filePath, "wb") as f:
+        f.write(struct.pack("<IHHiIII", 0xa1b2c3d4, 2, 4, 0, 0, 65535, 1))
+        for (date, frame) in frames:
+            f.write(struct.pack("<IIII", int(date), round(date % 1 * 1000000),
+                                len(frame), len(frame)))
+            f.write(frame)
+
+
+def writeCapture(filePath, nbPackets):
+    """Write an Ethernet capture of UDP and TCP packets, every tenth one
+    being tagged with a VLAN."""
+    frames = []
+    for i in range(nbPackets):
+        data = b"CMD" + str(i).encode() + b"#" * (i % 40)
+        if i % 2 == 0:
+            frame = buildFrame(17, 1024 + i % 50, 53, data, i, 2 + i % 3,
+                               vlan=i % 10 == 0)
+        else:
+            frame = buildFrame(6, 1024 + i % 50, 80, data, i, 2 + i % 3,
+                               sequenceNumber=i, vlan=i % 10 == 0)
+        frames.append((1400000000 + i // 1000 + (i % 1000) / 1000, frame))
+    writeFrames(filePath, frames)
+
+
+def writePcapng(pcapPath, filePath):
+    """Convert a PCAP capture into a PCAPNG capture of two sections, whose
+    interfaces use a nanosecond timestamp resolution."""
+    capture = CaptureFile(pcapPath)
+    linkType = capture.datalink
+    half = len(capture) // 2
+    with open(filePath, "wb") as f:
+        for (start, end) in [(0, half), (half, len(capture))]:
+            f.write(struct.pack("<IIIHHqI", 0x0A0D0D0A, 28, 0x1A2B3C4D, 1, 0,
+                                -1, 28))
+            f.write(struct.pack("<IIHHIHHB3xHHI", 1, 32, linkType, 0, 0, 9, 1,
+                                9, 0, 0, 32))
+            for (date, _, data) in capture.iterPackets(start, end):
+                timestamp = round(date * 1000000) * 1000 + 999
+                padding = b"\x00" * (-len(data) % 4)
+                blockLength = 32 + len(data) + len(padding)
+                f.write(struct.pack("<IIIIIII", 6, blockLength, 0,
+                                    timestamp >> 32, timestamp & 0xffffffff,
+                                    len(data), len(data)))
+                f.write(data + padding + struct.pack("<I", blockLength))
+    capture.close()
+
+
+class test_PCAPImporter(unittest.TestCase):
+
+    def setUp(self):
+        (fd, self.capturePath) = tempfile.mkstemp(suffix=".pcap")
+        os.close(fd)
+
+    def tearDown(self):
+        CaptureCache(self.capturePath).clear()
+        os.remove(self.capturePath)
+
+    def readCapture(self, fastDecoding, importLayer=5):
+        importer = PCAPImporter(fastDecoding=fastDecoding)
+        return importer.readMessages(
+            [self.capturePath], importLayer=importLayer, asMessageStore=True)
+
+    def test_fastDecodingMatchesImpacket(self):
+        writeCapture(self.capturePath, 1000)
+        for importLayer in [2, 3, 4, 5]:
+            fastMessages = self.readCapture(True, importLayer)
+            messages = self.readCapture(False, importLayer)
+            self.assertEqual(len(fastMessages), len(messages))
+            for (fastMessage, message) in zip(fastMessages, messages):
+                self.assertEqual(fastMessage.data, message.data)
+                self.assertEqual(fastMessage.source, message.source)
+                self.assertEqual(fastMessage.destination, message.destination)
+                self.assertEqual(fastMessage.l2Protocol, message.l2Protocol)
+
+    def test_parallelImportMatchesSerial(self):
+        writeCapture(self.capturePath, 2000)
+        messages = PCAPImporter.readFile(self.capturePath, asMessageStore=True)
+        for nbProcesses in [2, 3]:
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always", ResourceWarning)
+                parallelMessages = PCAPImporter.readFiles(
+                    [self.capturePath, self.capturePath], asMessageStore=True,
+                    nbProcesses=nbProcesses)
+                shardedMessages = PCAPImporter.readFile(
+                    self.capturePath, asMessageStore=True,
+                    nbProcesses=nbProcesses)
+            # The files are opened by the processes, not by the caller
+            self.assertEqual(
+                [w for w in caught if issubclass(w.category, ResourceWarning)],
+                [])
+            self.assertEqual(len(parallelMessages), 2 * len(messages))
+            self.assertEqual(list(shardedMessages.iterData()),
+                             list(messages.iterData()))
+            self.assertEqual(list(shardedMessages.dates), list(messages.dates))
+            self.assertEqual(
+                [shardedMessages.getSource(i) for i in range(len(messages))],
+                [messages.getSource(i) for i in range(len(messages))])
+
+    def test_pcapngMatchesPcap(self):
+        writeCapture(self.capturePath, 1000)
+        pcapngPath = self.capturePath + "ng"
+        writePcapng(self.capturePath, pcapngPath)
+        try:
+            with CaptureFile(pcapngPath) as capture:
+                self.assertEqual(capture.format, "pcapng")
+            for nbProcesses in [1, 3]:
+                messages = PCAPImporter.readFile(self.capturePath,
+                                                 bpfFilter="udp")
+                pcapngMessages = PCAPImporter.readFile(pcapngPath,
+                                                       bpfFilter="udp",
+                                                       nbProcesses=nbProcesses)
+                # VLAN tagged packets are not matched by the filter
+                self.assertEqual(len(pcapngMessages), 400)
+                self.assertEqual(
+                    [(m.data, m.date, m.source) for m in messages.values()],
+                    [(m.data, m.date, m.source) for m in pcapngMessages.values()])
+        finally:
+            os.remove(pcapngPath)
+
+    def test_cachedImport(self):
+        writeCapture(self.capturePath, 1000)
+        cache = CaptureCache(self.capturePath)
+        messages = PCAPImporter.readFile(self.capturePath, bpfFilter="tcp",
+                                         importLayer=3)
+        for i in range(2):
+            cachedMessages = PCAPImporter.readFile(
+                self.capturePath, bpfFilter="tcp", importLayer=3,
+                useCache=True)
+            self.assertTrue(os.path.exists(cache.getCachePath(3, "tcp")))
+            self.assertEqual(
+                [(m.data, m.date, m.source) for m in messages.values()],
+                [(m.data, m.date, m.source) for m in cachedMessages.values()])
+
+        # Touching the capture does not invalidate the cache
+        os.utime(self.capturePath, (0, 0))
+        self.assertIsNotNone(cache.load(3, "tcp"))
+
+        # Changing its content does
+        with open(self.capturePath, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            f.write(b"!")
+        self.assertIsNone(cache.load(3, "tcp"))
+        cachedMessages = PCAPImporter.readFile(
+            self.capturePath, bpfFilter="tcp", importLayer=3, useCache=True)
+        self.assertEqual(cachedMessages.values()[-1].data[-1:], b"!")
+
+    def test_mergeFlowsAroundTcpTurns(self):
+        writeFrames(self.capturePath, [
+            (1.0, buildFrame(17, 1024, 53, b"Q1")),
+            (2.0, buildFrame(6, 1025, 80, b"GET ", sequenceNumber=100)),
+            (2.5, buildFrame(6, 1025, 80, b"/", sequenceNumber=104)),
+            (3.0, buildFrame(17, 1024, 53, b"Q2")),
+            (3.5, buildFrame(17, 1024, 53, b"Q3")),
+        ])
+        for asMessageStore in [False, True]:
+            messages = PCAPImporter.readFile(
+                self.capturePath, mergePacketsInFlow=True,
+                asMessageStore=asMessageStore)
+            # The UDP packets separated by the TCP turn are not merged
+            self.assertEqual([m.data for m in messages.values()],
+                             [b"Q1", b"GET /", b"Q2Q3"])
+
+    def test_tcpReassembly(self):
+        turns = []
+        reassembler = TCPReassembler(
+            lambda message, data: turns.append((message, data)))
+        clients = [("10.0.0.1", 1024 + i) for i in range(3)]
+        server = ("10.0.0.2", 80)
+        for client in clients:
+            reassembler.addSegment(client, server, 100, TCPReassembler.SYN,
+                                   b"", None)
+            reassembler.addSegment(server, client, 500, TCPReassembler.SYN |
+                                   TCPReassembler.ACK, b"", None)
+        # Interleaved connections, out of order segments and retransmissions
+        for (i, client) in enumerate(clients):
+            reassembler.addSegment(client, server, 106, TCPReassembler.ACK,
+                                   b"world", i)
+        for (i, client) in enumerate(clients):
+            reassembler.addSegment(client, server, 101, TCPReassembler.ACK,
+                                   b"hello", i)
+            reassembler.addSegment(client, server, 101, TCPReassembler.ACK,
+                                   b"hello", i)
+        for (i, client) in enumerate(clients):
+            reassembler.addSegment(server, client, 501, TCPReassembler.ACK,
+                                   b"OK", i)
+            reassembler.addSegment(server, client, 503, TCPReassembler.FIN |
+                                   TCPReassembler.ACK, b"", i)
+            reassembler.addSegment(client, server, 111, TCPReassembler.FIN |
+                                   TCPReassembler.ACK, b"", i)
+        self.assertEqual(reassembler.nbConnections, 0)
+        self.assertEqual(sorted(turns), [(0, b"OK"), (0, b"helloworld"),
+                                         (1, b"OK"), (1, b"helloworld"),
+                                         (2, b"OK"), (2, b"helloworld")])